@@ -0,0 +1,28 @@
+"""
+Asteroids: HYPERFLOW.
+
+    astro.config    constants (override() to change them at runtime)
+    astro.geometry  Rect and collision helpers
+    astro.sprite    Sprite / Group
+    astro.entities  player, bullets, asteroids, UFOs, mines, effects
+    astro.world     World: the fixed-step simulation
+    astro.render    Renderer: draws a World with pygame
+    astro.warmup    Warmup: builds the renderer's caches on a worker thread
+    astro.persist   atomic save files written by a background thread
+    astro.history   RunHistory: SQLite run history and leaderboards
+    astro.telemetry Telemetry: gameplay event stream to compressed JSONL files
+    astro.replay    input-log replays: record a run, play it back headless
+    astro.snapshot  SnapshotRing: recent world snapshots for rewind and the kill-cam
+    astro.spectate  SpectatorPublisher: world state stream to spectator windows
+    astro.capture   FrameCapture: frame recording and F12 clips of the last 30 seconds
+    astro.frameshare FramePublisher / FrameReader: frames shared with local processes
+    astro.app       Game: window, input, menus, save files
+
+config, geometry, sprite, entities and world only use the standard library,
+so `from astro.world import World` runs headless without importing pygame.
+Importing this package itself loads nothing else; it only notes the time,
+which the app's startup trace counts from.
+"""
+import time
+
+IMPORT_TIME = time.perf_counter()
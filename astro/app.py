@@ -0,0 +1,804 @@
+"""
+App shell: window, frame pacing, keyboard input, menus and save files around
+the simulation (astro.world) and its renderer (astro.render).
+
+    python -m astro --pacing hybrid --render-fps 144
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pygame
+
+from . import IMPORT_TIME
+from .config import *
+from .entities import Asteroid
+from .world import World
+from .render import Renderer
+from .warmup import Warmup
+from .history import RunHistory, day_of
+from .telemetry import Telemetry
+from .snapshot import SnapshotRing
+from .spectate import SpectatorPublisher
+from .capture import FrameCapture, FORMATS as CAPTURE_FORMATS
+from .frameshare import FramePublisher
+from . import replay
+from . import snapshot
+from . import persist
+
+# --- Frame Pacer Class ---
+class FramePacer:
+    """ Delivers frames at the render rate and measures how evenly they arrive.
+    Modes:
+      sleep  - clock.tick, relies on OS sleep granularity
+      busy   - clock.tick_busy_loop, accurate but burns a core
+      hybrid - sleep until just before the deadline, then spin
+      vsync  - let display.flip block on the display's refresh (falls back to hybrid if unsupported)
+    """
+    MODES = ("sleep", "busy", "hybrid", "vsync")
+
+    def __init__(self, mode=PACING_MODE, target_fps=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown pacing mode: {mode}")
+        self.mode = mode
+        self.target_fps = RENDER_FPS if target_fps is None else target_fps # None: read at run time, after any override()
+        self.clock = pygame.time.Clock()
+        self.intervals = deque(maxlen=PACING_STATS_WINDOW)
+        self.frames = 0
+        self.dropped_frames = 0
+        self.last_frame_time = None
+        self.next_deadline = None
+
+    def set_mode(self, size):
+        """ Opens the window, asking for vsync when that mode is selected """
+        if self.mode == "vsync":
+            try:
+                return pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+            except pygame.error:
+                print("Warning: vsync not supported by this driver, using hybrid pacing.")
+                self.mode = "hybrid"
+        return pygame.display.set_mode(size)
+
+    def wait(self):
+        """ Called once per rendered frame, after display.flip """
+        if self.mode == "sleep":
+            self.clock.tick(self.target_fps)
+        elif self.mode == "busy":
+            self.clock.tick_busy_loop(self.target_fps)
+        elif self.mode == "hybrid" and self.target_fps > 0:
+            self.wait_hybrid()
+        self.record_frame(time.perf_counter())
+
+    def wait_hybrid(self):
+        frame_time = 1.0 / self.target_fps
+        now = time.perf_counter()
+        if self.next_deadline is None or now - self.next_deadline > frame_time:
+            self.next_deadline = now + frame_time # First frame, or too late to catch up
+        remaining = self.next_deadline - now
+        if remaining > PACING_HYBRID_SPIN_MARGIN:
+            time.sleep(remaining - PACING_HYBRID_SPIN_MARGIN)
+        while time.perf_counter() < self.next_deadline:
+            pass
+        self.next_deadline += frame_time
+
+    def record_frame(self, now):
+        if self.last_frame_time is not None:
+            interval = now - self.last_frame_time
+            self.intervals.append(interval)
+            if interval > self.expected_interval() * PACING_DROP_THRESHOLD:
+                self.dropped_frames += 1
+        self.last_frame_time = now
+        self.frames += 1
+
+    def expected_interval(self):
+        """ Target frame time, or the average one when uncapped / paced by vsync """
+        if self.target_fps > 0 and self.mode != "vsync":
+            return 1.0 / self.target_fps
+        if not self.intervals:
+            return 0.0
+        return sum(self.intervals) / len(self.intervals)
+
+    def get_stats(self):
+        """ Frame delivery stats over the last PACING_STATS_WINDOW frames (times in ms) """
+        intervals = sorted(self.intervals)
+        if not intervals:
+            return {"mode": self.mode, "frames": self.frames, "dropped_frames": self.dropped_frames}
+        expected = self.expected_interval()
+        jitter = sorted(abs(i - expected) for i in intervals)
+        return {
+            "mode": self.mode,
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "fps": len(intervals) / sum(intervals),
+            "frame_ms_mean": sum(intervals) / len(intervals) * 1000,
+            "frame_ms_p99": intervals[int(len(intervals) * 0.99)] * 1000,
+            "frame_ms_max": intervals[-1] * 1000,
+            "jitter_ms_mean": sum(jitter) / len(jitter) * 1000,
+            "jitter_ms_p99": jitter[int(len(jitter) * 0.99)] * 1000,
+            "jitter_ms_max": jitter[-1] * 1000,
+        }
+
+# --- Input Latency Tracker Class ---
+class InputLatencyTracker:
+    """ Follows gameplay key presses from their event to the display.flip that first shows them.
+    Actions (shoot, dash, hyperspace) take effect when the event is handled; movement keys are
+    polled by Player.update, so they only take effect on the next simulation step. """
+    MOVE_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_a, pygame.K_d, pygame.K_w)
+
+    def __init__(self):
+        self.pending = [] # [kind, timestamp_ms, applied]
+        self.samples = {} # kind -> recent latencies in ms
+
+    def key_pressed(self, kind, event):
+        # SDL's event timestamp where pygame exposes it (pygame-ce), otherwise the time we polled it
+        timestamp = getattr(event, "timestamp", None)
+        if timestamp is None:
+            timestamp = pygame.time.get_ticks()
+        self.pending.append([kind, timestamp, kind != "move"])
+
+    def simulation_stepped(self):
+        for entry in self.pending:
+            entry[2] = True
+
+    def frame_presented(self):
+        """ Called right after display.flip """
+        if not self.pending:
+            return
+        now = pygame.time.get_ticks()
+        still_pending = []
+        for entry in self.pending:
+            kind, timestamp, applied = entry
+            if applied:
+                if kind not in self.samples:
+                    self.samples[kind] = deque(maxlen=LATENCY_STATS_WINDOW)
+                self.samples[kind].append(now - timestamp)
+            else:
+                still_pending.append(entry)
+        self.pending = still_pending
+
+    def get_stats(self):
+        """ Input-to-flip latency percentiles in ms, per input kind """
+        stats = {}
+        for kind, samples in self.samples.items():
+            ordered = sorted(samples)
+            stats[kind] = {
+                "count": len(ordered),
+                "p50": ordered[len(ordered) // 2],
+                "p95": ordered[int(len(ordered) * 0.95)],
+                "p99": ordered[int(len(ordered) * 0.99)],
+                "max": ordered[-1],
+            }
+        return stats
+
+# --- Startup Trace Class ---
+class StartupTrace:
+    """ Timed init phases, counted from the moment the astro package was imported.
+    Lazy initialisation later in the run (fonts, effect surfaces, the mixer) lands here too,
+    so a hitch on first use shows up next to the cold start. export() writes Chrome
+    trace-event JSON, which chrome://tracing and Perfetto open directly. """
+    def __init__(self, origin=IMPORT_TIME):
+        self.origin = origin
+        self.phases = [] # (name, start, end) in perf_counter seconds
+        self.marks = [] # (name, time)
+
+    def add(self, name, start, end):
+        self.phases.append((name, start, end))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter())
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def get_stats(self):
+        """ (name, start_ms, duration_ms) in time order; marks have a duration of None """
+        rows = [(name, (start - self.origin) * 1000, (end - start) * 1000) for name, start, end in self.phases]
+        rows += [(name, (t - self.origin) * 1000, None) for name, t in self.marks]
+        return sorted(rows, key=lambda row: row[1])
+
+    def export(self, path):
+        events = []
+        for name, start_ms, duration_ms in self.get_stats():
+            event = {"name": name, "ts": start_ms * 1000, "pid": os.getpid(), "tid": 0}
+            if duration_ms is None:
+                event.update(ph="i", s="g")
+            else:
+                event.update(ph="X", dur=duration_ms * 1000)
+            events.append(event)
+        try:
+            with open(path, "w") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, indent=1)
+        except IOError:
+            print("Error: Could not write startup trace.")
+
+# --- Main Game Class ---
+class Game(World):
+    def __init__(self, pacing_mode=PACING_MODE, render_fps=None, late_latch=LATE_LATCH, trace=None):
+        # Only what the first menu frame needs happens here. Fonts are created when first
+        # drawn, and sounds load once that frame is on screen (see finish_startup)
+        self.startup = trace if trace is not None else StartupTrace()
+        with self.startup.phase("display.init"):
+            pygame.display.init() # Not pygame.init(): that would open the audio device as well
+
+        with self.startup.phase("window"):
+            self.pacer = FramePacer(pacing_mode, render_fps) # Frame pacing
+            self.screen = self.pacer.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption(WINDOW_TITLE)
+
+        with self.startup.phase("world"):
+            super().__init__()
+        with self.startup.phase("renderer"):
+            self.renderer = Renderer(self)
+            self.renderer.trace = self.startup
+        self.running = True
+        self.startup_pending = True # Until the first frame has been shown
+        self.interp = 1.0 # Render position between the last two sim steps (0.0 - 1.0)
+        self.late_latch = late_latch
+        self.input_keys = None # Held-key mapping to use instead of the keyboard (agents, tools)
+        self.input_latency = InputLatencyTracker() # Input-to-display latency
+        self.replay_dir = None # Record every run as a replay into this directory (--record)
+        self.replay_seed = None # Seed every recorded run uses instead of a fresh one (--seed)
+        self.snapshots = SnapshotRing() # The last seconds of the run, for rewind and the kill-cam
+        self.training = False # Training mode (--training): R rewinds, runs don't count
+        self.kill_cam = None # Snapshots still to show while the kill-cam plays
+        self.kill_cam_step = 0
+        self.spectate = None # SpectatorPublisher (--spectate)
+        self.capture = None # FrameCapture (--capture, --capture-rolling)
+        self.frameshare = None # FramePublisher (--share-frames)
+
+        with self.startup.phase("save_files"):
+            self.persistence = persist.PersistenceWorker() # Saves happen off the game thread
+            self.history = RunHistory(HISTORY_DB_FILE, HIGH_SCORE_FILE) # Imports the high score on first launch
+            self.high_score = max(self.load_high_score(), self.history.best_score())
+            self.player_data = self.load_player_data()
+
+        # Fonts, text and effect frames for the first run, built on a worker thread once
+        # the menu is up; start_new_game waits for it
+        self.warmup = Warmup(self.renderer.warmup_jobs(), self.startup)
+
+        with self.startup.phase("menu_asteroids"):
+            self.menu_asteroids = []
+            for _ in range(5):
+                self.menu_asteroids.append(Asteroid(game_level=0))
+
+        self.ship_select_index = 0
+        self.ship_types = list(SHIP_STATS.keys())
+
+    def finish_startup(self):
+        """ Init the first menu frame can do without, run once that frame is on screen """
+        self.startup.mark("first_frame")
+        self.startup_pending = False
+        with self.startup.phase("sounds"):
+            self.sounds = self.load_sounds()
+        self.warmup.start()
+
+    def start_new_game(self, ship_type="Cruiser"):
+        if not self.warmup.finished.is_set():
+            with self.startup.phase("warmup_barrier"): # Only shows up if the player beat the warm-up
+                self.warmup.wait()
+        if self.replay_dir is not None:
+            seed = replay.new_seed() if self.replay_seed is None else self.replay_seed
+            random.seed(seed) # The run is this seed plus the recorded input
+        super().start_new_game(ship_type)
+        if self.replay_dir is not None:
+            self.input_log = replay.InputRecorder(seed, self)
+        self.snapshots.clear()
+        self.snapshots.record(self)
+
+    def load_high_score(self):
+        try:
+            high_score, recovered = persist.load(HIGH_SCORE_FILE, int)
+        except (IOError, ValueError): return 0
+        if recovered: print("Warning: High score file was damaged, using the last good copy.")
+        return high_score
+
+    def save_high_score(self):
+        if self.player.score > self.high_score:
+            self.high_score = self.player.score
+            self.persistence.save(HIGH_SCORE_FILE, str(self.high_score), int)
+            
+    def load_player_data(self): 
+        try:
+            data, recovered = persist.load(PLAYER_DATA_FILE, json.loads)
+        except (IOError, ValueError):
+            return {"total_credits": 0, "unlocked_ships": ["Cruiser"]}
+        if recovered: print("Warning: Player data was damaged, using the last good copy.")
+        if "unlocked_ships" not in data:
+            data["unlocked_ships"] = ["Cruiser"]
+        return data
+
+    def save_player_data(self): 
+        # Serialised here: the dict keeps changing after the write is queued
+        self.persistence.save(PLAYER_DATA_FILE, json.dumps(self.player_data), json.loads)
+
+    def load_sounds(self):
+        """ Loads SOUND_DIR/<name>.wav or .ogg where present. The mixer (and with it the
+        audio device) is only started when there is at least one sound to play """
+        sounds = {
+            "shoot": None, "laser": None,
+            "explosion_small": None, "explosion_medium": None, "explosion_large": None,
+            "player_die": None, "hyperspace": None, "extra_life": None,
+            "ufo_shoot": None, "mine_shoot": None,
+            "powerup": None, "near_miss": None,
+            "flow_activate": None, "flow_blip": None
+        }
+        paths = {}
+        for name in sounds:
+            for ext in (".wav", ".ogg"):
+                path = os.path.join(SOUND_DIR, name + ext)
+                if os.path.isfile(path):
+                    paths[name] = path
+                    break
+        if not paths:
+            return sounds
+        try:
+            with self.startup.phase("mixer.init"):
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()
+            for name, path in paths.items():
+                sounds[name] = pygame.mixer.Sound(path)
+        except pygame.error:
+            print("Error: Could not load sounds.")
+        return sounds
+
+    def save_replay(self):
+        """ Queues the recorded run for the persistence thread """
+        recording = self.input_log.finish(self)
+        self.input_log = None
+        os.makedirs(self.replay_dir, exist_ok=True)
+        name = f"run-{time.strftime('%Y%m%d-%H%M%S')}-{recording.ship}-{recording.seed:08x}{replay.REPLAY_EXTENSION}"
+        self.persistence.save(os.path.join(self.replay_dir, name), recording.to_bytes())
+
+    def on_game_over(self):
+        if self.training:
+            return # Practice: rewound runs don't go into the history, credits or high score
+        self.history.record(self.run_summary())
+        self.player_data["total_credits"] += self.player.score // 100
+        self.save_high_score()
+        self.save_player_data()
+
+    def run(self):
+        # Fixed timestep: the simulation always advances in SIM_STEP increments,
+        # rendering runs at RENDER_FPS and interpolates between the last two steps.
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        while self.running:
+            now = time.perf_counter()
+            accumulator += now - last_time
+            last_time = now
+
+            self.handle_events()
+            steps = 0
+            while accumulator >= SIM_STEP and steps < MAX_SIM_STEPS_PER_FRAME:
+                self.step()
+                accumulator -= SIM_STEP
+                steps += 1
+            if accumulator >= SIM_STEP:
+                accumulator = 0.0 # Too far behind: drop the backlog instead of spiralling
+
+            self.interp = accumulator / SIM_STEP
+            self.draw()
+            self.input_latency.frame_presented()
+            if self.startup_pending:
+                self.finish_startup()
+            self.pacer.wait()
+        self.warmup.cancel()
+        if self.input_log is not None:
+            self.save_replay() # Quit mid-run: keep what was played
+        self.persistence.close() # Flush queued saves before exiting
+        self.history.close()
+        if self.telemetry is not None:
+            self.telemetry.close() # Write the buffered events
+        if self.spectate is not None:
+            self.spectate.close()
+        if self.capture is not None:
+            self.capture.close() # Write the grabbed frames, finish a clip being saved
+        if self.frameshare is not None:
+            self.frameshare.close()
+        pygame.quit()
+
+    def step(self):
+        """ Advances the simulation by one fixed step """
+        if self.game_state == "PLAYING":
+            self.update()
+            self.snapshots.record(self)
+            if self.game_state != "PLAYING":
+                if self.input_log is not None:
+                    self.save_replay() # After the whole fatal step, so the final state matches playback
+                self.start_kill_cam()
+        elif self.game_state == "KILL_CAM": self.update_kill_cam()
+        elif self.game_state == "START_MENU": self.update_menu()
+        elif self.game_state == "SHIP_SELECT": self.update_menu()
+        if self.spectate is not None:
+            self.spectate.publish(self)
+        self.input_latency.simulation_stepped()
+
+    # --- Rewind and Kill-Cam (astro.snapshot) ---
+    def rewind(self):
+        """ Training mode: back SNAPSHOT_REWIND_SECONDS, or as far as the snapshots reach """
+        if self.snapshots.rewind(self):
+            self.game_state = "PLAYING"
+            self.chroma_glitch_timer = 5
+
+    def start_kill_cam(self):
+        """ Replays the last KILLCAM_SECONDS before the fatal hit in slow motion """
+        start = self.snapshots.index_before(KILLCAM_SECONDS)
+        if start is None or KILLCAM_SECONDS <= 0:
+            return
+        self.kill_cam = self.snapshots.blobs(start)
+        self.kill_cam_step = 0
+        self.game_state = "KILL_CAM"
+
+    def update_kill_cam(self):
+        if self.kill_cam_step % KILLCAM_SLOWDOWN == 0:
+            entry = next(self.kill_cam, None)
+            if entry is None:
+                self.end_kill_cam()
+                return
+            snapshot.restore(self, entry[1])
+        self.kill_cam_step += 1
+
+    def end_kill_cam(self):
+        """ Finished or skipped: back to the state the run ended in, then GAME OVER """
+        self.kill_cam = None
+        snapshot.restore(self, self.snapshots.get(self.snapshots.newest))
+        self.game_state = "GAME_OVER"
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE: self.running = False
+                
+                if self.training and event.key == pygame.K_r and self.game_state in ("PLAYING", "GAME_OVER"):
+                    self.rewind()
+
+                elif event.key == pygame.K_F12 and self.capture is not None:
+                    self.capture.save_clip()
+
+                elif self.game_state == "KILL_CAM":
+                    self.end_kill_cam() # Any key skips it
+
+                elif self.game_state == "PLAYING" and self.level_clear_timer == 0:
+                    if (event.key == pygame.K_SPACE or event.key == pygame.K_z):
+                        self.input_latency.key_pressed("shoot", event)
+                        self.player_shoot()
+                    # UPDATED: Dash
+                    elif (event.key == pygame.K_LSHIFT or event.key == pygame.K_x):
+                        self.input_latency.key_pressed("dash", event)
+                        self.player_dash()
+                    # UPDATED: Hyperspace
+                    elif (event.key == pygame.K_c or event.key == pygame.K_v):
+                        self.input_latency.key_pressed("hyperspace", event)
+                        self.player_hyperspace()
+                    elif event.key in InputLatencyTracker.MOVE_KEYS:
+                        self.input_latency.key_pressed("move", event)
+
+                elif self.game_state == "GAME_OVER":
+                    if event.key == pygame.K_RETURN:
+                        self.game_state = "SHIP_SELECT"
+                        
+                elif self.game_state == "START_MENU":
+                    if event.key == pygame.K_RETURN:
+                        self.game_state = "SHIP_SELECT"
+                        
+                elif self.game_state == "SHIP_SELECT": 
+                    if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
+                        self.ship_select_index = (self.ship_select_index + 1) % len(self.ship_types)
+                    elif event.key == pygame.K_LEFT or event.key == pygame.K_a:
+                        self.ship_select_index = (self.ship_select_index - 1) % len(self.ship_types)
+                    elif event.key == pygame.K_RETURN:
+                        selected_ship = self.ship_types[self.ship_select_index]
+                        stats = SHIP_STATS[selected_ship]
+                        if selected_ship in self.player_data["unlocked_ships"]:
+                            self.start_new_game(selected_ship)
+                        elif self.player_data["total_credits"] >= stats["cost"]:
+                            self.player_data["total_credits"] -= stats["cost"]
+                            self.player_data["unlocked_ships"].append(selected_ship)
+                            self.save_player_data()
+                            self.start_new_game(selected_ship)
+                        else:
+                            pass
+                    elif event.key == pygame.K_ESCAPE:
+                        self.game_state = "START_MENU"
+
+    def update_menu(self):
+        for a in self.menu_asteroids:
+            a.update()
+
+    def update(self):
+        """ One simulation step, steering from the keyboard (or input_keys) """
+        keys = self.input_keys
+        if self.late_latch:
+            # Late latch: refresh SDL's key state right before the player reads it
+            pygame.event.pump()
+            keys = pygame.key.get_pressed()
+        elif keys is None:
+            keys = pygame.key.get_pressed()
+        self.controls.set(left=keys[pygame.K_LEFT] or keys[pygame.K_a],
+                          right=keys[pygame.K_RIGHT] or keys[pygame.K_d],
+                          thrust=keys[pygame.K_UP] or keys[pygame.K_w])
+        super().update()
+
+    def draw_start_menu(self):
+        self.screen.fill(BACKGROUND_COLOR)
+        for a in self.menu_asteroids:
+            self.renderer.draw_asteroid(self.screen, a, self.interp)
+        title_text = self.renderer.render_text(self.renderer.large_font, "ASTEROIDS", WHITE)
+        title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 130))
+        self.screen.blit(title_text, title_rect)
+        subtitle_text = self.renderer.render_text(self.renderer.medium_font, "HYPERFLOW", RED)
+        subtitle_rect = subtitle_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 90))
+        self.screen.blit(subtitle_text, subtitle_rect)
+        high_score_text = self.renderer.render_text(self.renderer.font, f"High Score: {self.high_score}", CYAN)
+        high_score_rect = high_score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 40))
+        self.screen.blit(high_score_text, high_score_rect)
+        start_text = self.renderer.render_text(self.renderer.medium_font, "Press ENTER to Start", WHITE)
+        start_rect = start_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
+        self.screen.blit(start_text, start_rect)
+        controls_title = self.renderer.render_text(self.renderer.font, "--- Controls ---", GREY)
+        controls_title_rect = controls_title.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 80))
+        self.screen.blit(controls_title, controls_title_rect)
+        controls1 = self.renderer.render_text(self.renderer.font, "Arrow Keys / WASD: Move", GREY)
+        controls1_rect = controls1.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 110))
+        self.screen.blit(controls1, controls1_rect)
+        
+        controls2 = self.renderer.render_text(self.renderer.font, "Space / Z: Shoot", GREY)
+        controls2_rect = controls2.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 130))
+        self.screen.blit(controls2, controls2_rect)
+        
+        controls3 = self.renderer.render_text(self.renderer.font, "LShift / X: Dash", GREY) # UPDATED
+        controls3_rect = controls3.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 150))
+        self.screen.blit(controls3, controls3_rect)
+        
+        controls4 = self.renderer.render_text(self.renderer.font, "C / V: Hyperspace", GREY) # NEW
+        controls4_rect = controls4.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 170))
+        self.screen.blit(controls4, controls4_rect)
+        
+    def draw_ship_select(self): 
+        self.screen.fill(BACKGROUND_COLOR)
+        
+        # Draw background elements
+        self.renderer.game_surface.fill(BACKGROUND_COLOR)
+        self.renderer.draw_background(self.renderer.game_surface)
+        self.screen.blit(self.renderer.game_surface, (0,0))
+            
+        title_text = self.renderer.render_text(self.renderer.large_font, "SHIPYARD", WHITE)
+        title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 80))
+        self.screen.blit(title_text, title_rect)
+        
+        credits_text = self.renderer.render_text(self.renderer.medium_font, f"Total Credits: {self.player_data['total_credits']}", YELLOW)
+        credits_rect = credits_text.get_rect(center=(SCREEN_WIDTH//2, 130))
+        self.screen.blit(credits_text, credits_rect)
+        
+        selected_ship = self.ship_types[self.ship_select_index]
+        stats = SHIP_STATS[selected_ship]
+        
+        self.renderer.draw_ship_preview(self.screen, selected_ship, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50)
+        
+        name_text = self.renderer.render_text(self.renderer.medium_font, selected_ship, WHITE)
+        name_rect = name_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
+        self.screen.blit(name_text, name_rect)
+        
+        desc_text = self.renderer.render_text(self.renderer.font_small, stats["desc"], GREY)
+        desc_rect = desc_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 30))
+        self.screen.blit(desc_text, desc_rect)
+        
+        # Personal best and runs for this ship (cached by RunHistory until the next run)
+        runs = self.history.run_count(selected_ship)
+        if runs:
+            record_str = f"Best: {self.history.best_score(selected_ship)}   Runs: {runs}"
+            record_text = self.renderer.render_text(self.renderer.font_small, record_str, CYAN)
+            record_rect = record_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 120))
+            self.screen.blit(record_text, record_rect)
+        
+        if selected_ship in self.player_data["unlocked_ships"]:
+            action_text_str = "Press ENTER to Select"
+            action_color = GREEN_SHIELD
+        else:
+            if self.player_data["total_credits"] >= stats["cost"]:
+                action_text_str = f"Press ENTER to Buy ({stats['cost']} C)"
+                action_color = CYAN
+            else:
+                action_text_str = f"LOCKED ({stats['cost']} C)"
+                action_color = RED
+                
+        action_text = self.renderer.render_text(self.renderer.font, action_text_str, action_color)
+        action_rect = action_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70))
+        self.screen.blit(action_text, action_rect)
+        
+        arrow_font = self.renderer.large_font
+        left_arrow = self.renderer.render_text(arrow_font, "<", WHITE)
+        left_rect = left_arrow.get_rect(center=(SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 - 50))
+        self.screen.blit(left_arrow, left_rect)
+        
+        right_arrow = self.renderer.render_text(arrow_font, ">", WHITE)
+        right_rect = right_arrow.get_rect(center=(SCREEN_WIDTH//2 + 100, SCREEN_HEIGHT//2 - 50))
+        self.screen.blit(right_arrow, right_rect)
+
+    def draw_game_over(self):
+        self.screen.fill(BACKGROUND_COLOR)
+        over_text = self.renderer.render_text(self.renderer.large_font, "GAME OVER", RED)
+        over_rect = over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 100))
+        self.screen.blit(over_text, over_rect)
+        
+        score_text = self.renderer.render_text(self.renderer.medium_font, f"Final Score: {self.player.score}", WHITE)
+        score_rect = score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 40))
+        self.screen.blit(score_text, score_rect)
+        
+        credits_earned = self.player.score // 100
+        credits_text = self.renderer.render_text(self.renderer.font, f"Credits Earned: {credits_earned}", YELLOW)
+        credits_rect = credits_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 10))
+        self.screen.blit(credits_text, credits_rect)
+        
+        high_score_text = self.renderer.render_text(self.renderer.font, f"High Score: {self.high_score}", CYAN)
+        high_score_rect = high_score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 20))
+        self.screen.blit(high_score_text, high_score_rect)
+        
+        restart_str = "Press ENTER to Continue"
+        if self.training:
+            restart_str += f"   R: Rewind {SNAPSHOT_REWIND_SECONDS}s"
+        restart_text = self.renderer.render_text(self.renderer.font, restart_str, WHITE)
+        restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 70))
+        self.screen.blit(restart_text, restart_rect)
+        
+        # Leaderboard for the ship just flown, from the run history
+        ship = self.player.ship_type
+        today_best = self.history.best_score(day=day_of(time.time()))
+        board_title = self.renderer.render_text(self.renderer.font, f"Top {ship} Runs   (Today's Best: {today_best})", GREY)
+        board_rect = board_title.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 120))
+        self.screen.blit(board_title, board_rect)
+        for i, run in enumerate(self.history.top_runs(ship, limit=5)):
+            row_str = f"{i + 1}.  {run['score']}   Level {run['level']}   {int(run['duration_s']) // 60}:{int(run['duration_s']) % 60:02d}"
+            row_text = self.renderer.render_text(self.renderer.font_small, row_str, WHITE)
+            row_rect = row_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 150 + i * 22))
+            self.screen.blit(row_text, row_rect)
+
+    def draw(self):
+        if self.game_state in ("PLAYING", "KILL_CAM"):
+            interp = self.interp
+            if self.game_state == "KILL_CAM":
+                # Each snapshot stays up for KILLCAM_SLOWDOWN steps: interpolate across all of them
+                interp = ((self.kill_cam_step - 1) % KILLCAM_SLOWDOWN + self.interp) / KILLCAM_SLOWDOWN
+            self.renderer.render_playfield(interp)
+            
+            # --- Final Blit ---
+            shake_offset = (0, 0)
+            if self.screen_shake_timer > 0:
+                shake_offset = (self.renderer.rng.randint(-5, 5), self.renderer.rng.randint(-5, 5))
+            
+            thrust_shake_offset = (0, 0)
+            if self.player.thrusting and self.game_start_timer == 0 and self.player.lives > 0:
+                thrust_shake_offset = (self.renderer.rng.randint(-1, 1), self.renderer.rng.randint(-1, 1))
+
+            final_offset = (shake_offset[0] + thrust_shake_offset[0], shake_offset[1] + thrust_shake_offset[1])
+            
+            # --- NEW: Apply Camera Zoom ---
+            final_surf, final_rect = self.renderer.apply_camera_zoom(self.screen, final_offset)
+            self.screen.blit(final_surf, final_rect)
+
+            if self.game_state == "KILL_CAM":
+                cam_text = self.renderer.render_text(self.renderer.medium_font, "KILL CAM", RED)
+                cam_rect = cam_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 60))
+                self.screen.blit(cam_text, cam_rect)
+                skip_text = self.renderer.render_text(self.renderer.font_small, "Press any key to skip", GREY)
+                skip_rect = skip_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 30))
+                self.screen.blit(skip_text, skip_rect)
+            elif self.training:
+                training_text = self.renderer.render_text(self.renderer.font_small, f"TRAINING   R: Rewind {SNAPSHOT_REWIND_SECONDS}s", GREY)
+                training_rect = training_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 20))
+                self.screen.blit(training_text, training_rect)
+
+        elif self.game_state == "GAME_OVER":
+            self.draw_game_over()
+            
+        elif self.game_state == "SHIP_SELECT": 
+            self.renderer.game_surface.fill(BACKGROUND_COLOR)
+            self.renderer.draw_background(self.renderer.game_surface)
+            self.screen.blit(self.renderer.game_surface, (0, 0))
+            self.draw_ship_select() 
+            
+        elif self.game_state == "START_MENU":
+            self.renderer.game_surface.fill(BACKGROUND_COLOR)
+            self.renderer.draw_background(self.renderer.game_surface)
+            self.screen.blit(self.renderer.game_surface, (0, 0))
+            self.draw_start_menu()
+
+        if self.capture is not None:
+            self.capture.grab(self.screen) # The finished frame, post-processing and overlays included
+        if self.frameshare is not None:
+            self.frameshare.publish(self.screen)
+        pygame.display.flip()
+
+
+def main():
+    trace = StartupTrace()
+    trace.add("imports", trace.origin, time.perf_counter()) # astro package import to here, mostly pygame
+    parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+    parser.add_argument("--pacing", choices=FramePacer.MODES, default=PACING_MODE, help="frame pacing mode")
+    parser.add_argument("--render-fps", type=int, default=RENDER_FPS, help=f"render cap (default {RENDER_FPS}), 0 = uncapped")
+    parser.add_argument("--pacing-stats", action="store_true", help="print frame pacing stats on exit")
+    parser.add_argument("--late-latch", action="store_true", help="sample held keys right before each simulation step")
+    parser.add_argument("--latency-stats", action="store_true", help="print input-to-display latency on exit")
+    parser.add_argument("--startup-stats", action="store_true", help="print the startup trace on exit")
+    parser.add_argument("--startup-trace", metavar="PATH", help="write the startup trace as Chrome trace JSON on exit")
+    parser.add_argument("--debug-log", metavar="PATH", help="write debug messages (asset warm-up progress) to this file")
+    parser.add_argument("--record", metavar="DIR", nargs="?", const=REPLAY_DIR,
+                        help=f"save a replay of every run in DIR (default {REPLAY_DIR})")
+    parser.add_argument("--seed", type=lambda text: int(text, 0),
+                        help="record every run on this seed, e.g. one issued for a tournament (needs --record)")
+    parser.add_argument("--telemetry", metavar="DIR", nargs="?", const=TELEMETRY_DIR,
+                        help=f"record gameplay events to compressed JSONL files in DIR (default {TELEMETRY_DIR})")
+    parser.add_argument("--training", action="store_true",
+                        help=f"training mode: R rewinds {SNAPSHOT_REWIND_SECONDS}s, runs don't count for scores or credits")
+    parser.add_argument("--spectate", metavar="ADDRESS", nargs="?", const=SPECTATE_ADDRESS,
+                        help=f"stream the game to spectator windows on host:port or a Unix socket path (default {SPECTATE_ADDRESS})")
+    parser.add_argument("--capture", choices=CAPTURE_FORMATS,
+                        help=f"record every frame to {CAPTURE_DIR}/: raw frames, a PNG sequence or piped into ffmpeg")
+    parser.add_argument("--capture-rolling", metavar="FORMAT", nargs="?", const="png", choices=CAPTURE_FORMATS,
+                        help=f"keep the last {CAPTURE_ROLLING_SECONDS}s in memory, F12 saves them to {CAPTURE_DIR}/ (default png)")
+    parser.add_argument("--share-frames", metavar="NAME", nargs="?", const=FRAMESHARE_NAME,
+                        help=f"publish every frame to a shared memory ring for local readers (default {FRAMESHARE_NAME})")
+    args = parser.parse_args()
+    if args.debug_log:
+        logging.basicConfig(filename=args.debug_log, level=logging.DEBUG,
+                            format="%(asctime)s %(threadName)s %(name)s: %(message)s")
+
+    game = Game(pacing_mode=args.pacing, render_fps=args.render_fps, late_latch=args.late_latch, trace=trace)
+    if args.telemetry:
+        game.telemetry = Telemetry(args.telemetry)
+    if args.spectate:
+        try:
+            game.spectate = SpectatorPublisher(args.spectate)
+        except (OSError, ValueError) as error:
+            print(f"Error: Could not start the spectator stream on {args.spectate} ({error}).")
+    if args.capture or args.capture_rolling:
+        try:
+            game.capture = FrameCapture(record=args.capture, rolling=bool(args.capture_rolling),
+                                        clip_format=args.capture_rolling or "png")
+        except OSError as error:
+            print(f"Error: Could not start the capture in {CAPTURE_DIR} ({error}).")
+    if args.share_frames:
+        try:
+            game.frameshare = FramePublisher(game.screen, args.share_frames)
+        except (OSError, ValueError) as error:
+            print(f"Error: Could not share frames as {args.share_frames} ({error}).")
+    game.training = args.training
+    if args.training and args.record:
+        print("Warning: Replays can't follow a rewind, not recording in training mode.")
+    else:
+        game.replay_dir = args.record
+    if args.seed is not None:
+        if game.replay_dir is None:
+            print("Warning: --seed only applies to recorded runs (--record).")
+        game.replay_seed = args.seed
+    game.run()
+    if args.telemetry and game.telemetry.dropped:
+        print(f"Warning: {game.telemetry.dropped} telemetry events were dropped (writer fell behind).")
+    if args.spectate and game.spectate is not None and game.spectate.dropped:
+        print(f"Warning: {game.spectate.dropped} spectator frames were dropped (a spectator fell behind).")
+    if game.capture is not None and game.capture.dropped:
+        print(f"Warning: {game.capture.dropped} captured frames were dropped (the writer fell behind).")
+    if args.pacing_stats:
+        for key, value in game.pacer.get_stats().items():
+            print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+    if args.latency_stats:
+        for kind, stats in game.input_latency.get_stats().items():
+            print(f"{kind}: " + ", ".join(f"{key} {value}" for key, value in stats.items()) + " (ms)")
+    if args.startup_stats:
+        for name, start_ms, duration_ms in trace.get_stats():
+            duration = "" if duration_ms is None else f"{duration_ms:8.2f} ms"
+            print(f"{start_ms:9.1f} ms  {duration:>11}  {name}")
+    if args.startup_trace:
+        trace.export(args.startup_trace)
+
@@ -0,0 +1,306 @@
+"""
+Gameplay capture without an external screen recorder. Game.draw hands every
+finished frame (game_surface after post-processing, camera zoom and overlays,
+as shown on screen) to FrameCapture.grab(), which copies its pixels into a free
+buffer from a preallocated pool: one memcpy, about 0.2 ms at 800x600. A writer
+thread does the rest off the main loop:
+
+    raw   one .raw file of frames as they are in memory, and a .json sidecar
+          with the size, pixel format and the ffmpeg command that converts it
+    png   a numbered PNG sequence
+    pipe  frames piped into a local encoder process (CAPTURE_ENCODER, ffmpeg)
+
+With the rolling buffer on, the writer also keeps the last CAPTURE_ROLLING_SECONDS
+zlib-compressed in memory, and F12 saves them as a clip. If the writer falls
+behind and the pool runs out, frames are dropped and counted; grab() never waits.
+
+    python -m astro --capture png --capture-rolling
+
+PNG frames are encoded here with zlib rather than pygame.image.save, which holds
+the GIL for the whole encode; zlib releases it, so the main loop keeps running.
+"""
+import atexit
+import json
+import os
+import shlex
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+
+from .config import *
+
+FORMATS = ("raw", "png", "pipe")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def pixel_layout(surface):
+    """ (ffmpeg pix_fmt, byte offsets of red, green and blue) of a 32-bit surface's pixels in memory """
+    names = ["0"] * 4
+    offsets = []
+    for channel, mask, shift in zip("rgba", surface.get_masks(), surface.get_shifts()):
+        if not mask:
+            continue
+        offset = shift // 8 if sys.byteorder == "little" else 3 - shift // 8
+        names[offset] = channel
+        if channel != "a":
+            offsets.append(offset)
+    return "".join(names), tuple(offsets)
+
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)))
+
+
+def encode_png(pixels, width, height, offsets, level=CAPTURE_COMPRESS_LEVEL):
+    """ PNG (8-bit RGB) of tightly packed 32-bit pixels, red, green and blue at offsets.
+    The channel shuffle is three slice copies; the compression runs without the GIL """
+    rgb = bytearray(width * height * 3)
+    for channel, offset in enumerate(offsets):
+        rgb[channel::3] = pixels[offset::4]
+    stride = width * 3
+    view = memoryview(rgb)
+    scanlines = b"\0" + b"\0".join(view[y * stride:(y + 1) * stride] for y in range(height)) # Filter 0 on every row
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (PNG_SIGNATURE + png_chunk(b"IHDR", header) + png_chunk(b"IDAT", zlib.compress(scanlines, level)) +
+            png_chunk(b"IEND", b""))
+
+
+# --- Frame Writers ---
+class RawWriter:
+    """ Frames back to back in one file, exactly as grabbed """
+    def __init__(self, path, width, height, pix_fmt, offsets, fps):
+        self.path = path + ".raw"
+        self.meta = {"width": width, "height": height, "pix_fmt": pix_fmt, "fps": fps, "frames": 0,
+                     "convert": f"ffmpeg -f rawvideo -pix_fmt {pix_fmt} -s {width}x{height} -r {fps} "
+                                f"-i {os.path.basename(self.path)} -pix_fmt yuv420p out.mp4"}
+        self.meta_path = path + ".json"
+        self.file = open(self.path, "wb")
+
+    def write(self, pixels):
+        self.file.write(pixels)
+        self.meta["frames"] += 1
+
+    def close(self):
+        self.file.close()
+        with open(self.meta_path, "w") as f:
+            json.dump(self.meta, f, indent=2)
+
+
+class PngWriter:
+    """ frame-000001.png, frame-000002.png, ... in a directory of their own """
+    def __init__(self, path, width, height, pix_fmt, offsets, fps):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.offsets = offsets
+        self.frames = 0
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, pixels):
+        self.frames += 1
+        data = encode_png(pixels, self.width, self.height, self.offsets)
+        with open(os.path.join(self.path, f"frame-{self.frames:06d}.png"), "wb") as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class PipeWriter:
+    """ Raw frames into a local encoder's stdin (CAPTURE_ENCODER). A slow encoder blocks
+    only the writer thread, and the pool running dry drops frames as usual """
+    def __init__(self, path, width, height, pix_fmt, offsets, fps):
+        self.path = path + ".mp4"
+        fields = {"pix_fmt": pix_fmt, "width": width, "height": height, "fps": fps, "path": self.path}
+        command = [arg.format(**fields) for arg in shlex.split(CAPTURE_ENCODER)]
+        try:
+            self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        except OSError as error:
+            raise OSError(f"could not start the encoder {command[0]!r} ({error})")
+
+    def write(self, pixels):
+        self.process.stdin.write(pixels)
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.wait()
+
+
+WRITERS = {"raw": RawWriter, "png": PngWriter, "pipe": PipeWriter}
+
+
+# --- Frame Capture Class ---
+class FrameCapture:
+    """ Grabs frames on the main thread into a pool of buffers and hands them to a writer
+    thread. record: format every frame is written in (None: don't record); rolling: keep the
+    last seconds in memory for save_clip(), which writes them in clip_format. Buffers go
+    free -> ready -> free; each deque has one producer and one consumer, so no lock """
+    def __init__(self, record=None, rolling=False, clip_format="png", directory=CAPTURE_DIR,
+                 fps=CAPTURE_FPS, pool_size=CAPTURE_POOL_SIZE):
+        self.record = record
+        self.rolling = deque() if rolling else None # (timestamp, compressed frame)
+        self.rolling_bytes = 0
+        self.clip_format = clip_format
+        self.directory = directory
+        self.fps = fps
+        self.interval = 1.0 / fps
+        self.pool_size = pool_size
+        self.pool = None # Allocated on the first grab, sized for that surface
+        self.free = deque()
+        self.ready = deque() # (buffer, timestamp)
+        self.next_grab = 0.0
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.writer = None
+        self.clip_requested = False
+        self.clip_thread = None
+        self.clips = 0
+        self.grabbed = 0 # Frames copied into a buffer (main thread)
+        self.dropped = 0 # No free buffer: the writer was behind (main thread)
+        self.written = 0 # Frames the recording got (writer thread)
+        self.lost = 0 # Taken from the pool but not written, after a write error (writer thread)
+        self.failed = False
+        self.closed = False
+        self.stopping = False
+        self.wake = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+        self.thread = threading.Thread(target=self.run_writer, name="astro-capture", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def allocate(self, surface):
+        import pygame
+        self.width, self.height = surface.get_size()
+        if surface.get_bytesize() != 4 or surface.get_pitch() != self.width * 4:
+            # Rare display formats: converted through a packed 32-bit scratch surface first
+            self.scratch = pygame.Surface((self.width, self.height), 0, 32)
+        else:
+            self.scratch = None
+        self.pix_fmt, self.offsets = pixel_layout(self.scratch or surface)
+        self.frame_bytes = self.width * self.height * 4
+        self.pool = [bytearray(self.frame_bytes) for _ in range(self.pool_size)]
+        self.free.extend(self.pool)
+
+    def grab(self, surface):
+        """ Copies surface into a free buffer for the writer, at most fps times a second """
+        now = time.perf_counter()
+        if now < self.next_grab or self.closed or (self.failed and self.rolling is None):
+            return
+        self.next_grab = max(self.next_grab + self.interval, now - self.interval) # Keep the cadence, don't burst to catch up
+        if self.pool is None:
+            self.allocate(surface)
+        if not self.free:
+            self.dropped += 1
+            return
+        buffer = self.free.popleft()
+        if self.scratch is not None:
+            self.scratch.blit(surface, (0, 0))
+            surface = self.scratch
+        pixels = surface.get_buffer()
+        memoryview(buffer)[:] = pixels
+        del pixels # Unlocks the surface
+        self.ready.append((buffer, now))
+        self.grabbed += 1
+        self.wake.set()
+
+    def save_clip(self):
+        """ Saves the rolling buffer (the last CAPTURE_ROLLING_SECONDS) on a thread of its own """
+        if self.rolling is None:
+            return
+        self.clip_requested = True
+        self.wake.set()
+
+    # --- Writer thread ---
+    def run_writer(self):
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            stopping = self.stopping # Read before draining, so every frame grabbed before close() is handled
+            while self.ready:
+                buffer, timestamp = self.ready.popleft()
+                self.write_frame(buffer, timestamp)
+                self.free.append(buffer)
+            if self.clip_requested:
+                self.clip_requested = False
+                self.start_clip()
+            if stopping:
+                break
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            except OSError:
+                print("Error: Could not finish the capture file.")
+
+    def write_frame(self, buffer, timestamp):
+        if self.rolling is not None:
+            data = zlib.compress(buffer, CAPTURE_COMPRESS_LEVEL)
+            self.rolling.append((timestamp, data))
+            self.rolling_bytes += len(data)
+            while self.rolling and (timestamp - self.rolling[0][0] > CAPTURE_ROLLING_SECONDS or
+                                    self.rolling_bytes > CAPTURE_ROLLING_BYTES):
+                self.rolling_bytes -= len(self.rolling.popleft()[1])
+        if self.record is None:
+            return
+        if self.failed:
+            self.lost += 1
+            return
+        try:
+            if self.writer is None:
+                self.writer = self.open_writer(self.record, f"capture-{self.session}")
+            self.writer.write(buffer)
+            self.written += 1
+        except OSError as error:
+            print(f"Error: Could not write the capture ({error}), recording stopped.")
+            self.failed = True
+            self.lost += 1
+
+    def open_writer(self, format, name):
+        return WRITERS[format](os.path.join(self.directory, name), self.width, self.height,
+                               self.pix_fmt, self.offsets, self.fps)
+
+    def start_clip(self):
+        if not self.rolling:
+            return
+        if self.clip_thread is not None and self.clip_thread.is_alive():
+            print("Warning: Still saving the previous clip.")
+            return
+        frames = list(self.rolling) # Compressed frames are immutable: the clip thread can take its time
+        self.clips += 1
+        self.clip_thread = threading.Thread(target=self.write_clip, args=(frames, self.clips),
+                                            name="astro-capture-clip", daemon=True)
+        self.clip_thread.start()
+
+    def write_clip(self, frames, number):
+        name = f"clip-{self.session}-{number:03d}"
+        try:
+            writer = self.open_writer(self.clip_format, name)
+            for timestamp, data in frames:
+                writer.write(zlib.decompress(data))
+            writer.close()
+        except OSError as error:
+            print(f"Error: Could not save the clip ({error}).")
+            return
+        seconds = frames[-1][0] - frames[0][0] + self.interval
+        print(f"Saved the last {seconds:.1f} s ({len(frames)} frames) to {writer.path}")
+
+    def close(self):
+        """ Writes what was grabbed, finishes the recording and any clip being saved. Safe to call more than once """
+        if self.closed:
+            return
+        self.closed = True
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+        if self.clip_thread is not None:
+            self.clip_thread.join()
+
+    def get_stats(self):
+        rolling = self.rolling or ()
+        return {"grabbed": self.grabbed, "dropped": self.dropped, "written": self.written, "lost": self.lost,
+                "rolling_frames": len(rolling), "rolling_bytes": self.rolling_bytes, "clips": self.clips}
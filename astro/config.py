@@ -0,0 +1,175 @@
+"""
+Game constants. Every other astro module takes them with `from .config import *`,
+so use override() to change one at runtime (tools, balance sweeps): it updates
+the copies those modules hold as well as this one.
+"""
+import sys
+
+# --- Configuration ---
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+WINDOW_TITLE = "Asteroids: HYPERFLOW"
+BACKGROUND_COLOR = (10, 10, 20)  # Even darker blue
+WHITE = (255, 255, 255)
+RED = (255, 100, 100)
+ORANGE = (255, 165, 0)
+YELLOW = (255, 255, 0)
+GREY = (120, 120, 120)
+CYAN = (0, 255, 255)
+GREEN_SHIELD = (100, 255, 100)
+PURPLE = (200, 0, 200)
+BLUE_POWERUP = (100, 100, 255)
+FPS = 60 # Simulation rate: all gameplay timers count fixed steps at this rate
+RENDER_FPS = FPS # NEW: Render cap, 0 = uncapped (rendering interpolates between sim steps)
+SIM_STEP = 1.0 / FPS
+MAX_SIM_STEPS_PER_FRAME = 5 # NEW: Catch-up cap, avoids the spiral of death on slow machines
+PACING_MODE = "sleep" # NEW: sleep, busy, hybrid or vsync (see FramePacer)
+PACING_HYBRID_SPIN_MARGIN = 0.002 # Seconds before the deadline where hybrid pacing stops sleeping and spins
+PACING_STATS_WINDOW = 600 # Frames kept for jitter percentiles
+PACING_DROP_THRESHOLD = 1.5 # A frame taking this many target intervals counts as dropped
+LATE_LATCH = False # NEW: Re-sample held keys right before each simulation step
+LATENCY_STATS_WINDOW = 500 # Input samples kept per input kind
+HIGH_SCORE_FILE = "highscore.txt"
+PLAYER_DATA_FILE = "player_data.txt" # NEW: For unlocks
+PERSIST_QUEUE_SIZE = 8 # Save files waiting for the persistence thread (one entry per file)
+HISTORY_DB_FILE = "history.db" # SQLite run history; imports HIGH_SCORE_FILE on first launch
+HISTORY_QUEUE_SIZE = 64 # Finished runs waiting for the history writer thread
+HISTORY_BATCH_SIZE = 32 # Most runs committed in one transaction
+HISTORY_BATCH_WAIT = 0.25 # Seconds the writer waits for more runs before committing a batch
+TELEMETRY_DIR = "telemetry" # Where --telemetry writes its event files
+TELEMETRY_RING_SIZE = 8192 # Events buffered for the writer thread; more are dropped, never waited for
+TELEMETRY_BATCH_SIZE = 512 # Buffered events that wake the writer early
+TELEMETRY_FLUSH_INTERVAL = 1.0 # Seconds between writer passes otherwise
+TELEMETRY_FILE_MAX_BYTES = 8 * 1024 * 1024 # Uncompressed JSONL per file before rotating
+TELEMETRY_MAX_FILES = 50 # Oldest event files beyond this are deleted
+TELEMETRY_COMPRESS_LEVEL = 6 # gzip level for event files
+REPLAY_DIR = "replays" # Where --record saves a replay of every run
+REPLAY_HASH_INTERVAL = 30 # Steps between the state hashes a replay is checked against
+SNAPSHOT_INTERVAL = 1 # Steps between world snapshots (rewind and kill-cam granularity)
+SNAPSHOT_KEYFRAME_INTERVAL = 60 # Snapshots between full ones; the rest are deltas of the previous
+SNAPSHOT_RING_SLOTS = 900 # Snapshots kept at most (15 s at one per step)
+SNAPSHOT_RING_BYTES = 16 * 1024 * 1024 # Preallocated buffer for the compressed snapshots
+SNAPSHOT_COMPRESS_LEVEL = 1 # zlib level for snapshots: fast, they are taken every step
+SNAPSHOT_REWIND_SECONDS = 10 # How far back training-mode rewind goes
+KILLCAM_SECONDS = 2.5 # Game time the kill-cam replays before the fatal hit
+KILLCAM_SLOWDOWN = 2 # Steps each kill-cam snapshot stays on screen (2 = half speed)
+SPECTATE_ADDRESS = "127.0.0.1:47017" # --spectate default: host:port, or a Unix socket path
+SPECTATE_MAX_CLIENTS = 8 # Spectators served at once; more are turned away
+SPECTATE_MAX_PENDING = 256 * 1024 # Bytes queued for one spectator before it starts missing frames
+SPECTATE_COMPRESS_LEVEL = 1 # zlib level for stream messages: one per step
+SPECTATE_CONNECT_TIMEOUT = 3.0 # Seconds the spectator window gives a connection attempt before retrying
+CAPTURE_DIR = "captures" # Where --capture and --capture-rolling write frames and clips
+CAPTURE_FPS = 60 # Frames grabbed per second at most
+CAPTURE_POOL_SIZE = 8 # Preallocated frame buffers (1.9 MB each at 800x600); none free drops a frame
+CAPTURE_ROLLING_SECONDS = 30 # Last seconds kept in memory for F12 clips with --capture-rolling
+CAPTURE_ROLLING_BYTES = 256 * 1024 * 1024 # Memory cap of that buffer; the oldest frames go first
+CAPTURE_COMPRESS_LEVEL = 1 # zlib level for PNG frames and the rolling buffer
+CAPTURE_ENCODER = ("ffmpeg -loglevel error -y -f rawvideo -pix_fmt {pix_fmt} -s {width}x{height} -r {fps} -i - "
+                   "-c:v libx264 -preset ultrafast -pix_fmt yuv420p {path}") # --capture pipe command
+FRAMESHARE_NAME = "astro-frames" # --share-frames default shared memory name
+FRAMESHARE_SLOTS = 4 # Frames in the shared ring; a reader further behind misses frames
+SOUND_DIR = "sounds" # Optional <name>.wav/.ogg files; the mixer only starts if one exists
+
+# --- Ship Stats (NEW) ---
+SHIP_STATS = {
+    "Cruiser": {
+        "size": 15, "thrust": 0.2, "turn_speed": 5, "friction": 0.99,
+        "lives": 3, "shoot_cooldown": 15,
+        "cost": 0, "desc": "The balanced all-rounder."
+    },
+    "Interceptor": {
+        "size": 12, "thrust": 0.25, "turn_speed": 7, "friction": 0.995,
+        "lives": 3, "shoot_cooldown": 10,
+        "cost": 5000, "desc": "Fast & agile. Hard to stop."
+    },
+    "Heavy": {
+        "size": 18, "thrust": 0.18, "turn_speed": 4, "friction": 0.985,
+        "lives": 4, "shoot_cooldown": 20,
+        "cost": 7500, "desc": "Slow but tough. Starts with 4 lives."
+    }
+}
+
+# --- Player Config ---
+PLAYER_INVULN_TIME = 180
+PLAYER_HYPERSPACE_COOLDOWN = 300
+PLAYER_HYPERSPACE_WARP_TIME = 15
+PLAYER_DASH_COOLDOWN = 120 # NEW: 2 second cooldown
+PLAYER_DASH_DURATION = 10 # NEW: 1/6th of a second
+PLAYER_DASH_POWER = 12 # NEW: Speed boost
+PLAYER_NEAR_MISS_COOLDOWN = 10
+PLAYER_GHOST_TRAIL_LIFESPAN = 10
+PLAYER_GHOST_TRAIL_INTERVAL = 3
+
+# --- Bullet Config ---
+BULLET_SPEED = 10
+BULLET_LIFESPAN = 45
+MAX_BULLETS = 10
+ENEMY_BULLET_SPEED = 6 # UPDATED
+ENEMY_BULLET_LIFESPAN = 70
+
+# --- Asteroid Config ---
+ASTEROID_BASE_SPEED = 1.2 # UPDATED
+ASTEROID_SPEED_LEVEL_SCALE = 0.12 # UPDATED
+ASTEROID_LARGE_SIZE = 40
+ASTEROID_MEDIUM_SIZE = 20
+ASTEROID_SMALL_SIZE = 10
+ASTEROID_START_COUNT = 4
+ASTEROID_NEAR_MISS_RADIUS = 30
+
+# --- UFO Config ---
+UFO_SPAWN_TIME_MIN = 800
+UFO_SPAWN_TIME_MAX = 1500
+UFO_SPEED = 2.5 # UPDATED
+UFO_SHOOT_COOLDOWN = 90
+
+# --- Hunter Mine Config ---
+HUNTER_MINE_SPAWN_CHANCE = 0.3
+HUNTER_MINE_CHARGE_TIME = 120
+HUNTER_MINE_SIZE = 8
+SCORE_HUNTER_MINE = 75
+
+# --- Powerup Config ---
+POWERUP_DROP_CHANCE_SMALL = 0.1
+POWERUP_DROP_CHANCE_MEDIUM = 0.05
+POWERUP_LIFESPAN = 400
+POWERUP_SHIELD_TIME = 300
+POWERUP_TRIPLE_SHOT_TIME = 300
+
+# --- Score & Flow Config ---
+SCORE_FOR_EXTRA_LIFE = 10000
+SCORE_LARGE_ASTEROID = 20
+SCORE_MEDIUM_ASTEROID = 50
+SCORE_SMALL_ASTEROID = 100
+SCORE_UFO = 200
+SCORE_ELITE_UFO = 400
+SCORE_NEAR_MISS = 5
+FLOW_DURATION = 240
+FLOW_STATE_TRIGGER = 10
+FLOW_STATE_DURATION = 420
+
+
+# Values computed from others: override() recomputes them unless they are overridden too
+DERIVED = {
+    "SIM_STEP": lambda: 1.0 / FPS,
+    "RENDER_FPS": lambda: FPS,
+}
+PINNED = set() # DERIVED values set explicitly by an override(), left alone from then on
+
+
+def override(**values):
+    """ Sets config values here and in every loaded astro module that imported them,
+    then recomputes the DERIVED values that were never set explicitly """
+    modules = [module for name, module in list(sys.modules.items())
+               if name == "astro" or name.startswith("astro.")]
+    for name in values:
+        if name not in globals():
+            raise KeyError(f"Unknown config value: {name}")
+    for name, value in values.items():
+        for module in modules:
+            if name in vars(module):
+                setattr(module, name, value)
+    PINNED.update(name for name in values if name in DERIVED)
+    derived = {name: compute() for name, compute in DERIVED.items() if name not in PINNED}
+    for name, value in derived.items():
+        for module in modules:
+            if name in vars(module):
+                setattr(module, name, value)
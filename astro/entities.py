@@ -0,0 +1,573 @@
+"""
+Simulation entities: state and per-step update only. Drawing lives in
+astro.render, keyed on these classes.
+"""
+import math
+import random
+
+from .config import *
+from .geometry import Rect, wrap_position, deg_to_rad, get_distance
+from .sprite import Sprite
+
+
+# --- Controls Class ---
+class Controls:
+    """ Held steering input for the next simulation step. The app shell fills it from the
+    keyboard; agents and tools set it directly """
+    def __init__(self, left=False, right=False, thrust=False):
+        self.left = left
+        self.right = right
+        self.thrust = thrust
+
+    def set(self, left=False, right=False, thrust=False):
+        self.left = left
+        self.right = right
+        self.thrust = thrust
+
+
+# --- Player Class ---
+class Player:
+    def __init__(self, ship_type="Cruiser"):
+        self.ship_type = ship_type
+        self.stats = SHIP_STATS[self.ship_type]
+
+        self.lives = self.stats["lives"]
+        self.score = 0
+        self.hits_taken = 0 # Registered hits this run (used for agent rewards)
+        self.flow_states = 0 # HYPERFLOW activations this run
+        self.telemetry = None # Event bus (astro.telemetry), set by the World when recording
+        self.score_threshold_for_life = SCORE_FOR_EXTRA_LIFE
+        self.size = self.stats["size"]
+        self.rect = Rect(0, 0, self.size, self.size)
+        self.reset()
+
+    def reset(self):
+        self.x = SCREEN_WIDTH // 2
+        self.y = SCREEN_HEIGHT // 2
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.vel_x = 0
+        self.vel_y = 0
+        self.angle = -90
+        self.prev_angle = self.angle
+        self.invulnerable_timer = PLAYER_INVULN_TIME
+        self.thrusting = False
+        self.shoot_cooldown = 0
+        self.hyperspace_cooldown = 0
+        self.hyperspace_warp_timer = 0
+        self.dash_cooldown = 0
+        self.dash_timer = 0
+        self.near_miss_cooldown = 0
+        self.is_shielded = False
+        self.flow_level = 1
+        self.flow_timer = 0
+        self.triple_shot_timer = 0
+        self.flow_state_timer = 0
+        self.ghost_trail = []
+        self.ghost_trail_timer = 0
+        self.flow_text_shake_timer = 0
+
+        if hasattr(self, 'rect'):
+            self.rect.center = (self.x, self.y)
+
+    def update(self, controls):
+        self.prev_x, self.prev_y = self.x, self.y
+        self.prev_angle = self.angle
+        # Dash overrides controls
+        if self.dash_timer > 0:
+            self.dash_timer -= 1
+        else:
+            # Only allow input if not dashing
+            self.thrusting = False
+
+            if controls.left:
+                self.angle -= self.stats["turn_speed"]
+            if controls.right:
+                self.angle += self.stats["turn_speed"]
+
+            if controls.thrust:
+                self.thrusting = True
+                rad = deg_to_rad(self.angle)
+                self.vel_x += math.cos(rad) * self.stats["thrust"]
+                self.vel_y += math.sin(rad) * self.stats["thrust"]
+
+        self.vel_x *= self.stats["friction"]
+        self.vel_y *= self.stats["friction"]
+        self.x += self.vel_x
+        self.y += self.vel_y
+        self.x = wrap_position(self.x, SCREEN_WIDTH)
+        self.y = wrap_position(self.y, SCREEN_HEIGHT)
+        self.rect.center = (int(self.x), int(self.y))
+
+        # --- Timers ---
+        if self.invulnerable_timer > 0: self.invulnerable_timer -= 1
+        else: self.is_shielded = False
+        if self.shoot_cooldown > 0: self.shoot_cooldown -= 1
+        if self.hyperspace_cooldown > 0: self.hyperspace_cooldown -= 1
+        if self.hyperspace_warp_timer > 0: self.hyperspace_warp_timer -= 1
+        if self.dash_cooldown > 0: self.dash_cooldown -= 1
+        if self.near_miss_cooldown > 0: self.near_miss_cooldown -= 1
+        if self.triple_shot_timer > 0: self.triple_shot_timer -= 1
+        if self.flow_state_timer > 0:
+            self.flow_state_timer -= 1
+            if self.flow_state_timer == 0 and self.telemetry is not None:
+                self.telemetry.emit("flow_end", FLOW_STATE_DURATION, "expired")
+        if self.flow_text_shake_timer > 0: self.flow_text_shake_timer -= 1
+
+        if self.flow_timer > 0: self.flow_timer -= 1
+        else: self.flow_level = 1
+
+        # --- Ghost Trail ---
+        self.ghost_trail_timer -= 1
+        # Trail on thrust OR dash
+        if (self.thrusting or self.dash_timer > 0) and self.ghost_trail_timer <= 0:
+            self.ghost_trail.append([self.get_ship_points(), PLAYER_GHOST_TRAIL_LIFESPAN])
+            # Faster trail during dash
+            self.ghost_trail_timer = PLAYER_GHOST_TRAIL_INTERVAL if self.dash_timer == 0 else 1
+
+        new_trail = []
+        for points, lifespan in self.ghost_trail:
+            lifespan -= 1
+            if lifespan > 0:
+                new_trail.append([points, lifespan])
+        self.ghost_trail = new_trail
+
+    def get_ship_points(self, x=None, y=None, angle=None):
+        if x is None: x = self.x
+        if y is None: y = self.y
+        if angle is None: angle = self.angle
+        rad = deg_to_rad(angle)
+        p1_x = x + math.cos(rad) * self.size
+        p1_y = y + math.sin(rad) * self.size
+        rad2 = deg_to_rad(angle + 140)
+        p2_x = x + math.cos(rad2) * self.size
+        p2_y = y + math.sin(rad2) * self.size
+        rad3 = deg_to_rad(angle - 140)
+        p3_x = x + math.cos(rad3) * self.size
+        p3_y = y + math.sin(rad3) * self.size
+        return [(p1_x, p1_y), (p2_x, p2_y), (p3_x, p3_y)]
+
+    def shoot(self):
+        if self.shoot_cooldown == 0:
+            self.shoot_cooldown = self.stats["shoot_cooldown"]
+            rad = deg_to_rad(self.angle)
+            start_x = self.x + math.cos(rad) * self.size
+            start_y = self.y + math.sin(rad) * self.size
+
+            bullets = []
+
+            if self.flow_state_timer > 0:
+                self.shoot_cooldown = self.stats["shoot_cooldown"] // 2
+                bullets.append(Bullet(start_x, start_y, self.angle, is_laser=True))
+            elif self.triple_shot_timer > 0:
+                bullets.append(Bullet(start_x, start_y, self.angle))
+                bullets.append(Bullet(start_x, start_y, self.angle - 15))
+                bullets.append(Bullet(start_x, start_y, self.angle + 15))
+            else:
+                bullets.append(Bullet(start_x, start_y, self.angle))
+            return bullets
+        return []
+
+    def hyperspace(self):
+        if self.hyperspace_cooldown == 0:
+            from_x, from_y = self.x, self.y
+            self.x = random.randint(0, SCREEN_WIDTH)
+            self.y = random.randint(0, SCREEN_HEIGHT)
+            self.prev_x, self.prev_y = self.x, self.y # Teleport, don't sweep across the screen
+            self.vel_x = 0
+            self.vel_y = 0
+            self.hyperspace_cooldown = PLAYER_HYPERSPACE_COOLDOWN
+            self.hyperspace_warp_timer = PLAYER_HYPERSPACE_WARP_TIME
+            if self.telemetry is not None:
+                self.telemetry.emit("hyperspace", from_x, from_y, self.x, self.y)
+            return True
+        return False
+
+    def dash(self):
+        if self.dash_cooldown == 0:
+            self.dash_cooldown = PLAYER_DASH_COOLDOWN
+            self.dash_timer = PLAYER_DASH_DURATION
+            rad = deg_to_rad(self.angle)
+            self.vel_x += math.cos(rad) * PLAYER_DASH_POWER
+            self.vel_y += math.sin(rad) * PLAYER_DASH_POWER
+            self.invulnerable_timer = PLAYER_DASH_DURATION # Invulnerable during dash
+            if self.telemetry is not None:
+                self.telemetry.emit("dash", self.x, self.y, self.angle)
+            return True
+        return False
+
+    def hit(self, cause=None):
+        """ Called when player is hit. Returns (hit_registered, is_fatal) """
+        if self.invulnerable_timer == 0 and not self.is_shielded:
+            self.lives -= 1
+            self.hits_taken += 1
+            if self.telemetry is not None:
+                if self.flow_state_timer > 0:
+                    self.telemetry.emit("flow_end", FLOW_STATE_DURATION - self.flow_state_timer, "hit")
+                self.telemetry.emit("hit", cause, self.x, self.y, self.lives, self.lives <= 0)
+            self.flow_level = 1
+            self.flow_timer = 0
+            self.flow_state_timer = 0
+
+            is_fatal = self.lives <= 0
+
+            if not is_fatal:
+                self.reset()
+
+            return True, is_fatal
+        return False, False
+
+    def add_powerup(self, type):
+        if type == "shield":
+            self.invulnerable_timer = POWERUP_SHIELD_TIME
+            self.is_shielded = True
+        elif type == "triple_shot":
+            self.triple_shot_timer = POWERUP_TRIPLE_SHOT_TIME
+
+    def add_score(self, points, game_sfx):
+        point_bonus_multiplier = 2 if self.flow_state_timer > 0 else 1
+        final_score = (points * self.flow_level) * point_bonus_multiplier
+        self.score += final_score
+        if self.telemetry is not None:
+            self.telemetry.emit("score", points, final_score, self.flow_level, self.flow_state_timer > 0)
+        self.flow_timer = FLOW_DURATION
+        if self.flow_state_timer == 0:
+            self.flow_level += 1
+            self.flow_text_shake_timer = 15
+            if self.flow_level >= FLOW_STATE_TRIGGER:
+                self.flow_state_timer = FLOW_STATE_DURATION
+                self.flow_level = 1
+                self.flow_states += 1
+                if self.telemetry is not None:
+                    self.telemetry.emit("flow_start", self.score)
+        if self.score >= self.score_threshold_for_life:
+            self.lives += 1
+            self.score_threshold_for_life += SCORE_FOR_EXTRA_LIFE
+        return final_score
+
+# --- Bullet Class ---
+class Bullet(Sprite):
+    def __init__(self, x, y, angle, is_laser=False):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.angle = angle
+        rad = deg_to_rad(angle)
+        self.is_laser = is_laser
+        if self.is_laser:
+            self.vel_x = 0
+            self.vel_y = 0
+            self.lifespan = 5
+            self.rect = Rect(x-1, y-1, 2, 2)
+        else:
+            self.vel_x = math.cos(rad) * BULLET_SPEED
+            self.vel_y = math.sin(rad) * BULLET_SPEED
+            self.lifespan = BULLET_LIFESPAN
+            self.rect = Rect(x-2, y-2, 4, 4)
+    def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
+        if not self.is_laser:
+            self.x += self.vel_x
+            self.y += self.vel_y
+            self.x = wrap_position(self.x, SCREEN_WIDTH)
+            self.y = wrap_position(self.y, SCREEN_HEIGHT)
+            self.rect.center = (self.x, self.y)
+        self.lifespan -= 1
+        if self.lifespan <= 0: self.kill()
+
+# --- EnemyBullet Class ---
+class EnemyBullet(Sprite):
+    def __init__(self, x, y, angle):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.angle = angle
+        rad = deg_to_rad(angle)
+        self.vel_x = math.cos(rad) * ENEMY_BULLET_SPEED
+        self.vel_y = math.sin(rad) * ENEMY_BULLET_SPEED
+        self.lifespan = ENEMY_BULLET_LIFESPAN
+        self.rect = Rect(x-3, y-3, 6, 6)
+    def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
+        self.x += self.vel_x
+        self.y += self.vel_y
+        self.lifespan -= 1
+        self.x = wrap_position(self.x, SCREEN_WIDTH)
+        self.y = wrap_position(self.y, SCREEN_HEIGHT)
+        self.rect.center = (self.x, self.y)
+        if self.lifespan <= 0: self.kill()
+
+# --- Asteroid Class ---
+class Asteroid(Sprite):
+    def __init__(self, x=None, y=None, size=ASTEROID_LARGE_SIZE, game_level=1):
+        super().__init__()
+        if x is None:
+            if random.choice([True, False]):
+                self.x = random.choice([0 - ASTEROID_LARGE_SIZE, SCREEN_WIDTH + ASTEROID_LARGE_SIZE])
+                self.y = random.randint(0, SCREEN_HEIGHT)
+            else:
+                self.x = random.randint(0, SCREEN_WIDTH)
+                self.y = random.choice([0 - ASTEROID_LARGE_SIZE, SCREEN_HEIGHT + ASTEROID_LARGE_SIZE])
+        else:
+            self.x = x
+            self.y = y
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.size = size
+        self.radius = size
+        self.game_level = game_level
+        self.rect = Rect(self.x - self.radius, self.y - self.radius, self.radius * 2, self.radius * 2)
+        self.angle = random.randint(0, 359)
+        rad = deg_to_rad(self.angle)
+        speed = ASTEROID_BASE_SPEED + (game_level * ASTEROID_SPEED_LEVEL_SCALE) + random.uniform(-0.2, 0.2)
+        self.vel_x = math.cos(rad) * speed
+        self.vel_y = math.sin(rad) * speed
+        self.num_points = random.randint(8, 12)
+        self.shape_offsets = [random.uniform(0.7, 1.3) for _ in range(self.num_points)]
+        self.rot_angle = 0
+        self.prev_rot_angle = 0
+        self.rot_speed = random.uniform(-1.5, 1.5)
+        self.hit_flash_timer = 0
+        self.spawn_timer = 20
+
+        # Health
+        if self.size == ASTEROID_LARGE_SIZE:
+            self.health = 3
+        elif self.size == ASTEROID_MEDIUM_SIZE:
+            self.health = 2
+        else:
+            self.health = 1
+
+    def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
+        self.prev_rot_angle = self.rot_angle
+        self.x += self.vel_x
+        self.y += self.vel_y
+        self.rot_angle += self.rot_speed
+        self.x = wrap_position(self.x, SCREEN_WIDTH)
+        self.y = wrap_position(self.y, SCREEN_HEIGHT)
+        self.rect.center = (self.x, self.y)
+        if self.hit_flash_timer > 0: self.hit_flash_timer -= 1
+        if self.spawn_timer > 0: self.spawn_timer -= 1
+
+    def check_collision(self, obj_x, obj_y, obj_radius=1):
+        dist = get_distance((self.x, self.y), (obj_x, obj_y))
+        return dist < (self.radius + obj_radius)
+
+    def split(self):
+        if self.size == ASTEROID_LARGE_SIZE:
+            return [Asteroid(self.x, self.y, ASTEROID_MEDIUM_SIZE, self.game_level),
+                    Asteroid(self.x, self.y, ASTEROID_MEDIUM_SIZE, self.game_level)]
+        elif self.size == ASTEROID_MEDIUM_SIZE:
+            return [Asteroid(self.x, self.y, ASTEROID_SMALL_SIZE, self.game_level),
+                    Asteroid(self.x, self.y, ASTEROID_SMALL_SIZE, self.game_level)]
+        else:
+            return []
+
+# --- UFO Class ---
+class UFO(Sprite):
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+        self.size = 20
+        if random.choice([True, False]):
+            self.x = 0 - self.size
+            self.vel_x = UFO_SPEED
+        else:
+            self.x = SCREEN_WIDTH + self.size
+            self.vel_x = -UFO_SPEED
+        self.y = random.randint(self.size, SCREEN_HEIGHT - self.size)
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.vel_y = 0
+        self.rect = Rect(self.x - self.size, self.y - self.size // 2, self.size * 2, self.size)
+        self.shoot_cooldown = UFO_SHOOT_COOLDOWN
+        self.hit_flash_timer = 0
+        self.health = 1
+    def update(self):
+        self.prev_x = self.x
+        self.x += self.vel_x
+        self.rect.center = (self.x, self.y)
+        self.shoot_cooldown -= 1
+        if self.shoot_cooldown <= 0:
+            self.shoot()
+            self.shoot_cooldown = UFO_SHOOT_COOLDOWN
+        if self.x < 0 - self.size or self.x > SCREEN_WIDTH + self.size:
+            self.game.commands.kill(self)
+        if self.hit_flash_timer > 0:
+            self.hit_flash_timer -= 1
+    def shoot(self):
+        dx = self.game.player.x - self.x
+        dy = self.game.player.y - self.y
+        angle = math.degrees(math.atan2(dy, dx))
+        angle += random.uniform(-10, 10)
+        new_bullet = EnemyBullet(self.x, self.y, angle)
+        self.game.commands.spawn(new_bullet, self.game.all_sprites, self.game.enemy_bullets)
+
+# --- UFOElite Class ---
+class UFOElite(UFO):
+    def __init__(self, game):
+        super().__init__(game)
+        self.vel_x *= 1.3
+        self.shoot_cooldown = 70
+        self.health = 2
+        self.size = 22
+    def shoot(self):
+        dx = self.game.player.x - self.x
+        dy = self.game.player.y - self.y
+        base_angle = math.degrees(math.atan2(dy, dx))
+        angles = [base_angle - 15, base_angle, base_angle + 15]
+        for angle in angles:
+            new_bullet = EnemyBullet(self.x, self.y, angle)
+            self.game.commands.spawn(new_bullet, self.game.all_sprites, self.game.enemy_bullets)
+
+
+# --- HunterMine Class ---
+class HunterMine(Sprite):
+    def __init__(self, x, y, game):
+        super().__init__()
+        self.game = game
+        self.x = x
+        self.y = y
+        self.size = HUNTER_MINE_SIZE
+        self.rect = Rect(self.x - self.size, self.y - self.size, self.size * 2, self.size * 2)
+        self.charge_timer = HUNTER_MINE_CHARGE_TIME
+        self.pulse_timer = 0
+    def update(self):
+        self.charge_timer -= 1
+        self.pulse_timer = (self.pulse_timer + 1) % 60
+        if self.charge_timer <= 0:
+            self.shoot()
+            self.game.commands.kill(self)
+    def shoot(self):
+        dx = self.game.player.x - self.x
+        dy = self.game.player.y - self.y
+        angle = math.degrees(math.atan2(dy, dx))
+        new_bullet = EnemyBullet(self.x, self.y, angle)
+        self.game.commands.spawn(new_bullet, self.game.all_sprites, self.game.enemy_bullets)
+
+# --- PowerUp Class ---
+class PowerUp(Sprite):
+    def __init__(self, x, y, type):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.type = type
+        self.size = 10
+        self.rect = Rect(self.x - self.size, self.y - self.size, self.size * 2, self.size * 2)
+        self.lifespan = POWERUP_LIFESPAN
+        if self.type == "shield":
+            self.color = GREEN_SHIELD
+            self.letter = "S"
+        else:
+            self.color = BLUE_POWERUP
+            self.letter = "T"
+    def update(self):
+        self.lifespan -= 1
+        if self.lifespan <= 0: self.kill()
+
+# --- Particle Class ---
+class Particle:
+    def __init__(self, x, y, vel_x, vel_y, lifespan, color):
+        self.x = x
+        self.y = y
+        self.vel_x = vel_x
+        self.vel_y = vel_y
+        self.prev_x = x
+        self.prev_y = y
+        self.lifespan = lifespan
+        self.color = color
+        self.size = random.randint(1, 3)
+    def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
+        self.x += self.vel_x
+        self.y += self.vel_y
+        self.lifespan -= 1
+
+
+# --- Debris Class ---
+class Debris(Sprite):
+    def __init__(self, x, y, color):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.vel_x = random.uniform(-2, 2)
+        self.vel_y = random.uniform(-2, 2)
+        self.lifespan = random.randint(30, 60)
+        self.color = color
+        self.size = random.randint(1, 3)
+        self.prev_x = x
+        self.prev_y = y
+    def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
+        self.x += self.vel_x
+        self.y += self.vel_y
+        self.vel_x *= 0.99
+        self.vel_y *= 0.99
+        self.lifespan -= 1
+        if self.lifespan <= 0: self.kill()
+
+# --- PlayerDebris Class ---
+class PlayerDebris(Sprite):
+    def __init__(self, x, y, vel_x, vel_y, p1, p2):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.vel_x = vel_x + random.uniform(-2, 2)
+        self.vel_y = vel_y + random.uniform(-2, 2)
+        # Store relative points
+        self.p1 = (p1[0] - x, p1[1] - y)
+        self.p2 = (p2[0] - x, p2[1] - y)
+        self.lifespan = 90 # 1.5 seconds
+        self.rot_angle = 0
+        self.rot_speed = random.uniform(-5, 5)
+        self.prev_x = x
+        self.prev_y = y
+
+    def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
+        self.x += self.vel_x
+        self.y += self.vel_y
+        self.vel_x *= 0.99 # friction
+        self.vel_y *= 0.99
+        self.rot_angle += self.rot_speed
+        self.lifespan -= 1
+        if self.lifespan <= 0:
+            self.kill()
+
+# --- Shockwave Class ---
+class Shockwave(Sprite):
+    def __init__(self, x, y, max_radius=60, lifespan=30, width=3):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.lifespan = lifespan
+        self.max_lifespan = lifespan
+        self.max_radius = max_radius
+        self.width = width
+        self.rect = Rect(0, 0, self.max_radius*2, self.max_radius*2)
+        self.rect.center = (self.x, self.y)
+    def update(self):
+        self.lifespan -= 1
+        if self.lifespan <= 0: self.kill()
+
+
+# --- FloatingText Class ---
+class FloatingText(Sprite):
+    """ Score popup. x, y is the text's centre; the renderer does the fade from lifespan """
+    def __init__(self, x, y, text, color, lifespan=60):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.text_str = text
+        self.color = color
+        self.lifespan = lifespan
+        self.y_vel = -1
+    def update(self):
+        self.y += self.y_vel
+        self.lifespan -= 1
+        if self.lifespan <= 0: self.kill()
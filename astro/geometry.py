@@ -0,0 +1,222 @@
+"""
+Pure-Python geometry for the simulation: a Rect with pygame.Rect's integer
+semantics and the position/collision helpers.
+"""
+import math
+
+from .config import *
+
+
+def _int(value):
+    """ pygame.Rect's conversion for positions and sizes: truncate toward zero """
+    return int(value)
+
+def _round(value):
+    """ pygame.Rect's conversion for the center setter: round half away from zero """
+    return int(math.floor(abs(value) + 0.5)) * (1 if value >= 0 else -1)
+
+def _cdiv(a, b):
+    """ Integer division truncating toward zero, like C (SDL and pygame do their rect math in C) """
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b >= 0) else -q
+
+
+# --- Rect Class ---
+class Rect:
+    """ The subset of pygame.Rect the simulation uses, with the same integer results,
+    so the core can collide without importing pygame """
+    __slots__ = ("x", "y", "w", "h")
+
+    def __init__(self, x, y, w, h):
+        self.x = _int(x)
+        self.y = _int(y)
+        self.w = _int(w)
+        self.h = _int(h)
+
+    def __repr__(self):
+        return f"<rect({self.x}, {self.y}, {self.w}, {self.h})>"
+
+    def __eq__(self, other):
+        return isinstance(other, Rect) and (self.x, self.y, self.w, self.h) == (other.x, other.y, other.w, other.h)
+
+    @property
+    def width(self): return self.w
+
+    @property
+    def height(self): return self.h
+
+    @property
+    def right(self): return self.x + self.w
+
+    @property
+    def bottom(self): return self.y + self.h
+
+    @property
+    def topleft(self): return (self.x, self.y)
+
+    @property
+    def center(self):
+        return (self.x + self.w // 2, self.y + self.h // 2)
+
+    @center.setter
+    def center(self, pos):
+        self.x = _round(pos[0]) - self.w // 2
+        self.y = _round(pos[1]) - self.h // 2
+
+    def copy(self):
+        return Rect(self.x, self.y, self.w, self.h)
+
+    def move(self, dx, dy):
+        return Rect(self.x + _int(dx), self.y + _int(dy), self.w, self.h)
+
+    def inflate(self, dx, dy):
+        dx, dy = _int(dx), _int(dy)
+        return Rect(self.x - _cdiv(dx, 2), self.y - _cdiv(dy, 2), self.w + dx, self.h + dy)
+
+    def union(self, other):
+        x = min(self.x, other.x)
+        y = min(self.y, other.y)
+        return Rect(x, y, max(self.right, other.right) - x, max(self.bottom, other.bottom) - y)
+
+    def colliderect(self, other):
+        return (self.w != 0 and self.h != 0 and other.w != 0 and other.h != 0 and
+                self.x < other.x + other.w and self.y < other.y + other.h and
+                self.x + self.w > other.x and self.y + self.h > other.y)
+
+    def collidelistall(self, rects):
+        return [i for i, rect in enumerate(rects) if self.colliderect(rect)]
+
+    def _outcode(self, x, y):
+        code = 0
+        if y < self.y: code |= 1 # top
+        elif y >= self.y + self.h: code |= 2 # bottom
+        if x < self.x: code |= 4 # left
+        elif x >= self.x + self.w: code |= 8 # right
+        return code
+
+    def clipline(self, x1, y1, x2, y2):
+        """ The part of the line inside the rect as ((x1, y1), (x2, y2)), or () if it misses.
+        Same Cohen-Sutherland clipping as SDL_IntersectRectAndLine, which pygame uses """
+        x1, y1, x2, y2 = _int(x1), _int(y1), _int(x2), _int(y2)
+        if self.w <= 0 or self.h <= 0:
+            return ()
+        left, top = self.x, self.y
+        right, bottom = self.x + self.w - 1, self.y + self.h - 1
+
+        if (left <= x1 <= right and left <= x2 <= right and
+                top <= y1 <= bottom and top <= y2 <= bottom):
+            return ((x1, y1), (x2, y2))
+        if ((x1 < left and x2 < left) or (x1 > right and x2 > right) or
+                (y1 < top and y2 < top) or (y1 > bottom and y2 > bottom)):
+            return ()
+
+        if y1 == y2: # Horizontal
+            x1 = min(max(x1, left), right)
+            x2 = min(max(x2, left), right)
+            return ((x1, y1), (x2, y2))
+        if x1 == x2: # Vertical
+            y1 = min(max(y1, top), bottom)
+            y2 = min(max(y2, top), bottom)
+            return ((x1, y1), (x2, y2))
+
+        code1 = self._outcode(x1, y1)
+        code2 = self._outcode(x2, y2)
+        while code1 or code2:
+            if code1 & code2:
+                return ()
+            code = code1 or code2
+            if code & 1:
+                y = top
+                x = x1 + _cdiv((x2 - x1) * (y - y1), y2 - y1)
+            elif code & 2:
+                y = bottom
+                x = x1 + _cdiv((x2 - x1) * (y - y1), y2 - y1)
+            elif code & 4:
+                x = left
+                y = y1 + _cdiv((y2 - y1) * (x - x1), x2 - x1)
+            else:
+                x = right
+                y = y1 + _cdiv((y2 - y1) * (x - x1), x2 - x1)
+            if code1:
+                x1, y1 = x, y
+                code1 = self._outcode(x, y)
+            else:
+                x2, y2 = x, y
+                code2 = self._outcode(x, y)
+        return ((x1, y1), (x2, y2))
+
+
+# --- Helper Functions ---
+def wrap_position(pos, max_val):
+    if pos < 0: return max_val
+    if pos > max_val: return 0
+    return pos
+
+def deg_to_rad(deg):
+    return deg * math.pi / 180.0
+
+def get_distance(p1, p2):
+    dx = p1[0] - p2[0]
+    dy = p1[1] - p2[1]
+    return math.sqrt(dx**2 + dy**2)
+
+# --- Swept Collision Helpers ---
+def previous_position(obj):
+    """ Where obj was last frame, in the same screen space as its current position """
+    prev_x = getattr(obj, "prev_x", obj.x)
+    prev_y = getattr(obj, "prev_y", obj.y)
+    # Wrapped around an edge this frame: step back along the velocity instead
+    if abs(obj.x - prev_x) > SCREEN_WIDTH / 2: prev_x = obj.x - obj.vel_x
+    if abs(obj.y - prev_y) > SCREEN_HEIGHT / 2: prev_y = obj.y - obj.vel_y
+    return prev_x, prev_y
+
+def lerp_position(obj, interp):
+    """ Render position between the previous and current simulation step """
+    prev_x, prev_y = previous_position(obj)
+    return prev_x + (obj.x - prev_x) * interp, prev_y + (obj.y - prev_y) * interp
+
+def relative_path(mover, target):
+    """ Path of mover during the last frame, seen from target's current position """
+    mover_x0, mover_y0 = previous_position(mover)
+    target_x0, target_y0 = previous_position(target)
+    start_x = mover_x0 + (target.x - target_x0)
+    start_y = mover_y0 + (target.y - target_y0)
+    return start_x, start_y, mover.x, mover.y
+
+def segment_circle_hit(x0, y0, x1, y1, cx, cy, radius):
+    """ True if the segment (x0, y0) -> (x1, y1) passes within radius of (cx, cy) """
+    dx = x1 - x0
+    dy = y1 - y0
+    fx = x0 - cx
+    fy = y0 - cy
+    seg_len_sq = dx * dx + dy * dy
+    t = 0.0
+    if seg_len_sq > 0:
+        t = max(0.0, min(1.0, -(fx * dx + fy * dy) / seg_len_sq))
+    px = fx + dx * t
+    py = fy + dy * t
+    return px * px + py * py < radius * radius
+
+def swept_circle_collision(mover, target, radius):
+    """ Segment-vs-circle test using both objects' previous and current positions """
+    x0, y0, x1, y1 = relative_path(mover, target)
+    return segment_circle_hit(x0, y0, x1, y1, target.x, target.y, radius)
+
+def swept_rect_collision(mover, target, ratio=1.0):
+    """ Swept version of collide_rect_ratio: mover's centre path vs the Minkowski sum of both rects """
+    width = (target.rect.width + mover.rect.width) * ratio
+    height = (target.rect.height + mover.rect.height) * ratio
+    area = Rect(0, 0, width, height)
+    area.center = (target.x, target.y)
+    x0, y0, x1, y1 = relative_path(mover, target)
+    return bool(area.clipline(x0, y0, x1, y1))
+
+def collide_radius(sprite, ratio=1.0):
+    """ Same radius pygame.sprite.collide_circle_ratio derives from a sprite's rect """
+    return 0.5 * math.hypot(sprite.rect.width, sprite.rect.height) * ratio
+
+def swept_rect(sprite, margin=1):
+    """ Broad-phase bounds: the sprite's rect over its whole movement this frame """
+    prev_x, prev_y = previous_position(sprite)
+    bounds = sprite.rect.move(int(prev_x - sprite.x), int(prev_y - sprite.y)).union(sprite.rect)
+    return bounds.inflate(margin * 2, margin * 2)
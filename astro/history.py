@@ -0,0 +1,187 @@
+"""
+Run history: every finished run in a local SQLite database, indexed for the
+leaderboards the menus show (top runs overall, per ship and per day).
+
+Runs are written in batches by a background thread with its own connection.
+Queries run on the game thread, are cached until the next run is recorded and
+include runs that are still waiting to be written. Standard library only.
+"""
+import atexit
+import datetime
+import queue
+import sqlite3
+import threading
+import time
+
+from .config import *
+from . import persist
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,     -- Unix time the run ended
+    day TEXT NOT NULL,           -- Local date of played_at, YYYY-MM-DD
+    ship TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    duration_s REAL NOT NULL,
+    flow_states INTEGER NOT NULL,
+    cause TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_ship ON runs (ship, score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day, score DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+COLUMNS = ("id", "played_at", "day", "ship", "score", "level", "duration_s", "flow_states", "cause")
+INSERT_RUN = f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+LEGACY_SHIP = "-" # Ship of the run imported from HIGH_SCORE_FILE, which never recorded one
+
+
+def day_of(timestamp):
+    return datetime.date.fromtimestamp(timestamp).isoformat()
+
+
+# --- Run History Class ---
+class RunHistory:
+    """ One database per save directory. Row ids are handed out here rather than by SQLite,
+    so a queued run and its written copy are recognisably the same run """
+    def __init__(self, path=HISTORY_DB_FILE, legacy_high_score_file=HIGH_SCORE_FILE):
+        self.path = path
+        self.db = sqlite3.connect(path) # Game thread: reads only (and the one-off migration)
+        self.db.execute("PRAGMA journal_mode=WAL") # Readers never wait for the writer's commit
+        self.db.executescript(SCHEMA)
+        self.next_id = (self.db.execute("SELECT MAX(id) FROM runs").fetchone()[0] or 0) + 1
+        if legacy_high_score_file is not None:
+            self.migrate(legacy_high_score_file)
+        # Runs per ship, counted once here and kept up to date by record()
+        self.counts = dict(self.db.execute("SELECT ship, COUNT(*) FROM runs GROUP BY ship"))
+
+        self.pending = {} # id -> row queued but not yet committed
+        self.backlog = [] # Rows that didn't fit in the queue; the writer adds them to its next commit
+        self.lock = threading.Lock()
+        self.cache = {} # query -> result, cleared whenever a run is recorded
+        self.queue = queue.Queue(maxsize=HISTORY_QUEUE_SIZE)
+        self.batches = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self.run_writer, name="astro-history", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def migrate(self, high_score_file):
+        """ First launch: the single score in HIGH_SCORE_FILE becomes a run of its own """
+        if self.db.execute("SELECT 1 FROM meta WHERE key = 'high_score_migrated'").fetchone():
+            return
+        try:
+            score, _ = persist.load(high_score_file, int)
+        except (IOError, ValueError):
+            score = 0
+        with self.db:
+            if score > 0:
+                played_at = time.time()
+                self.db.execute(INSERT_RUN, (self.next_id, played_at, day_of(played_at), LEGACY_SHIP,
+                                             score, 0, 0.0, 0, "imported"))
+                self.next_id += 1
+            self.db.execute("INSERT INTO meta VALUES ('high_score_migrated', ?)", (str(score),))
+
+    # --- Writing ---
+    def record(self, summary, played_at=None):
+        """ Queues one run (World.run_summary()). Returns at once; the writer thread commits it """
+        if played_at is None:
+            played_at = time.time()
+        row = (self.next_id, played_at, day_of(played_at), summary["ship"], summary["score"],
+               summary["level"], summary["duration_s"], summary["flow_states"], summary["cause"])
+        self.next_id += 1
+        self.counts[row[3]] = self.counts.get(row[3], 0) + 1
+        with self.lock:
+            self.pending[row[0]] = row
+            try:
+                self.queue.put_nowait(row)
+            except queue.Full:
+                # HISTORY_QUEUE_SIZE runs already waiting: the writer still has some to get,
+                # and takes this row from the backlog with them
+                self.backlog.append(row)
+        self.cache.clear()
+
+    def run_writer(self):
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA synchronous=NORMAL") # WAL: durable at checkpoints, no fsync per commit
+        try:
+            while True:
+                # Take what is queued, waiting up to HISTORY_BATCH_WAIT for more to share the commit
+                batch = [self.queue.get()]
+                deadline = time.monotonic() + HISTORY_BATCH_WAIT
+                while batch[-1] is not None and len(batch) < HISTORY_BATCH_SIZE:
+                    try:
+                        batch.append(self.queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                    except queue.Empty:
+                        break
+                with self.lock:
+                    backlog, self.backlog = self.backlog, []
+                rows = [row for row in batch if row is not None] + backlog
+                if rows:
+                    try:
+                        with db:
+                            db.executemany(INSERT_RUN, rows)
+                        self.batches += 1
+                        with self.lock:
+                            for row in rows:
+                                del self.pending[row[0]]
+                    except sqlite3.Error:
+                        print("Error: Could not save run history.") # Runs stay queryable this session
+                for _ in batch:
+                    self.queue.task_done()
+                if batch[-1] is None:
+                    return
+        finally:
+            db.close()
+
+    def flush(self):
+        """ Waits until every recorded run is committed """
+        self.queue.join()
+
+    def close(self):
+        """ Commits what is queued and stops the writer. Safe to call more than once """
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+        self.db.close()
+
+    # --- Queries ---
+    def top_runs(self, ship=None, day=None, limit=5):
+        """ Highest-scoring runs as dicts, optionally for one ship and/or one day (YYYY-MM-DD).
+        Served by the runs_by_score/ship/day indexes """
+        key = ("top_runs", ship, day, limit)
+        if key in self.cache:
+            return self.cache[key]
+        where, params = [], []
+        if ship is not None:
+            where.append("ship = ?")
+            params.append(ship)
+        if day is not None:
+            where.append("day = ?")
+            params.append(day)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY score DESC LIMIT ?"
+        # Snapshot the queue first: a run committed in between then shows up twice, never zero times
+        with self.lock:
+            queued = [row for row in self.pending.values()
+                      if (ship is None or row[3] == ship) and (day is None or row[2] == day)]
+        rows = {row[0]: row for row in self.db.execute(sql, (*params, limit))}
+        for row in queued:
+            rows[row[0]] = row
+        result = [dict(zip(COLUMNS, row)) for row in sorted(rows.values(), key=lambda row: row[4], reverse=True)[:limit]]
+        self.cache[key] = result
+        return result
+
+    def best_score(self, ship=None, day=None):
+        """ Personal best, overall or for one ship and/or day; 0 before the first run """
+        top = self.top_runs(ship, day, limit=1)
+        return top[0]["score"] if top else 0
+
+    def run_count(self, ship=None):
+        return sum(self.counts.values()) if ship is None else self.counts.get(ship, 0)
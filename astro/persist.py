@@ -0,0 +1,131 @@
+"""
+Save files written off the game thread: atomic replace with fsync, one backup
+copy per file, and coalescing so only the newest contents of a file are written.
+Standard library only.
+"""
+import atexit
+import os
+import queue
+import threading
+
+from .config import *
+
+
+def backup_path(path):
+    return path + ".bak"
+
+
+def parses(path, parse):
+    try:
+        with open(path, "r") as f:
+            parse(f.read())
+        return True
+    except (IOError, ValueError):
+        return False
+
+
+def atomic_write(path, text, parse=None):
+    """ Writes text (str, or bytes for binary files) to path so a reader sees either the old
+    file or the new one, never a torn write. The previous version is kept as path.bak, the
+    copy load() falls back to. With parse (the one load() gets), a previous version that
+    doesn't parse is dropped instead, so a damaged file never replaces the last good backup """
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb" if isinstance(text, bytes) else "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    if os.path.exists(path) and (parse is None or parses(path, parse)):
+        os.replace(path, backup_path(path))
+    os.replace(tmp_path, path)
+    if hasattr(os, "O_DIRECTORY"): # Make the renames themselves durable (POSIX)
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def load(path, parse):
+    """ parse(text) of path, or of its backup if path is missing or unreadable.
+    Returns (value, recovered); raises the original error if neither copy parses """
+    try:
+        with open(path, "r") as f:
+            return parse(f.read()), False
+    except (IOError, ValueError) as error:
+        try:
+            with open(backup_path(path), "r") as f:
+                return parse(f.read()), True
+        except (IOError, ValueError):
+            raise error
+
+
+# --- Persistence Worker Class ---
+class PersistenceWorker:
+    """ Writes save files on a background thread. save() only records the newest text for a
+    path and queues the path once, so a burst of saves to one file costs one write. The queue
+    is bounded; with one entry per file it only fills if callers save many distinct files, and
+    then the path goes on a backlog the worker writes after its current file: save() never blocks """
+    def __init__(self, queue_size=PERSIST_QUEUE_SIZE):
+        self.pending = {} # path -> (newest text not yet written, parse for atomic_write)
+        self.backlog = [] # Pending paths that didn't fit in the queue
+        self.lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.writes = 0
+        self.coalesced = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name="astro-persist", daemon=True)
+        self.thread.start()
+        atexit.register(self.close) # Tools that never call close() still get their saves
+
+    def save(self, path, text, parse=None):
+        """ Queues text for path. parse: how load() reads the file, so a damaged copy on disk
+        isn't kept as the backup (see atomic_write) """
+        with self.lock:
+            queued = path in self.pending
+            self.pending[path] = (text, parse)
+            if queued:
+                self.coalesced += 1
+                return
+            try:
+                self.queue.put_nowait(path)
+            except queue.Full:
+                # The worker takes the lock to drain the backlog after each queued path,
+                # and the queue being full means it has at least one still to get
+                self.backlog.append(path)
+
+    def run(self):
+        while True:
+            path = self.queue.get()
+            try:
+                if path is None:
+                    return
+                self.write(path)
+                with self.lock:
+                    backlog, self.backlog = self.backlog, []
+                for path in backlog:
+                    self.write(path)
+            finally:
+                self.queue.task_done()
+
+    def write(self, path):
+        with self.lock:
+            entry = self.pending.pop(path, None)
+        if entry is not None:
+            try:
+                atomic_write(path, *entry)
+                self.writes += 1
+            except OSError:
+                print(f"Error: Could not save {os.path.basename(path)}.")
+
+    def flush(self):
+        """ Waits until every save made so far is on disk """
+        self.queue.join()
+
+    def close(self):
+        """ Flushes and stops the thread. Safe to call more than once """
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
@@ -0,0 +1,656 @@
+"""
+Render layer: draws a World into an offscreen game surface with pygame.
+
+Needs pygame.font but no window: pixel observations and render benchmarks
+use a Renderer without ever calling display.set_mode. Fonts and the effect
+surfaces are created on first use. Visual-only randomness
+(shake, hit jitter, warp lines) comes from the renderer's own RNG, so drawing
+never changes the simulation's random stream.
+"""
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+
+import pygame
+
+from .config import *
+from .geometry import deg_to_rad, lerp_position
+from .entities import (Player, Bullet, EnemyBullet, Asteroid, UFO, UFOElite, HunterMine, PowerUp,
+                       Particle, Debris, PlayerDebris, Shockwave, FloatingText)
+
+
+# Fonts are created on first use (see Renderer.__getattr__): name -> (size, bold)
+FONT_SPECS = {
+    "font": (20, False),
+    "font_small": (16, False),
+    "medium_font": (30, False),
+    "large_font": (50, False),
+    "flow_font": (30, True),
+    "text_font": (16, True), # Floating score text
+    "powerup_font": (15, True),
+}
+# Full-screen scratch surfaces only the chromatic aberration effects need
+LAZY_SURFACES = ("chroma_surf_r", "chroma_surf_b")
+TEXT_CACHE_SIZE = 512 # Cached text renders kept; the least recently used go first (warmed ones never)
+COUNTDOWN_FONT_SIZES = range(50, 80) # The "Get Ready" countdown pulses through these sizes
+SHOCKWAVE_VARIANTS = ((60, 30, 3), (40, 20, 2)) # (max_radius, lifespan, width): explosions, power-ups
+DEBRIS_SIZES = (1, 2, 3)
+
+
+# --- Renderer Class ---
+class Renderer:
+    """ Draws a World into game_surface. Owns every font, scratch surface and the RNG used
+    for visual noise, so drawing never touches the simulation's random stream """
+    def __init__(self, world, surface=None):
+        self.world = world
+        self.rng = random.Random()
+        self.trace = None # StartupTrace that lazy creation is reported to (set by the app shell)
+        self.game_surface = surface if surface is not None else pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # Held to create a font or lazy surface and around font.render: the warm-up thread uses
+        # them while the menus draw, and SDL_ttf/FreeType is not thread-safe
+        self.lock = threading.RLock()
+
+        # Scratch surfaces shared by every sprite of a size (entities no longer own surfaces)
+        self.debris_images = {}
+        self.player_debris_images = {}
+        # Finished images, reused as long as their inputs repeat (see warmup_jobs)
+        self.text_images = OrderedDict() # LRU of the drawing thread's renders
+        self.pinned_text = {} # Renders made by warmup_jobs: never evicted
+        self.countdown_fonts = {}
+        self.shockwave_frames = {}
+        self.ship_previews = {}
+
+        self.draw_funcs = {
+            Bullet: self.draw_bullet,
+            EnemyBullet: self.draw_enemy_bullet,
+            Asteroid: self.draw_asteroid,
+            UFO: self.draw_ufo,
+            UFOElite: self.draw_ufo,
+            HunterMine: self.draw_hunter_mine,
+            PowerUp: self.draw_powerup,
+            Particle: self.draw_particle,
+            Debris: self.draw_debris,
+            PlayerDebris: self.draw_player_debris,
+            Shockwave: self.draw_shockwave,
+            FloatingText: self.draw_floating_text,
+        }
+
+    def __getattr__(self, name):
+        """ Creates fonts and effect surfaces the first time they are read. SysFont scans the
+        system fonts on its first call, so a renderer that never draws text never pays for it """
+        if name not in FONT_SPECS and name not in LAZY_SURFACES and name != "vignette_surf":
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        with self.lock:
+            if name in self.__dict__:
+                return self.__dict__[name] # The other thread created it while this one waited
+            start = time.perf_counter()
+            if name in FONT_SPECS:
+                size, bold = FONT_SPECS[name]
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                value = pygame.font.SysFont("monospace", size, bold=bold)
+            elif name == "vignette_surf":
+                value = self.build_vignette()
+            else:
+                value = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            setattr(self, name, value)
+        if self.trace is not None:
+            self.trace.add(f"renderer.{name}", start, time.perf_counter())
+        return value
+
+    # --- Caches ---
+    def render_text(self, font, text, color, pin=False):
+        """ font.render(text, True, color), kept for the next frame: labels, counters and
+        floating scores repeat for many frames. Callers may set_alpha but not draw on it.
+        pin keeps it for good (the warm-up's renders); the rest are evicted least recently used """
+        key = (font, text, color)
+        image = self.pinned_text.get(key)
+        if image is not None:
+            return image
+        if pin:
+            with self.lock:
+                image = self.pinned_text[key] = font.render(text, True, color)
+            return image
+        image = self.text_images.get(key)
+        if image is None:
+            with self.lock:
+                image = font.render(text, True, color)
+            self.text_images[key] = image
+            if len(self.text_images) > TEXT_CACHE_SIZE:
+                self.text_images.popitem(last=False)
+        else:
+            self.text_images.move_to_end(key)
+        return image
+
+    def countdown_font(self, size):
+        font = self.countdown_fonts.get(size)
+        if font is None:
+            with self.lock:
+                font = self.countdown_fonts.get(size)
+                if font is None:
+                    font = self.countdown_fonts[size] = pygame.font.SysFont("monospace", size, bold=True)
+        return font
+
+    def shockwave_frame(self, max_radius, max_lifespan, width, lifespan):
+        """ A shockwave ring depends only on its variant and remaining lifespan, so every
+        frame of it is drawn once and reused """
+        key = (max_radius, max_lifespan, width, lifespan)
+        image = self.shockwave_frames.get(key)
+        if image is None:
+            progress = (max_lifespan - lifespan) / max_lifespan
+            current_radius = int(progress * max_radius)
+            alpha = int((1.0 - progress) * 200)
+            image = pygame.Surface((max_radius * 2, max_radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(image, (WHITE[0], WHITE[1], WHITE[2], alpha),
+                               (max_radius, max_radius), current_radius, width)
+            self.shockwave_frames[key] = image
+        return image
+
+    def debris_image(self, size):
+        image = self.debris_images.get(size)
+        if image is None:
+            image = self.debris_images[size] = pygame.Surface((size, size), pygame.SRCALPHA)
+        return image
+
+    def player_debris_image(self, reach):
+        image = self.player_debris_images.get(reach)
+        if image is None:
+            image = self.player_debris_images[reach] = pygame.Surface((reach * 2 + 1, reach * 2 + 1), pygame.SRCALPHA)
+        return image
+
+    def ship_preview(self, ship_type):
+        """ Nose-up outline of a ship type, centred in its own surface """
+        image = self.ship_previews.get(ship_type)
+        if image is None:
+            ship = Player(ship_type)
+            half = ship.size + 2
+            image = pygame.Surface((half * 2 + 1, half * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.polygon(image, WHITE, ship.get_ship_points(half, half, -90), 2)
+            self.ship_previews[ship_type] = image
+        return image
+
+    def build_vignette(self):
+        vignette = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        for i in range(10, 0, -1):
+            alpha = (10 - i) * 10
+            pygame.draw.circle(vignette, (0, 0, 0, alpha),
+                               (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2),
+                               int(SCREEN_WIDTH * (i / 10)), 30)
+        return vignette
+
+    def warmup_jobs(self):
+        """ (label, job) pairs that create every font, text render and effect frame a run would
+        otherwise build on first use: the first explosion, floating score, HYPERFLOW and
+        countdown. astro.warmup.Warmup runs them while the menus are up """
+        world = self.world
+        jobs = [(f"font {name}", lambda name=name: getattr(self, name)) for name in FONT_SPECS]
+        jobs += [(name, lambda name=name: getattr(self, name)) for name in LAZY_SURFACES + ("vignette_surf",)]
+        for size in COUNTDOWN_FONT_SIZES:
+            jobs.append((f"countdown {size}", lambda size=size: [
+                self.render_text(self.countdown_font(size), text, WHITE, pin=True) for text in ("1", "2", "3", "GO!")]))
+
+        def labels():
+            for level in range(FLOW_STATE_TRIGGER + 1):
+                self.render_text(self.flow_font, f"FLOW x{level}", YELLOW, pin=True)
+            self.render_text(self.large_font, "! WARNING !", RED, pin=True)
+            self.render_text(self.medium_font, "BOSS INCOMING", RED, pin=True)
+            for level in range(1, 11):
+                self.render_text(self.large_font, f"LEVEL {level} CLEAR", WHITE, pin=True)
+            self.render_text(self.font, "Score: 0", WHITE, pin=True)
+            self.render_text(self.font, "Level: 1", WHITE, pin=True)
+            self.render_text(self.font, f"High: {world.high_score}", GREY, pin=True)
+            self.render_text(self.font, f"Credits: {world.player_data['total_credits']}", YELLOW, pin=True)
+            for letter in ("S", "T"):
+                self.render_text(self.powerup_font, letter, WHITE, pin=True)
+        jobs.append(("labels", labels))
+
+        def floating_scores():
+            # add_score multiplies by the flow level (1 .. FLOW_STATE_TRIGGER - 1)
+            for points, color in ((SCORE_LARGE_ASTEROID, WHITE), (SCORE_MEDIUM_ASTEROID, WHITE),
+                                  (SCORE_SMALL_ASTEROID, WHITE), (SCORE_UFO, PURPLE),
+                                  (SCORE_ELITE_UFO, PURPLE), (SCORE_HUNTER_MINE, PURPLE)):
+                for level in range(1, FLOW_STATE_TRIGGER):
+                    self.render_text(self.text_font, f"+{points * level}", color, pin=True)
+            self.render_text(self.text_font, f"+{SCORE_NEAR_MISS}", CYAN, pin=True)
+        jobs.append(("floating scores", floating_scores))
+
+        for max_radius, max_lifespan, width in SHOCKWAVE_VARIANTS:
+            jobs.append((f"shockwave {max_radius}", lambda max_radius=max_radius, max_lifespan=max_lifespan, width=width: [
+                self.shockwave_frame(max_radius, max_lifespan, width, lifespan) for lifespan in range(1, max_lifespan + 1)]))
+        jobs.append(("debris", lambda: [self.debris_image(size) for size in DEBRIS_SIZES]))
+        jobs += [(f"ship preview {ship_type}", lambda ship_type=ship_type: self.ship_preview(ship_type))
+                 for ship_type in SHIP_STATS]
+        return jobs
+
+    def draw_entity(self, surface, entity, interp=1.0):
+        self.draw_funcs[type(entity)](surface, entity, interp)
+
+    # --- Entities ---
+    def draw_player(self, surface, player, interp=1.0):
+        # Render between the previous and current simulation step
+        x, y = lerp_position(player, interp)
+        angle = player.prev_angle + (player.angle - player.prev_angle) * interp
+
+        # Draw Ghost Trail
+        for points, lifespan in player.ghost_trail:
+            alpha = (lifespan / PLAYER_GHOST_TRAIL_LIFESPAN) * 100
+            trail_surf = surface.copy()
+            pygame.draw.polygon(trail_surf, WHITE, points, 1)
+            trail_surf.set_alpha(alpha)
+            surface.blit(trail_surf, (0, 0))
+
+        # --- Dash Visuals ---
+        if player.dash_timer > 0:
+            progress = player.dash_timer / PLAYER_DASH_DURATION # 1.0 -> 0.0
+            stretch_factor = 1.0 + (progress * 2.0) # 3.0 -> 1.0
+
+            rad = deg_to_rad(angle)
+            # Stretched nose
+            p1_x = x + math.cos(rad) * player.size * stretch_factor
+            p1_y = y + math.sin(rad) * player.size * stretch_factor
+
+            # Tucked-in rear
+            rad2 = deg_to_rad(angle + 140)
+            p2_x = x + math.cos(rad2) * player.size * (1.0 - progress * 0.5)
+            p2_y = y + math.sin(rad2) * player.size * (1.0 - progress * 0.5)
+            rad3 = deg_to_rad(angle - 140)
+            p3_x = x + math.cos(rad3) * player.size * (1.0 - progress * 0.5)
+            p3_y = y + math.sin(rad3) * player.size * (1.0 - progress * 0.5)
+
+            pygame.draw.polygon(surface, CYAN, [(p1_x, p1_y), (p2_x, p2_y), (p3_x, p3_y)], 2)
+            return # Skip all other drawing when dashing
+
+        # Draw ship
+        points = player.get_ship_points(x, y, angle)
+
+        # Draw thruster flame
+        if player.thrusting:
+            if (pygame.time.get_ticks() // 4) % 2 == 0:
+                rad = deg_to_rad(angle)
+                center_x = (points[1][0] + points[2][0]) / 2
+                center_y = (points[1][1] + points[2][1]) / 2
+                flame_len = player.size * 1.2
+                flame_p_x = center_x - math.cos(rad) * flame_len
+                flame_p_y = center_y - math.sin(rad) * flame_len
+                pygame.draw.polygon(surface, ORANGE, [points[1], points[2], (flame_p_x, flame_p_y)])
+
+        # Draw Shield
+        if player.is_shielded and (pygame.time.get_ticks() // 4) % 2 == 0:
+             pygame.draw.circle(surface, GREEN_SHIELD, (int(x), int(y)), player.size + 5, 1)
+
+        # Respawn "Warp-In" animation
+        respawn_anim_len = 30
+        if player.invulnerable_timer > PLAYER_INVULN_TIME - respawn_anim_len:
+            progress = (PLAYER_INVULN_TIME - player.invulnerable_timer) / respawn_anim_len
+            center_x, center_y = x, y
+            for i in range(20):
+                line_angle = self.rng.uniform(0, 360)
+                rad = deg_to_rad(line_angle)
+                start_dist = (1.0 - progress) * 150 + 20
+                end_dist = (1.0 - progress) * 200 + 40
+                start_x = center_x + math.cos(rad) * start_dist
+                start_y = center_y + math.sin(rad) * start_dist
+                end_x = center_x + math.cos(rad) * end_dist
+                end_y = center_y + math.sin(rad) * end_dist
+
+                alpha = progress * 255
+
+                line_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+                # 'alpha' must be an integer, not a float
+                pygame.draw.line(line_surf, (255, 255, 255, int(alpha)), (start_x, start_y), (end_x, end_y), 2)
+                surface.blit(line_surf, (0, 0))
+
+            if progress < 0.2:
+                return
+
+        # Flash if invulnerable
+        if not player.is_shielded and player.invulnerable_timer > 0 and (player.invulnerable_timer // 10) % 2 == 0:
+            return
+
+        pygame.draw.polygon(surface, WHITE, points, 2)
+
+    def draw_bullet(self, surface, bullet, interp=1.0):
+        if bullet.is_laser:
+            rad = deg_to_rad(bullet.angle)
+            end_x = bullet.x + math.cos(rad) * 1000
+            end_y = bullet.y + math.sin(rad) * 1000
+            alpha = (bullet.lifespan / 5) * 255
+            width = 4
+            laser_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            pygame.draw.line(laser_surf, (255, 255, 255, alpha), (int(bullet.x), int(bullet.y)), (int(end_x), int(end_y)), width)
+            pygame.draw.line(laser_surf, (CYAN[0], CYAN[1], CYAN[2], int(alpha * 0.5)), (int(bullet.x), int(bullet.y)), (int(end_x), int(end_y)), width + 4)
+            surface.blit(laser_surf, (0, 0))
+        else:
+            x, y = lerp_position(bullet, interp)
+            pygame.draw.circle(surface, WHITE, (int(x), int(y)), 2)
+
+    def draw_enemy_bullet(self, surface, bullet, interp=1.0):
+        x, y = lerp_position(bullet, interp)
+        pygame.draw.circle(surface, RED, (int(x), int(y)), 3)
+
+    def draw_asteroid(self, surface, asteroid, interp=1.0):
+        points = []
+        scale = 1.0
+        if asteroid.spawn_timer > 0:
+            scale = 1.0 - (asteroid.spawn_timer / 20.0)
+
+        draw_x, draw_y = lerp_position(asteroid, interp)
+        rot_angle = asteroid.prev_rot_angle + (asteroid.rot_angle - asteroid.prev_rot_angle) * interp
+        # Shake when hit
+        if asteroid.hit_flash_timer > 0:
+            draw_x += self.rng.randint(-2, 2)
+            draw_y += self.rng.randint(-2, 2)
+
+        for i in range(asteroid.num_points):
+            angle_step = 360 / asteroid.num_points
+            rad = deg_to_rad(i * angle_step + rot_angle)
+            dist = asteroid.radius * asteroid.shape_offsets[i] * scale
+            p_x = draw_x + math.cos(rad) * dist
+            p_y = draw_y + math.sin(rad) * dist
+            points.append((p_x, p_y))
+
+        color = WHITE
+        if asteroid.hit_flash_timer > 0: color = RED
+
+        pygame.draw.polygon(surface, color, points, 2)
+
+    def draw_ufo(self, surface, ufo, interp=1.0):
+        color = RED if isinstance(ufo, UFOElite) else PURPLE
+        if ufo.hit_flash_timer > 0: color = WHITE
+        x, y = lerp_position(ufo, interp)
+        p1 = (x - ufo.size, y)
+        p2 = (x + ufo.size, y)
+        p3 = (x + ufo.size * 0.7, y - ufo.size // 2)
+        p4 = (x - ufo.size * 0.7, y - ufo.size // 2)
+        pygame.draw.polygon(surface, color, [p1, p2, p3, p4], 2)
+        pygame.draw.line(surface, color, (x - ufo.size, y), (x + ufo.size, y), 3)
+
+    def draw_hunter_mine(self, surface, mine, interp=1.0):
+        pulse_val = (math.sin(mine.pulse_timer * 0.1) + 1) / 2
+        current_size = mine.size + int(pulse_val * 4)
+        color = PURPLE
+        if mine.charge_timer < 30 and (mine.charge_timer // 3) % 2 == 0:
+            color = WHITE
+        p1 = (mine.x, mine.y - current_size)
+        p2 = (mine.x + current_size, mine.y)
+        p3 = (mine.x, mine.y + current_size)
+        p4 = (mine.x - current_size, mine.y)
+        pygame.draw.polygon(surface, color, [p1, p2, p3, p4], 2)
+
+    def draw_powerup(self, surface, powerup, interp=1.0):
+        if (powerup.lifespan // 10) % 2 == 0: current_color = powerup.color
+        else: current_color = WHITE
+        pygame.draw.circle(surface, current_color, (int(powerup.x), int(powerup.y)), powerup.size + 2, 2)
+        text = self.render_text(self.powerup_font, powerup.letter, WHITE)
+        surface.blit(text, text.get_rect(center=(powerup.x, powerup.y)))
+
+    def draw_particle(self, surface, particle, interp=1.0):
+        x, y = lerp_position(particle, interp)
+        pygame.draw.circle(surface, particle.color, (int(x), int(y)), particle.size)
+
+    def draw_debris(self, surface, debris, interp=1.0):
+        image = self.debris_image(debris.size)
+        alpha = max(0, int((debris.lifespan / 60) * 200))
+        image.fill((debris.color[0], debris.color[1], debris.color[2], alpha))
+        x, y = lerp_position(debris, interp)
+        surface.blit(image, (int(x), int(y)))
+
+    def draw_player_debris(self, surface, debris, interp=1.0):
+        alpha = max(0, int((debris.lifespan / 90) * 255))
+        rad = deg_to_rad(debris.rot_angle)
+        cos_rad = math.cos(rad)
+        sin_rad = math.sin(rad)
+
+        # Rotate point 1
+        x1 = debris.p1[0] * cos_rad - debris.p1[1] * sin_rad
+        y1 = debris.p1[0] * sin_rad + debris.p1[1] * cos_rad
+        # Rotate point 2
+        x2 = debris.p2[0] * cos_rad - debris.p2[1] * sin_rad
+        y2 = debris.p2[0] * sin_rad + debris.p2[1] * cos_rad
+
+        # Alpha line on a scratch surface just big enough for the piece
+        x, y = lerp_position(debris, interp)
+        reach = int(max(abs(x1), abs(y1), abs(x2), abs(y2))) + 2
+        line_surf = self.player_debris_image(reach)
+        line_surf.fill((0, 0, 0, 0))
+        left, top = int(x) - reach, int(y) - reach
+        pygame.draw.line(line_surf, (WHITE[0], WHITE[1], WHITE[2], alpha),
+                         (x + x1 - left, y + y1 - top),
+                         (x + x2 - left, y + y2 - top), 2)
+        surface.blit(line_surf, (left, top))
+
+    def draw_shockwave(self, surface, shockwave, interp=1.0):
+        image = self.shockwave_frame(shockwave.max_radius, shockwave.max_lifespan, shockwave.width, shockwave.lifespan)
+        surface.blit(image, shockwave.rect.topleft)
+
+    def draw_floating_text(self, surface, text, interp=1.0):
+        alpha = 255
+        if text.lifespan < 20:
+            alpha = max(0, int((text.lifespan / 20) * 255))
+        image = self.render_text(self.text_font, text.text_str, text.color)
+        image.set_alpha(alpha)
+        surface.blit(image, image.get_rect(center=(text.x, text.y)))
+
+    # --- Scene ---
+    def draw_background(self, surface):
+        world = self.world
+        star_colors = [(80, 80, 100), (150, 150, 150), (255, 255, 255)]
+        for x, y, size in world.stars:
+            color = star_colors[size - 1]
+            pygame.draw.circle(surface, color, (int(x), int(y)), size -1 if size > 1 else 1)
+
+        for x, y in world.space_dust:
+            pygame.draw.rect(surface, (180, 180, 200), (int(x), int(y), 1, 1))
+
+        # Near-field stars
+        for x, y in world.near_stars:
+            pygame.draw.rect(surface, (200, 200, 255), (int(x), int(y), 1, 1))
+
+    def draw_ui(self, surface):
+        world = self.world
+        player = world.player
+        bar_y_start = 40
+        bar_height = 10
+        bar_width = 100
+
+        score_text = self.render_text(self.font, f"Score: {player.score}", WHITE)
+        surface.blit(score_text, (10, 10))
+        level_text = self.render_text(self.font, f"Level: {world.level}", WHITE)
+        level_rect = level_text.get_rect(center=(SCREEN_WIDTH // 2, 20))
+        surface.blit(level_text, level_rect)
+        high_score_text = self.render_text(self.font, f"High: {world.high_score}", GREY)
+        high_score_rect = high_score_text.get_rect(topright=(SCREEN_WIDTH - 15, 60))
+        surface.blit(high_score_text, high_score_rect)
+
+        credits_text = self.render_text(self.font, f"Credits: {world.player_data['total_credits']}", YELLOW)
+        credits_rect = credits_text.get_rect(topright=(SCREEN_WIDTH - 15, 85))
+        surface.blit(credits_text, credits_rect)
+
+        # --- Flow / Multiplier ---
+        if player.flow_state_timer > 0:
+            pulse = (math.sin(pygame.time.get_ticks() * 0.02) + 1) / 2
+            color = (255, int(100 + 155 * pulse), int(100 + 155 * pulse))
+            with self.lock:
+                flow_text = self.flow_font.render("HYPERFLOW", True, color)
+            flow_pct = player.flow_state_timer / FLOW_STATE_DURATION
+            bar_color = RED
+        else:
+            flow_text = self.render_text(self.flow_font, f"FLOW x{player.flow_level}", YELLOW)
+            flow_pct = player.flow_timer / FLOW_DURATION
+            bar_color = YELLOW
+
+        flow_rect = flow_text.get_rect(topleft=(120, 5))
+        flow_pos = list(flow_rect.topleft)
+        if player.flow_text_shake_timer > 0:
+            flow_pos[0] += self.rng.randint(-2, 2)
+            flow_pos[1] += self.rng.randint(-2, 2)
+        surface.blit(flow_text, flow_pos)
+        pygame.draw.rect(surface, GREY, (120, 40, bar_width, bar_height), 1)
+        pygame.draw.rect(surface, bar_color, (120, 40, bar_width * flow_pct, bar_height))
+
+        # --- Lives ---
+        for i in range(player.lives):
+            x_pos = SCREEN_WIDTH - 30 - (i * (player.size + 10))
+            self.draw_ship_icon(surface, player, x_pos, 20 + (player.size / 2))
+
+        # --- Cooldown Bars ---
+        shoot_pct = 1.0 - (player.shoot_cooldown / player.stats["shoot_cooldown"])
+        pygame.draw.rect(surface, GREY, (10, bar_y_start, bar_width, bar_height), 1)
+        pygame.draw.rect(surface, YELLOW, (10, bar_y_start, bar_width * shoot_pct, bar_height))
+
+        hyper_pct = 1.0 - (player.hyperspace_cooldown / PLAYER_HYPERSPACE_COOLDOWN)
+        pygame.draw.rect(surface, GREY, (10, bar_y_start + 15, bar_width, bar_height), 1)
+        pygame.draw.rect(surface, ORANGE, (10, bar_y_start + 15, bar_width * hyper_pct, bar_height))
+
+        y_pos_powerup = bar_y_start + 30
+
+        # Dash Cooldown Bar
+        dash_pct = 1.0 - (player.dash_cooldown / PLAYER_DASH_COOLDOWN)
+        pygame.draw.rect(surface, GREY, (10, y_pos_powerup, bar_width, bar_height), 1)
+        pygame.draw.rect(surface, CYAN, (10, y_pos_powerup, bar_width * dash_pct, bar_height))
+        y_pos_powerup += 15
+
+        if player.is_shielded:
+            shield_pct = player.invulnerable_timer / POWERUP_SHIELD_TIME
+            pygame.draw.rect(surface, GREY, (10, y_pos_powerup, bar_width, bar_height), 1)
+            pygame.draw.rect(surface, GREEN_SHIELD, (10, y_pos_powerup, bar_width * shield_pct, bar_height))
+            y_pos_powerup += 15
+
+        if player.triple_shot_timer > 0:
+            triple_pct = player.triple_shot_timer / POWERUP_TRIPLE_SHOT_TIME
+            pygame.draw.rect(surface, GREY, (10, y_pos_powerup, bar_width, bar_height), 1)
+            pygame.draw.rect(surface, BLUE_POWERUP, (10, y_pos_powerup, bar_width * triple_pct, bar_height))
+
+    def draw_ship_icon(self, surface, ship, x, y):
+        """ Static nose-up outline of ship's hull at (x, y): lives counter """
+        pygame.draw.polygon(surface, WHITE, ship.get_ship_points(x, y, -90), 2)
+
+    def draw_ship_preview(self, surface, ship_type, x, y):
+        """ Shipyard preview: the cached outline of ship_type centred on (x, y) """
+        image = self.ship_preview(ship_type)
+        surface.blit(image, image.get_rect(center=(x, y)))
+
+    def draw_hyperspace_warp(self, surface):
+        player = self.world.player
+        progress = (PLAYER_HYPERSPACE_WARP_TIME - player.hyperspace_warp_timer) / PLAYER_HYPERSPACE_WARP_TIME
+        center_x, center_y = player.x, player.y
+        for i in range(40):
+            angle = self.rng.uniform(0, 360)
+            rad = deg_to_rad(angle)
+            start_dist = progress * 200
+            end_dist = progress * 400 + 50
+            start_x = center_x + math.cos(rad) * start_dist
+            start_y = center_y + math.sin(rad) * start_dist
+            end_x = center_x + math.cos(rad) * end_dist
+            end_y = center_y + math.sin(rad) * end_dist
+            width = int(progress * 3) + 1
+            alpha = (1.0 - progress) * 255
+            line_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            pygame.draw.line(line_surf, (255, 255, 255, int(alpha)), (start_x, start_y), (end_x, end_y), width)
+            surface.blit(line_surf, (0, 0))
+
+    # --- Post-Processing ---
+    def apply_flow_effects(self, surface):
+        self.chroma_surf_r.fill((0, 0, 0, 0))
+        self.chroma_surf_b.fill((0, 0, 0, 0))
+        self.chroma_surf_r.blit(surface, (0, 0))
+        self.chroma_surf_b.blit(surface, (0, 0))
+        self.chroma_surf_r.fill((255, 0, 0, 120), special_flags=pygame.BLEND_RGBA_MULT)
+        self.chroma_surf_b.fill((0, 0, 255, 120), special_flags=pygame.BLEND_RGBA_MULT)
+        surface.blit(self.chroma_surf_r, (-4, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        surface.blit(self.chroma_surf_b, (4, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        surface.blit(self.vignette_surf, (0, 0))
+
+    def apply_glitch_effect(self, surface):
+        self.chroma_surf_r.fill((0, 0, 0, 0))
+        self.chroma_surf_b.fill((0, 0, 0, 0))
+        self.chroma_surf_r.blit(surface, (0, 0))
+        self.chroma_surf_b.blit(surface, (0, 0))
+        self.chroma_surf_r.fill((255, 0, 0, 150), special_flags=pygame.BLEND_RGBA_MULT)
+        self.chroma_surf_b.fill((0, 0, 255, 150), special_flags=pygame.BLEND_RGBA_MULT)
+        offset = self.rng.randint(8, 15)
+        surface.blit(self.chroma_surf_r, (-offset, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        surface.blit(self.chroma_surf_b, (offset, 0), special_flags=pygame.BLEND_RGBA_ADD)
+
+    def apply_camera_zoom(self, screen, final_offset):
+        """ Returns the surface and rect to blit to the screen for the current camera zoom """
+        final_surf = self.game_surface
+        final_rect = self.game_surface.get_rect(topleft=final_offset)
+
+        if abs(self.world.camera_zoom - 1.0) > 0.01:
+            zoom_width = int(SCREEN_WIDTH * self.world.camera_zoom)
+            zoom_height = int(SCREEN_HEIGHT * self.world.camera_zoom)
+            # Use smoothscale for better quality
+            final_surf = pygame.transform.smoothscale(self.game_surface, (zoom_width, zoom_height))
+            final_rect = final_surf.get_rect(center=(SCREEN_WIDTH // 2 + final_offset[0], SCREEN_HEIGHT // 2 + final_offset[1]))
+            screen.fill(BACKGROUND_COLOR) # Fill black bars
+        return final_surf, final_rect
+
+    def render_playfield(self, interp=1.0):
+        """ Draws the PLAYING scene, UI and post-processing into game_surface (no screen output) """
+        world = self.world
+        surface = self.game_surface
+        surface.fill(BACKGROUND_COLOR)
+        self.draw_background(surface)
+
+        # Draw all sprites
+        for sprite in world.all_sprites:
+            self.draw_entity(surface, sprite, interp)
+
+        for shockwave in world.shockwaves:
+            self.draw_shockwave(surface, shockwave)
+
+        # Only draw player if alive
+        if world.player.lives > 0:
+            self.draw_player(surface, world.player, interp)
+
+        for p in world.particles:
+            self.draw_particle(surface, p, interp)
+
+        for debris in world.debris:
+            self.draw_entity(surface, debris, interp)
+
+        for text in world.floating_texts:
+            self.draw_floating_text(surface, text)
+
+        if world.player.hyperspace_warp_timer > 0:
+            self.draw_hyperspace_warp(surface)
+
+        self.draw_ui(surface)
+
+        # --- Draw "WARNING" ---
+        if world.warning_timer > 0:
+            if (world.warning_timer // 15) % 2 == 0: # Flash
+                warn_text = self.render_text(self.large_font, "! WARNING !", RED)
+                warn_rect = warn_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 40))
+                surface.blit(warn_text, warn_rect)
+
+                boss_text_str = "BOSS INCOMING"
+                boss_text = self.render_text(self.medium_font, boss_text_str, RED)
+                boss_rect = boss_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 20))
+                surface.blit(boss_text, boss_rect)
+
+        # Draw "Get Ready"
+        if world.game_start_timer > 0:
+            sec = (world.game_start_timer // 60) + 1
+            text_str = f"{sec}"
+            if world.game_start_timer < 40: text_str = "GO!"
+            pulse = (world.game_start_timer % 60) / 60.0
+            font_size = int(50 + (pulse * 30))
+            text = self.render_text(self.countdown_font(font_size), text_str, WHITE)
+            rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
+            surface.blit(text, rect)
+
+        # Draw "Level Clear"
+        if world.level_clear_timer > 0 and world.game_start_timer == 0:
+            level_text = self.render_text(self.large_font, f"LEVEL {world.level} CLEAR", WHITE)
+            level_rect = level_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
+            surface.blit(level_text, level_rect)
+
+        # --- Post-Processing Effects ---
+        if world.player.flow_state_timer > 0:
+            self.apply_flow_effects(surface)
+        elif world.chroma_glitch_timer > 0:
+            self.apply_glitch_effect(surface)
@@ -0,0 +1,254 @@
+"""
+Input-log replays: a run is its RNG seed plus one byte of input per simulation
+step, so playing it back through a fresh World reproduces it exactly.
+Standard library only; playback never needs pygame.
+
+File layout (little-endian):
+    MAGIC, u16 format version, u32 header length, header (UTF-8 JSON),
+    zlib(inputs: one byte per step, then state hashes: u32 per REPLAY_HASH_INTERVAL steps)
+
+The header holds the seed, ship, the start-of-run state that carries over from
+earlier runs, and the result the recording ended with (frames, score, level,
+final state hash). A minute of play is about 3.6 KB of input before compression.
+"""
+import json
+import random
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from .config import *
+
+MAGIC = b"ASTRORPL"
+FORMAT_VERSION = 1
+REPLAY_EXTENSION = ".astroreplay"
+HEADER_FIELDS = {"seed", "ship", "fps", "frames", "hash_interval", "start", "result", "recorded_at"}
+
+# Input byte of one step. Held steering, then the actions taken since the previous step.
+# Actions replay in the order shoot, dash, hyperspace; a shoot or dash that came after a
+# hyperspace in the same step sets its *_AFTER_HYPERSPACE bit instead, since it then
+# fires from the new position (or dashes from a standstill)
+LEFT = 1
+RIGHT = 2
+THRUST = 4
+SHOOT = 8
+DASH = 16
+HYPERSPACE = 32
+SHOOT_AFTER_HYPERSPACE = 64
+DASH_AFTER_HYPERSPACE = 128
+
+# World fields start_new_game leaves as the previous run left them
+CARRIED_OVER = ("screen_shake_timer", "chroma_glitch_timer", "camera_zoom", "game_start_timer",
+                "level_clear_timer", "warning_timer")
+# Groups whose sprites' positions go into the state hash (the rest are visual effects)
+HASHED_GROUPS = ("asteroids", "bullets", "ufos", "enemy_bullets", "powerups", "hunter_mines")
+
+
+def state_hash(world):
+    """ CRC32 of the gameplay state: player, level, timers and every gameplay sprite's
+    position. Exact float bits, so any divergence shows up within a step """
+    p = world.player
+    values = [world.level, p.score, p.lives, p.x, p.y, p.angle, p.vel_x, p.vel_y,
+              p.invulnerable_timer, p.flow_level, p.flow_state_timer, world.level_clear_timer,
+              world.warning_timer, world.game_start_timer, world.ufo_spawn_timer]
+    for name in HASHED_GROUPS:
+        group = getattr(world, name)
+        values.append(len(group))
+        for sprite in group:
+            values.append(sprite.x)
+            values.append(sprite.y)
+    return zlib.crc32(array("d", values))
+
+
+def is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def little_endian(values):
+    """ array in file byte order """
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+# --- Replay Class ---
+class Replay:
+    def __init__(self, seed, ship, start=None, hash_interval=REPLAY_HASH_INTERVAL):
+        self.seed = seed
+        self.ship = ship
+        self.start = start or {} # CARRIED_OVER values right after start_new_game
+        self.hash_interval = hash_interval
+        self.inputs = bytearray()
+        self.hashes = array("I") # state_hash going into every hash_interval-th step
+        self.result = None # {"frames", "score", "level", "hash", "cause"} when recording ended
+        self.recorded_at = time.time()
+
+    @property
+    def duration_s(self):
+        return len(self.inputs) / FPS
+
+    def to_bytes(self):
+        header = json.dumps({
+            "seed": self.seed, "ship": self.ship, "fps": FPS, "frames": len(self.inputs), "hash_interval": self.hash_interval,
+            "start": self.start, "result": self.result, "recorded_at": self.recorded_at,
+        }).encode()
+        body = zlib.compress(bytes(self.inputs) + little_endian(self.hashes).tobytes(), 9)
+        return MAGIC + struct.pack("<HI", FORMAT_VERSION, len(header)) + header + body
+
+    @classmethod
+    def from_bytes(cls, data):
+        """ Raises ValueError for anything that isn't a replay this version can play """
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a replay file")
+        offset = len(MAGIC)
+        try:
+            version, header_size = struct.unpack_from("<HI", data, offset)
+        except struct.error:
+            raise ValueError("truncated replay header")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"replay format {version}, expected {FORMAT_VERSION}")
+        offset += struct.calcsize("<HI")
+        try:
+            header = json.loads(data[offset:offset + header_size])
+        except ValueError:
+            raise ValueError("damaged replay header")
+        if not isinstance(header, dict) or not HEADER_FIELDS <= set(header):
+            raise ValueError("invalid replay header")
+        for name in ("seed", "fps", "frames", "hash_interval"):
+            if not is_int(header[name]):
+                raise ValueError(f"invalid replay header ({name} is not an integer)")
+        if header["fps"] != FPS:
+            raise ValueError(f"recorded at {header['fps']} steps/s, the simulation runs at {FPS}")
+        if not isinstance(header["ship"], str) or header["ship"] not in SHIP_STATS:
+            raise ValueError(f"unknown ship {header['ship']!r}")
+        start = header["start"]
+        if (not isinstance(start, dict) or not set(start) <= set(CARRIED_OVER) or
+                not all(is_number(value) for value in start.values())):
+            raise ValueError("invalid replay header (start)")
+        if header["frames"] < 0 or header["hash_interval"] < 1:
+            raise ValueError("invalid replay header")
+        if header["result"] is not None and not isinstance(header["result"], dict):
+            raise ValueError("invalid replay header (result)")
+        try:
+            body = zlib.decompress(data[offset + header_size:])
+        except zlib.error as error:
+            raise ValueError(f"damaged replay body ({error})")
+
+        replay = cls(header["seed"], header["ship"], header["start"], header["hash_interval"])
+        replay.result = header["result"]
+        replay.recorded_at = header["recorded_at"]
+        frames = header["frames"]
+        checkpoints = max(0, frames - 1) // replay.hash_interval # Taken before steps interval, 2*interval, ...
+        if len(body) != frames + 4 * checkpoints:
+            raise ValueError("replay body does not match its header")
+        replay.inputs = bytearray(body[:frames])
+        replay.hashes = little_endian(array("I", body[frames:]))
+        return replay
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+# --- Input Recorder Class ---
+class InputRecorder:
+    """ Records a run as it is played. The World calls action() from its player_* methods
+    and step() at the top of every update, so steps are counted exactly as they are simulated """
+    def __init__(self, seed, world):
+        self.replay = Replay(seed, world.player.ship_type,
+                             {name: getattr(world, name) for name in CARRIED_OVER})
+        self.pending = 0
+
+    def action(self, bit):
+        if self.pending & HYPERSPACE and bit != HYPERSPACE:
+            bit <<= 3 # SHOOT/DASH -> *_AFTER_HYPERSPACE
+        self.pending |= bit
+
+    def step(self, world):
+        replay = self.replay
+        if replay.inputs and len(replay.inputs) % replay.hash_interval == 0:
+            # State after the steps recorded so far and this step's actions (they ran before update)
+            replay.hashes.append(state_hash(world))
+        controls = world.controls
+        replay.inputs.append(self.pending | (LEFT if controls.left else 0) |
+                             (RIGHT if controls.right else 0) | (THRUST if controls.thrust else 0))
+        self.pending = 0
+
+    def finish(self, world):
+        """ The finished replay, with the state the run ended in as its result """
+        replay = self.replay
+        replay.result = {"frames": len(replay.inputs), "score": world.player.score, "level": world.level,
+                         "hash": state_hash(world), "cause": world.death_cause}
+        return replay
+
+
+def new_seed():
+    """ Seed for a recorded run. To record: random.seed(seed), world.start_new_game(ship),
+    then world.input_log = InputRecorder(seed, world) """
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+# --- Playback ---
+class PlaybackResult:
+    def __init__(self, frames, score, level, final_hash, desync_frame, hashes=None):
+        self.frames = frames
+        self.score = score
+        self.level = level
+        self.hash = final_hash
+        self.desync_frame = desync_frame # Step of the first checkpoint that didn't match, or None
+        self.hashes = hashes # Per-step state hashes when asked for
+
+    def matches(self, result):
+        """ True if this playback ended exactly where the recording says it did """
+        return (self.desync_frame is None and result is not None and self.frames == result["frames"] and
+                self.score == result["score"] and self.level == result["level"] and self.hash == result["hash"])
+
+
+def play(replay, world=None, stop_on_desync=True, frame_hashes=False):
+    """ Re-simulates replay on world (a fresh astro.world.World if None) as fast as it runs.
+    Checks the recorded state hashes along the way; frame_hashes=True also returns the
+    state hash after every step """
+    if world is None:
+        from .world import World
+        world = World()
+    random.seed(replay.seed)
+    world.start_new_game(replay.ship)
+    for name in CARRIED_OVER:
+        if name in replay.start:
+            setattr(world, name, replay.start[name])
+
+    interval = replay.hash_interval
+    hashes = array("I") if frame_hashes else None
+    desync_frame = None
+    controls = world.controls
+    frame = 0
+    for frame, bits in enumerate(replay.inputs):
+        if bits & (SHOOT | DASH | HYPERSPACE | SHOOT_AFTER_HYPERSPACE | DASH_AFTER_HYPERSPACE):
+            if bits & SHOOT: world.player_shoot()
+            if bits & DASH: world.player_dash()
+            if bits & HYPERSPACE: world.player_hyperspace()
+            if bits & SHOOT_AFTER_HYPERSPACE: world.player_shoot()
+            if bits & DASH_AFTER_HYPERSPACE: world.player_dash()
+        if frame and frame % interval == 0:
+            checkpoint = frame // interval - 1
+            if checkpoint < len(replay.hashes) and state_hash(world) != replay.hashes[checkpoint] and desync_frame is None:
+                desync_frame = frame
+                if stop_on_desync:
+                    break
+        controls.left = bits & LEFT != 0
+        controls.right = bits & RIGHT != 0
+        controls.thrust = bits & THRUST != 0
+        world.update()
+        if hashes is not None:
+            hashes.append(state_hash(world))
+    else:
+        frame = len(replay.inputs)
+    return PlaybackResult(frame, world.player.score, world.level, state_hash(world), desync_frame, hashes)
@@ -0,0 +1,424 @@
+"""
+World snapshots: the whole simulation state (player, every sprite group,
+particles, background, timers and the RNG) flattened into a compact binary
+blob, kept for the last few seconds in a fixed-size ring. Restoring a snapshot
+puts a World back exactly where it was, so play continues identically from
+there. Used for training-mode rewind and the kill-cam. Standard library only.
+
+Blob layout (native byte order, never written to disk):
+    u32 value count, u32 RNG word count, the Mersenne Twister state as u32 words,
+    the values as doubles, then the run's strings joined by NUL
+
+In the ring every SNAPSHOT_KEYFRAME_INTERVAL-th blob is stored whole; the ones
+between are XORed with the previous blob first. Unchanged fields (timers,
+sizes, colours, most of the RNG state) XOR to zero bytes, so a step's delta
+compresses to a fraction of a keyframe.
+"""
+import random
+import struct
+import zlib
+from array import array
+from itertools import chain
+from operator import attrgetter
+
+from .config import *
+from .geometry import Rect
+from .sprite import Sprite
+from .entities import (Player, Bullet, EnemyBullet, Asteroid, UFO, UFOElite, HunterMine, PowerUp,
+                       Particle, Debris, PlayerDebris, Shockwave, FloatingText)
+from .world import GROUP_NAMES
+
+HEADER = struct.Struct("=II")
+
+# World fields in a snapshot. game_state is left to the caller (rewind and kill-cam set their own)
+WORLD_INTS = ("level", "run_frames", "screen_shake_timer", "level_clear_timer", "ufo_spawn_timer",
+              "chroma_glitch_timer", "game_start_timer", "warning_timer")
+WORLD_FLOATS = ("camera_zoom",)
+
+
+# --- Layout Class ---
+class Layout:
+    """ How the objects of one entity class are flattened into doubles, column block by
+    column block so each block is a single map/chain over all of them: ints, floats and
+    bools (one attrgetter call per object), then colours (int triples), points (float
+    pairs), rects and a variable-length float list whose length is one of the ints.
+    Strings go to the string section. Ints and bools come back as int and bool; floats
+    that held an int come back as the equal float, which the simulation can't tell apart """
+    def __init__(self, cls, ints=(), floats=(), bools=(), colors=(), points=(), strings=(),
+                 rect=False, vector=None, has_game=False):
+        self.cls = cls
+        self.ints = ints
+        self.floats = floats
+        self.bools = bools
+        self.numbers = ints + floats + bools
+        self.get = attrgetter(*self.numbers)
+        self.colors = colors
+        self.points = points
+        self.tuples = [attrgetter(name) for name in colors + points]
+        self.strings = strings
+        self.rect = rect
+        self.vector = vector # (list attribute, int attribute holding its length)
+        self.has_game = has_game # UFOs and mines keep a reference to the world
+        self.is_sprite = issubclass(cls, Sprite)
+
+    def encode(self, objs, values, strings):
+        """ Appends objs, all of this class """
+        values.extend(chain.from_iterable(map(self.get, objs)))
+        for get in self.tuples:
+            values.extend(chain.from_iterable(map(get, objs)))
+        if self.rect:
+            values.extend(chain.from_iterable(map(RECT_FIELDS, map(GET_RECT, objs))))
+        if self.vector:
+            values.extend(chain.from_iterable(map(attrgetter(self.vector[0]), objs)))
+        for name in self.strings:
+            strings.extend(map(attrgetter(name), objs))
+
+    def decode(self, count, values, pos, strings, world):
+        """ count new objects from values[pos:]; returns them and the position after them """
+        objs = [self.cls.__new__(self.cls) for _ in range(count)]
+        states = [obj.__dict__ for obj in objs]
+        width = len(self.numbers)
+        ints_end = len(self.ints)
+        floats_end = ints_end + len(self.floats)
+        block = values[pos:pos + width * count]
+        pos += width * count
+        for i, state in enumerate(states):
+            row = block[i * width:(i + 1) * width]
+            state.update(zip(self.ints, map(int, row[:ints_end])))
+            state.update(zip(self.floats, row[ints_end:floats_end]))
+            for name, value in zip(self.bools, row[floats_end:]):
+                state[name] = value != 0
+        for name in self.colors:
+            block = values[pos:pos + 3 * count]
+            pos += 3 * count
+            for i, state in enumerate(states):
+                state[name] = (int(block[3 * i]), int(block[3 * i + 1]), int(block[3 * i + 2]))
+        for name in self.points:
+            block = values[pos:pos + 2 * count]
+            pos += 2 * count
+            for i, state in enumerate(states):
+                state[name] = (block[2 * i], block[2 * i + 1])
+        if self.rect:
+            block = values[pos:pos + 4 * count]
+            pos += 4 * count
+            for i, state in enumerate(states):
+                state["rect"] = Rect(*block[4 * i:4 * i + 4])
+        if self.vector:
+            name, length = self.vector
+            for state in states:
+                state[name] = values[pos:pos + state[length]].tolist()
+                pos += state[length]
+        for name in self.strings:
+            for state in states:
+                state[name] = next(strings)
+        for state in states:
+            if self.is_sprite:
+                state["_groups"] = {}
+            if self.has_game:
+                state["game"] = world
+        return objs, pos
+
+
+GET_RECT = attrgetter("rect")
+RECT_FIELDS = attrgetter("x", "y", "w", "h")
+MOVER = ("x", "y", "prev_x", "prev_y", "vel_x", "vel_y")
+
+PLAYER_LAYOUT = Layout(
+    Player,
+    ints=("lives", "score", "hits_taken", "flow_states", "score_threshold_for_life", "size", "invulnerable_timer",
+          "shoot_cooldown", "hyperspace_cooldown", "hyperspace_warp_timer", "dash_cooldown", "dash_timer",
+          "near_miss_cooldown", "flow_level", "flow_timer", "triple_shot_timer", "flow_state_timer",
+          "ghost_trail_timer", "flow_text_shake_timer"),
+    floats=MOVER + ("angle", "prev_angle"), bools=("thrusting", "is_shielded"),
+    strings=("ship_type",), rect=True)
+PARTICLE_LAYOUT = Layout(Particle, ints=("lifespan", "size"), floats=MOVER, colors=("color",))
+
+# Every sprite class; a snapshot stores the sprites class by class in this order
+LAYOUTS = (
+    Layout(Bullet, ints=("lifespan",), floats=MOVER + ("angle",), bools=("is_laser",), rect=True),
+    Layout(EnemyBullet, ints=("lifespan",), floats=MOVER + ("angle",), rect=True),
+    Layout(Asteroid, ints=("size", "radius", "game_level", "angle", "num_points", "hit_flash_timer", "spawn_timer", "health"),
+           floats=MOVER + ("rot_angle", "prev_rot_angle", "rot_speed"), rect=True, vector=("shape_offsets", "num_points")),
+    Layout(UFO, ints=("size", "shoot_cooldown", "hit_flash_timer", "health"), floats=MOVER, rect=True, has_game=True),
+    Layout(UFOElite, ints=("size", "shoot_cooldown", "hit_flash_timer", "health"), floats=MOVER, rect=True, has_game=True),
+    Layout(HunterMine, ints=("size", "charge_timer", "pulse_timer"), floats=("x", "y"), rect=True, has_game=True),
+    Layout(PowerUp, ints=("size", "lifespan"), floats=("x", "y"), colors=("color",), strings=("type", "letter"), rect=True),
+    Layout(Debris, ints=("lifespan", "size"), floats=MOVER, colors=("color",)),
+    Layout(PlayerDebris, ints=("lifespan",), floats=MOVER + ("rot_angle", "rot_speed"), points=("p1", "p2")),
+    Layout(Shockwave, ints=("lifespan", "max_lifespan", "max_radius", "width"), floats=("x", "y"), rect=True),
+    Layout(FloatingText, ints=("lifespan",), floats=("x", "y", "y_vel"), colors=("color",), strings=("text_str",)),
+)
+BLOCK_OF = {layout.cls: i for i, layout in enumerate(LAYOUTS)}
+
+
+# --- Capture and Restore ---
+def capture(world):
+    """ The world between two steps as one blob (bytes) """
+    # Collected in a list and packed once at the end: far cheaper than growing an array("d")
+    values = [getattr(world, name) for name in WORLD_INTS + WORLD_FLOATS]
+    strings = [world.death_cause or ""]
+
+    version, internal, gauss = random.getstate()
+    values.extend((version, gauss is not None, gauss or 0.0))
+
+    player = world.player
+    PLAYER_LAYOUT.encode((player,), values, strings)
+    values.append(len(player.ghost_trail))
+    for points, lifespan in player.ghost_trail:
+        values.extend(chain.from_iterable(points))
+        values.append(lifespan)
+
+    for stars in (world.stars, world.space_dust, world.near_stars):
+        values.append(len(stars))
+        values.extend(chain.from_iterable(stars))
+
+    values.append(len(world.particles))
+    PARTICLE_LAYOUT.encode(world.particles, values, strings)
+
+    # Every sprite once, class by class, then each group as indices into that table
+    # (a sprite is in several groups, and each group keeps its own order)
+    groups = [getattr(world, name) for name in GROUP_NAMES]
+    blocks = [[] for _ in LAYOUTS]
+    seen = set()
+    for group in groups:
+        for sprite in group:
+            if sprite not in seen:
+                seen.add(sprite)
+                blocks[BLOCK_OF[type(sprite)]].append(sprite)
+    for layout, block in zip(LAYOUTS, blocks):
+        values.append(len(block))
+        layout.encode(block, values, strings)
+    index = {sprite: i for i, sprite in enumerate(chain.from_iterable(blocks))}
+    for group in groups:
+        values.append(len(group))
+        values.extend(map(index.__getitem__, group))
+
+    return (HEADER.pack(len(values), len(internal)) + array("I", internal).tobytes() +
+            struct.pack(f"={len(values)}d", *values) + "\0".join(strings).encode())
+
+
+def restore(world, blob):
+    """ Puts world back into the state blob was captured in, including the global RNG.
+    Leaves game_state alone. The sprite groups must exist (a run has been started) """
+    count, words = HEADER.unpack_from(blob)
+    start = HEADER.size + words * 4
+    internal = array("I")
+    internal.frombytes(blob[HEADER.size:start])
+    values = array("d")
+    values.frombytes(blob[start:start + count * 8])
+    strings = iter(blob[start + count * 8:].decode().split("\0"))
+
+    pos = len(WORLD_INTS)
+    for name, value in zip(WORLD_INTS, values[:pos]):
+        setattr(world, name, int(value))
+    for name, value in zip(WORLD_FLOATS, values[pos:pos + len(WORLD_FLOATS)]):
+        setattr(world, name, value)
+    pos += len(WORLD_FLOATS)
+    world.death_cause = next(strings) or None
+
+    random.setstate((int(values[pos]), tuple(internal), values[pos + 2] if values[pos + 1] else None))
+    pos += 3
+
+    (player,), pos = PLAYER_LAYOUT.decode(1, values, pos, strings, world)
+    player.stats = SHIP_STATS[player.ship_type]
+    player.telemetry = world.telemetry
+    trail = []
+    count = int(values[pos])
+    pos += 1
+    for _ in range(count):
+        v = values[pos:pos + 7]
+        trail.append([[(v[0], v[1]), (v[2], v[3]), (v[4], v[5])], int(v[6])])
+        pos += 7
+    player.ghost_trail = trail
+    world.player = player
+
+    count = int(values[pos])
+    v = values[pos + 1:pos + 1 + 3 * count]
+    world.stars = [(v[i], v[i + 1], int(v[i + 2])) for i in range(0, 3 * count, 3)]
+    pos += 1 + 3 * count
+    for name in ("space_dust", "near_stars"):
+        count = int(values[pos])
+        v = values[pos + 1:pos + 1 + 2 * count]
+        setattr(world, name, [(v[i], v[i + 1]) for i in range(0, 2 * count, 2)])
+        pos += 1 + 2 * count
+
+    world.particles, pos = PARTICLE_LAYOUT.decode(int(values[pos]), values, pos + 1, strings, world)
+
+    table = []
+    for layout in LAYOUTS:
+        sprites, pos = layout.decode(int(values[pos]), values, pos + 1, strings, world)
+        table.extend(sprites)
+    world.commands.clear()
+    for name in GROUP_NAMES:
+        group = getattr(world, name)
+        group.empty()
+        count = int(values[pos])
+        group.add([table[int(i)] for i in values[pos + 1:pos + 1 + count]])
+        pos += 1 + count
+
+
+def xor_delta(blob, base):
+    """ blob XOR base, with base cut or zero-padded to blob's length. Applying it
+    to the delta and the same base gives blob back """
+    return (int.from_bytes(blob, "little") ^ int.from_bytes(base[:len(blob)], "little")).to_bytes(len(blob), "little")
+
+
+# --- Snapshot Ring Class ---
+class SnapshotRing:
+    """ The last few seconds of snapshots in one preallocated buffer. record() runs every
+    step: capture, XOR against the previous snapshot, zlib, copy into the buffer. The
+    oldest snapshots are overwritten as it fills, so memory never grows. Snapshots are
+    numbered from 0 for the run; `oldest` and `count` give the range still held """
+    def __init__(self, capacity=SNAPSHOT_RING_BYTES, slots=SNAPSHOT_RING_SLOTS,
+                 interval=SNAPSHOT_INTERVAL, keyframe_interval=SNAPSHOT_KEYFRAME_INTERVAL):
+        self.buffer = bytearray(capacity)
+        self.offsets = array("q", bytes(8 * slots))
+        self.lengths = array("q", bytes(8 * slots))
+        self.frames = array("q", bytes(8 * slots)) # run_frames of each snapshot
+        self.keyframes = bytearray(slots)
+        self.interval = interval
+        self.keyframe_interval = keyframe_interval
+        self.clear()
+
+    def clear(self):
+        """ Forgets everything, e.g. at the start of a run. The buffer is kept """
+        self.oldest = 0
+        self.count = 0
+        self.cursor = 0 # Where the next blob goes
+        self.since_keyframe = 0
+        self.last = None # The newest snapshot, uncompressed, to delta against
+        self.stored_bytes = 0
+        self.skipped = 0 # Too big for the buffer
+
+    @property
+    def newest(self):
+        return self.oldest + self.count - 1
+
+    @property
+    def seconds(self):
+        """ Game time between the oldest and newest snapshot """
+        if not self.count:
+            return 0.0
+        slots = len(self.frames)
+        return (self.frames[self.newest % slots] - self.frames[self.oldest % slots]) / FPS
+
+    def record(self, world):
+        """ Takes a snapshot if this step is on the interval. Call between steps """
+        if world.run_frames % self.interval:
+            return
+        blob = capture(world)
+        keyframe = self.last is None or self.since_keyframe >= self.keyframe_interval
+        data = zlib.compress(blob if keyframe else xor_delta(blob, self.last), SNAPSHOT_COMPRESS_LEVEL)
+        if len(data) > len(self.buffer):
+            self.skipped += 1
+            self.last = None # The next one has to be a keyframe
+            return
+        if not self.store(data, world.run_frames, keyframe):
+            # Making room evicted the snapshot this delta builds on: store it whole
+            keyframe = True
+            self.store(zlib.compress(blob, SNAPSHOT_COMPRESS_LEVEL), world.run_frames, keyframe)
+        self.since_keyframe = 1 if keyframe else self.since_keyframe + 1
+        self.last = blob
+
+    def store(self, data, frame, keyframe):
+        """ Copies data in after evicting what it overwrites. False for a delta that
+        has nothing left to build on """
+        slots = len(self.frames)
+        size = len(data)
+        if self.cursor + size > len(self.buffer):
+            # Wrap: everything left between the cursor and the end is from the previous lap
+            while self.count and self.offsets[self.oldest % slots] >= self.cursor:
+                self.evict()
+            self.cursor = 0
+        # The oldest snapshots are the ones just ahead of the cursor
+        while self.count and (self.count == slots or (self.cursor <= self.offsets[self.oldest % slots] < self.cursor + size)):
+            self.evict()
+        # A delta is useless without the keyframe it builds on
+        while self.count and not self.keyframes[self.oldest % slots]:
+            self.evict()
+        if not self.count and not keyframe:
+            return False
+        slot = (self.oldest + self.count) % slots
+        self.buffer[self.cursor:self.cursor + size] = data
+        self.offsets[slot] = self.cursor
+        self.lengths[slot] = size
+        self.frames[slot] = frame
+        self.keyframes[slot] = keyframe
+        self.cursor += size
+        self.count += 1
+        self.stored_bytes += size
+        return True
+
+    def evict(self):
+        self.stored_bytes -= self.lengths[self.oldest % len(self.frames)]
+        self.oldest += 1
+        self.count -= 1
+
+    def data(self, index):
+        slot = index % len(self.frames)
+        offset = self.offsets[slot]
+        return zlib.decompress(self.buffer[offset:offset + self.lengths[slot]])
+
+    def blobs(self, start, stop=None):
+        """ Yields (frame, blob) for snapshots start..stop (default: the newest), decoding
+        from the keyframe at or before start """
+        stop = self.newest if stop is None else stop
+        if self.count == 0 or not self.oldest <= start <= stop <= self.newest:
+            return
+        slots = len(self.frames)
+        index = start
+        while not self.keyframes[index % slots]:
+            index -= 1
+        blob = self.data(index)
+        while index < start:
+            index += 1
+            blob = self.next_blob(index, blob)
+        yield self.frames[index % slots], blob
+        while index < stop:
+            index += 1
+            blob = self.next_blob(index, blob)
+            yield self.frames[index % slots], blob
+
+    def next_blob(self, index, previous):
+        """ Snapshot index, given the one before it """
+        if self.keyframes[index % len(self.frames)]:
+            return self.data(index)
+        return xor_delta(self.data(index), previous)
+
+    def get(self, index):
+        for frame, blob in self.blobs(index, index):
+            return blob
+        return None
+
+    def index_before(self, seconds):
+        """ The snapshot about `seconds` of game time before the newest (the oldest if the
+        ring doesn't reach that far), or None when empty """
+        if not self.count:
+            return None
+        return max(self.oldest, self.newest - int(seconds * FPS) // self.interval)
+
+    def rewind(self, world, seconds=SNAPSHOT_REWIND_SECONDS):
+        """ Restores world to `seconds` ago and drops the snapshots after that point, which
+        the run no longer leads to. Returns the frames rewound, 0 if there was nothing to go back to """
+        index = self.index_before(seconds)
+        if index is None:
+            return 0
+        slots = len(self.frames)
+        blob = self.get(index)
+        frames_back = self.frames[self.newest % slots] - self.frames[index % slots]
+        while self.newest > index:
+            slot = self.newest % slots
+            self.stored_bytes -= self.lengths[slot]
+            self.count -= 1
+        slot = index % slots
+        self.cursor = self.offsets[slot] + self.lengths[slot]
+        self.since_keyframe = 1
+        while not self.keyframes[(index - self.since_keyframe + 1) % slots]:
+            self.since_keyframe += 1
+        self.last = blob
+        restore(world, blob)
+        return frames_back
+
+    def get_stats(self):
+        return {"snapshots": self.count, "seconds": self.seconds, "bytes": self.stored_bytes,
+                "capacity": len(self.buffer), "skipped": self.skipped}
@@ -0,0 +1,822 @@
+"""
+Spectator stream: the running game publishes its world state every simulation
+step over a local socket, and spectator windows (a second screen, a
+commentator view) render it with their own Renderer. No screen capture: a
+frame is the entities themselves, quantized and delta-coded.
+
+    python -m astro --spectate                 (publishes on SPECTATE_ADDRESS)
+    python -m astro.spectate [ADDRESS]         (opens a spectator window)
+
+ADDRESS is host:port or a Unix socket path. The protocol is standard library
+only; only the spectator window needs pygame.
+
+Stream layout (little-endian): MAGIC, u16 format version, then messages of
+u32 length + zlib(u8 keyframe flag, u32 frame number, u32 int count, that many
+i32, the frame's new strings joined by NUL). The ints are:
+    the header (WORLD_FIELDS, PLAYER_FIELDS and a few more), then the ghost trail
+    (count, 7 ints each), then per KINDS entry: removed count, removed row
+    indices, new count, every dynamic column, every static column (new rows only)
+
+Positions are fixed point (POSITION_STEPS per pixel), angles are ANGLE_STEPS
+per turn, the rest are ints already. An entity's rows stay in the order the
+game's groups keep them, with new ones at the end, so a delta frame only lists
+the rows removed since the previous frame and sends the new rows whole. For a
+kept row it sends the change since the previous frame minus the change the
+frame before: zero for anything moving, turning or counting down steadily,
+which is nearly everything, so zlib squeezes a row to a byte or two. A keyframe
+sends every row whole, with its last change. The header is a plain difference.
+Colours, shapes, sizes and text only go out once, with the entity's first frame.
+"""
+import atexit
+import errno
+import os
+import random
+import select
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from collections import deque
+from itertools import chain
+from operator import add, attrgetter, sub
+
+from .config import *
+from .geometry import Rect
+from .entities import (Player, Bullet, EnemyBullet, Asteroid, UFO, UFOElite, HunterMine, PowerUp,
+                       Particle, Debris, PlayerDebris, Shockwave, FloatingText)
+from .replay import little_endian
+
+MAGIC = b"ASTROSPC"
+FORMAT_VERSION = 1
+MESSAGE_HEADER = struct.Struct("<BII") # keyframe flag, frame number, int count
+POSITION_STEPS = 8 # Fixed-point steps per pixel
+ANGLE_STEPS = 4096 # Steps per full turn
+ZOOM_STEPS = 4096
+VELOCITY_STEPS = 256
+SHAPE_STEPS = 1000 # Asteroid shape offsets (0.7 - 1.3)
+
+STATES = ("START_MENU", "SHIP_SELECT", "PLAYING", "KILL_CAM", "GAME_OVER")
+SHIPS = tuple(SHIP_STATS)
+# States the entities are published in; the others only send the world and player fields
+PLAYFIELD_STATES = ("PLAYING", "KILL_CAM", "GAME_OVER")
+
+# Header fields: (attribute, steps per unit), 1 for ints
+WORLD_FIELDS = (("run_frames", 1), ("level", 1), ("high_score", 1), ("warning_timer", 1), ("game_start_timer", 1),
+                ("level_clear_timer", 1), ("screen_shake_timer", 1), ("chroma_glitch_timer", 1),
+                ("camera_zoom", ZOOM_STEPS))
+PLAYER_FIELDS = (("x", POSITION_STEPS), ("y", POSITION_STEPS), ("vel_x", VELOCITY_STEPS), ("vel_y", VELOCITY_STEPS),
+                 ("lives", 1), ("score", 1), ("thrusting", 1), ("is_shielded", 1), ("dash_timer", 1),
+                 ("invulnerable_timer", 1), ("hyperspace_warp_timer", 1), ("shoot_cooldown", 1),
+                 ("hyperspace_cooldown", 1), ("dash_cooldown", 1), ("triple_shot_timer", 1), ("flow_level", 1),
+                 ("flow_timer", 1), ("flow_state_timer", 1), ("flow_text_shake_timer", 1))
+# The header is the game state, credits and ship, these, then the player's angle
+HEADER_SIZE = 3 + len(WORLD_FIELDS) + len(PLAYER_FIELDS) + 1
+
+
+def parse_address(address):
+    """ (family, address) for socket(): a path (contains a slash) is a Unix socket,
+    anything else is host:port or a bare port on localhost """
+    if "/" in address or os.sep in address:
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix sockets are not available here, use host:port")
+        return socket.AF_UNIX, address
+    host, _, port = address.rpartition(":")
+    try:
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    except ValueError:
+        raise ValueError(f"invalid spectator address {address!r}")
+
+
+def to_angle(degrees):
+    return int(degrees * (ANGLE_STEPS / 360)) % ANGLE_STEPS
+
+
+def unwrap(previous, degrees):
+    """ degrees moved into the half turn around previous, so interpolation takes the short way """
+    return previous + (degrees - previous + 180) % 360 - 180
+
+
+# --- Kind Class ---
+class Kind:
+    """ Wire layout of one entity class, like snapshot.Layout but quantized. Dynamic columns
+    go out every frame: positions, angles and ints. Static ones only with an entity's first
+    frame: ints, colours (3 ints), points (2 positions), strings and a variable-length
+    list of shape offsets whose length is one of the static ints """
+    def __init__(self, cls, positions=("x", "y"), angles=(), ints=(), static_ints=(), colors=(), points=(),
+                 strings=(), shape=None):
+        self.cls = cls
+        self.positions = positions
+        self.angles = angles
+        self.ints = ints
+        self.columns = len(positions) + len(angles) + len(ints)
+        self.getters = [attrgetter(name) for name in positions + angles + ints]
+        self.static_ints = static_ints
+        self.static_get = attrgetter(*static_ints) if static_ints else None
+        self.colors = colors
+        self.points = points
+        self.strings = strings
+        self.shape = shape # (list attribute, static int holding its length)
+
+    def capture(self, objs):
+        """ The dynamic columns of objs, as they are: the game thread only copies them """
+        return [list(map(get, objs)) for get in self.getters]
+
+    def quantize(self, columns):
+        """ Raw columns from capture() to ints, in place (publisher thread) """
+        angles_end = len(self.positions) + len(self.angles)
+        for c, column in enumerate(columns[:angles_end]):
+            if c < len(self.positions):
+                columns[c] = [int(v * POSITION_STEPS) for v in column]
+            else:
+                columns[c] = [int(v * (ANGLE_STEPS / 360)) % ANGLE_STEPS for v in column]
+        return columns
+
+    def encode_statics(self, objs, ints, strings):
+        if self.static_get is not None:
+            rows = [self.static_get(obj) for obj in objs]
+            if len(self.static_ints) == 1:
+                rows = [(value,) for value in rows]
+            for i in range(len(self.static_ints)):
+                ints.extend(int(row[i]) for row in rows)
+        for name in self.colors:
+            for i in range(3):
+                ints.extend(getattr(obj, name)[i] for obj in objs)
+        for name in self.points:
+            for i in range(2):
+                ints.extend(int(getattr(obj, name)[i] * POSITION_STEPS) for obj in objs)
+        for name in self.strings:
+            strings.extend(getattr(obj, name) for obj in objs)
+        if self.shape:
+            for obj in objs:
+                ints.extend(int(v * SHAPE_STEPS) for v in getattr(obj, self.shape[0]))
+
+    def decode_statics(self, count, ints, pos, strings):
+        """ count new objects with their static fields set; returns them and the position after them """
+        objs = [self.cls.__new__(self.cls) for _ in range(count)]
+        states = [obj.__dict__ for obj in objs]
+        for name in self.static_ints:
+            for state, value in zip(states, ints[pos:pos + count]):
+                state[name] = value
+            pos += count
+        for name in self.colors:
+            for i, state in enumerate(states):
+                state[name] = (ints[pos + i], ints[pos + count + i], ints[pos + 2 * count + i])
+            pos += 3 * count
+        for name in self.points:
+            for i, state in enumerate(states):
+                state[name] = (ints[pos + i] / POSITION_STEPS, ints[pos + count + i] / POSITION_STEPS)
+            pos += 2 * count
+        for name in self.strings:
+            for state in states:
+                state[name] = next(strings)
+        if self.shape:
+            name, length = self.shape
+            for state in states:
+                state[name] = [v / SHAPE_STEPS for v in ints[pos:pos + state[length]]]
+                pos += state[length]
+        for state in states:
+            state["_groups"] = {}
+            state["vel_x"] = state["vel_y"] = 0 # No wrap correction in previous_position
+        return objs, pos
+
+    def apply(self, objs, columns):
+        """ Sets the dynamic fields of objs from columns. Positions and angles keep their
+        previous value in prev_*, which the renderer interpolates from """
+        i = 0
+        for name, column in zip(self.positions, columns):
+            prev = "prev_" + name
+            for obj, value in zip(objs, column):
+                state = obj.__dict__
+                state[prev] = state.get(name, value / POSITION_STEPS)
+                state[name] = value / POSITION_STEPS
+            i += 1
+        for name, column in zip(self.angles, columns[i:]):
+            prev = "prev_" + name
+            for obj, value in zip(objs, column):
+                state = obj.__dict__
+                degrees = value * (360 / ANGLE_STEPS)
+                if name in state:
+                    state[prev] = state[name]
+                    degrees = unwrap(state[name], degrees)
+                else:
+                    state[prev] = degrees
+                state[name] = degrees
+            i += 1
+        for name, column in zip(self.ints, columns[i:]):
+            for obj, value in zip(objs, column):
+                obj.__dict__[name] = value
+
+
+# Every entity class in the stream, in stream order. Groups are rebuilt from these on the spectator side
+KINDS = (
+    Kind(Asteroid, angles=("rot_angle",), ints=("hit_flash_timer", "spawn_timer"),
+         static_ints=("radius", "num_points"), shape=("shape_offsets", "num_points")),
+    Kind(Bullet, angles=("angle",), ints=("lifespan",), static_ints=("is_laser",)),
+    Kind(EnemyBullet),
+    Kind(UFO, ints=("hit_flash_timer",), static_ints=("size",)),
+    Kind(UFOElite, ints=("hit_flash_timer",), static_ints=("size",)),
+    Kind(HunterMine, ints=("pulse_timer", "charge_timer"), static_ints=("size",)),
+    Kind(PowerUp, ints=("lifespan",), static_ints=("size",), colors=("color",), strings=("letter",)),
+    Kind(PlayerDebris, angles=("rot_angle",), ints=("lifespan",), points=("p1", "p2")),
+    Kind(Debris, ints=("lifespan",), static_ints=("size",), colors=("color",)),
+    Kind(Shockwave, ints=("lifespan",), static_ints=("max_radius", "max_lifespan", "width")),
+    Kind(FloatingText, ints=("lifespan",), colors=("color",), strings=("text_str",)),
+    Kind(Particle, static_ints=("size",), colors=("color",)),
+)
+KIND_OF = {kind.cls: i for i, kind in enumerate(KINDS)}
+ALL_SPRITES_KINDS = tuple(i for i, kind in enumerate(KINDS) if kind.cls not in (Debris, Shockwave, FloatingText, Particle))
+
+
+# --- Capture and Encoding ---
+def capture(world):
+    """ One frame of world: (header ints, ghost trail ints, per kind (objs, raw columns)).
+    Runs on the game thread, so it only copies; track() and encode() run on the publisher thread """
+    player = world.player
+    state = STATES.index(world.game_state) if world.game_state in STATES else 0
+    header = [state, world.player_data["total_credits"], SHIPS.index(player.ship_type)]
+    header += [int(getattr(world, name) * steps) for name, steps in WORLD_FIELDS]
+    header += [int(getattr(player, name) * steps) for name, steps in PLAYER_FIELDS]
+    header.append(to_angle(player.angle))
+    trail = [len(player.ghost_trail)]
+    for points, lifespan in player.ghost_trail:
+        trail.extend(int(v * POSITION_STEPS) for v in chain.from_iterable(points))
+        trail.append(lifespan)
+
+    tables = [[] for _ in KINDS]
+    if world.game_state in PLAYFIELD_STATES and world.groups_created:
+        for sprite in world.all_sprites:
+            tables[KIND_OF[type(sprite)]].append(sprite)
+        for debris in world.debris:
+            if type(debris) is Debris: # PlayerDebris is in all_sprites as well
+                tables[KIND_OF[Debris]].append(debris)
+        tables[KIND_OF[Shockwave]] = world.shockwaves.sprites()
+        tables[KIND_OF[FloatingText]] = world.floating_texts.sprites()
+        tables[KIND_OF[Particle]] = list(world.particles)
+    return header, trail, [(objs, kind.capture(objs)) for kind, objs in zip(KINDS, tables)]
+
+
+def track(frame, base):
+    """ Quantizes frame and matches its rows to base, the frame encoded before it (None if
+    there is none). Returns the frame as (header, trail, per kind (objs, columns, steps)) and
+    per kind (removed base rows, kept row count, residual columns). A row's step is how much
+    it changed since base (0 for a new row), its residual that step minus its step before """
+    header, trail, tables = frame
+    tracked = []
+    changes = []
+    for i, (kind, (objs, columns)) in enumerate(zip(KINDS, tables)):
+        columns = kind.quantize(columns)
+        kept = 0
+        removed = ()
+        residuals = ()
+        if base is not None and base[2][i][0]:
+            base_objs, base_columns, base_steps = base[2][i]
+            alive = set(objs)
+            removed = [row for row, obj in enumerate(base_objs) if obj not in alive]
+            kept = len(base_objs) - len(removed)
+            if removed:
+                gone = set(removed)
+                rows = [row for row in range(len(base_objs)) if row not in gone]
+                base_objs = [base_objs[row] for row in rows]
+                base_columns = [[column[row] for row in rows] for column in base_columns]
+                base_steps = [[column[row] for row in rows] for column in base_steps]
+            if objs[:kept] != base_objs:
+                # Reordered (a restored snapshot reuses no objects, so this is rare): resend all
+                removed = range(len(base[2][i][0]))
+                kept = 0
+        padding = [0] * (len(objs) - kept)
+        if kept:
+            steps = [list(map(sub, column[:kept], base_column)) for column, base_column in zip(columns, base_columns)]
+            residuals = [list(map(sub, step, base_step)) for step, base_step in zip(steps, base_steps)]
+            steps = [step + padding for step in steps]
+        else:
+            steps = [padding] * kind.columns
+        tracked.append((objs, columns, steps))
+        changes.append((removed, kept, residuals))
+    return (header, trail, tracked), changes
+
+
+def encode(frame, number, base=None, changes=None):
+    """ One stream message for a tracked frame: a delta against base with the changes
+    track() found, or a keyframe (every row new, with its step) when base is None """
+    header, trail, tables = frame
+    ints = list(header) if base is None else list(map(sub, header, base[0]))
+    ints.extend(trail)
+    strings = []
+    for i, (kind, (objs, columns, steps)) in enumerate(zip(KINDS, tables)):
+        removed, kept, residuals = changes[i] if base is not None else ((), 0, ())
+        ints.append(len(removed))
+        ints.extend(removed)
+        ints.append(len(objs) - kept)
+        for c in range(kind.columns):
+            if base is None:
+                ints.extend(columns[c])
+                ints.extend(steps[c])
+            else:
+                if kept:
+                    ints.extend(residuals[c])
+                ints.extend(columns[c][kept:])
+        kind.encode_statics(objs[kept:], ints, strings)
+    body = (MESSAGE_HEADER.pack(base is None, number, len(ints)) + little_endian(array("i", ints)).tobytes() +
+            "\0".join(strings).encode())
+    data = zlib.compress(body, SPECTATE_COMPRESS_LEVEL)
+    return struct.pack("<I", len(data)) + data
+
+
+# --- Spectator Publisher Class ---
+class Spectator:
+    """ One connected spectator: what is queued for its socket and whether its next
+    frame has to be a keyframe (it's new, or it missed a frame) """
+    def __init__(self, sock):
+        self.sock = sock
+        self.pending = bytearray(MAGIC + struct.pack("<H", FORMAT_VERSION))
+        self.needs_keyframe = True
+        self.dropped = 0
+
+
+class SpectatorPublisher:
+    """ Serves the world state to spectators on a local socket. publish() runs on the game
+    thread: it copies the frame's fields and leaves them in a one-slot mailbox. The publisher
+    thread takes the newest frame, quantizes and encodes it (a delta, and a keyframe if a
+    spectator needs one) and queues it on every socket without blocking. A spectator with
+    more than SPECTATE_MAX_PENDING bytes still queued misses frames until it catches up,
+    then gets a keyframe; the game never waits for it """
+    def __init__(self, address=SPECTATE_ADDRESS):
+        self.address = address
+        family, sock_address = parse_address(address)
+        self.listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_UNIX:
+            if os.path.exists(sock_address):
+                os.remove(sock_address) # Left over from a previous game
+        else:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self.listener.bind(sock_address)
+            self.listener.listen()
+        except OSError:
+            self.listener.close()
+            raise
+        self.listener.setblocking(False)
+        self.unix_path = sock_address if family == socket.AF_UNIX else None
+        self.wake_r, self.wake_w = socket.socketpair()
+        self.wake_r.setblocking(False)
+        self.wake_w.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.selector.register(self.wake_r, selectors.EVENT_READ)
+
+        self.spectators = []
+        self.watching = 0 # Connected spectators, read by the game thread
+        self.mailbox = deque(maxlen=1) # Newest captured frame
+        self.base = None # The last frame encoded, which every synced spectator has
+        self.number = 0
+        self.published = 0
+        self.skipped = 0 # Replaced in the mailbox before the publisher thread took them
+        self.keyframes = 0
+        self.deltas = 0
+        self.bytes_sent = 0
+        self.dropped = 0 # Frames some spectator missed because it fell behind
+        self.encode_time = 0.0
+        self.closed = False
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run_publisher, name="astro-spectate", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def publish(self, world):
+        """ Offers this step's world state; free while nobody watches """
+        if not self.watching:
+            return
+        if self.mailbox:
+            self.skipped += 1
+        self.mailbox.append(capture(world))
+        self.published += 1
+        try:
+            self.wake_w.send(b"\0")
+        except OSError:
+            pass # Wake-up already pending
+
+    # --- Publisher thread ---
+    def run_publisher(self):
+        while not self.stopping:
+            for key, mask in self.selector.select():
+                if key.fileobj is self.listener:
+                    self.accept()
+                elif key.fileobj is self.wake_r:
+                    try:
+                        self.wake_r.recv(4096)
+                    except OSError:
+                        pass
+                else:
+                    self.service(key.data, mask)
+            if self.mailbox:
+                self.send_frame(self.mailbox.popleft())
+        for spectator in self.spectators:
+            spectator.sock.close()
+        self.selector.close()
+        self.listener.close()
+        self.wake_r.close()
+        if self.unix_path is not None and os.path.exists(self.unix_path):
+            os.remove(self.unix_path)
+
+    def accept(self):
+        try:
+            sock, _ = self.listener.accept()
+        except OSError:
+            return
+        if len(self.spectators) >= SPECTATE_MAX_CLIENTS:
+            sock.close()
+            return
+        sock.setblocking(False)
+        if sock.family != getattr(socket, "AF_UNIX", None):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # A small kernel buffer, so a stalled spectator shows up in `pending` within a few
+        # frames instead of after megabytes of autotuned backlog
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SPECTATE_MAX_PENDING)
+        spectator = Spectator(sock)
+        self.spectators.append(spectator)
+        self.selector.register(sock, selectors.EVENT_READ | selectors.EVENT_WRITE, spectator)
+        self.watching = len(self.spectators)
+
+    def service(self, spectator, mask):
+        if mask & selectors.EVENT_READ:
+            try:
+                data = spectator.sock.recv(4096) # Spectators send nothing: this is the hang-up
+            except BlockingIOError:
+                data = None
+            except OSError:
+                data = b""
+            if data == b"":
+                self.disconnect(spectator)
+                return
+        if mask & selectors.EVENT_WRITE:
+            self.flush(spectator)
+
+    def flush(self, spectator):
+        try:
+            sent = spectator.sock.send(spectator.pending)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self.disconnect(spectator)
+            return
+        del spectator.pending[:sent]
+        self.bytes_sent += sent
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if spectator.pending else 0)
+        self.selector.modify(spectator.sock, events, spectator)
+
+    def disconnect(self, spectator):
+        self.selector.unregister(spectator.sock)
+        spectator.sock.close()
+        self.spectators.remove(spectator)
+        self.watching = len(self.spectators)
+        if not self.spectators:
+            self.base = None # Don't keep the sprites alive for nobody
+
+    def send_frame(self, frame):
+        start = time.perf_counter()
+        frame, changes = track(frame, self.base)
+        self.number += 1
+        delta = keyframe = None
+        for spectator in list(self.spectators):
+            if len(spectator.pending) > SPECTATE_MAX_PENDING:
+                spectator.dropped += 1
+                spectator.needs_keyframe = True # Its next frame can't build on this one
+                self.dropped += 1
+                continue
+            if spectator.needs_keyframe or self.base is None:
+                if keyframe is None:
+                    keyframe = encode(frame, self.number)
+                    self.keyframes += 1
+                spectator.pending += keyframe
+                spectator.needs_keyframe = False
+            else:
+                if delta is None:
+                    delta = encode(frame, self.number, self.base, changes)
+                    self.deltas += 1
+                spectator.pending += delta
+            self.flush(spectator)
+        self.base = frame if self.spectators else None
+        self.encode_time += time.perf_counter() - start
+
+    def close(self):
+        """ Disconnects every spectator and stops the thread. Safe to call more than once """
+        if self.closed:
+            return
+        self.closed = True
+        self.watching = 0
+        self.stopping = True
+        try:
+            self.wake_w.send(b"\0")
+        except OSError:
+            pass
+        self.thread.join()
+        self.wake_w.close()
+
+    def get_stats(self):
+        encoded = self.keyframes + self.deltas
+        return {"published": self.published, "skipped": self.skipped, "keyframes": self.keyframes,
+                "deltas": self.deltas, "dropped": self.dropped, "bytes_sent": self.bytes_sent,
+                "encode_ms": self.encode_time * 1000 / encoded if encoded else 0.0}
+
+
+# --- Spectator View Class ---
+class SpectatorView:
+    """ The receiving end: a World-like object a Renderer can draw, rebuilt from stream
+    messages. feed() takes raw bytes as they arrive from the socket. The background
+    stars aren't in the stream; the view scrolls its own with the player's velocity """
+    def __init__(self):
+        self.buffer = bytearray()
+        self.started = False
+        self.game_state = "START_MENU"
+        self.frame = 0
+        self.frames = 0
+        self.bytes_received = 0
+        self.header = None # Last header ints, what the next delta builds on
+        self.tables = [([], [[]] * kind.columns, [[]] * kind.columns) for kind in KINDS] # (objs, columns, steps) per kind
+        self.player = Player()
+        self.player_data = {"total_credits": 0}
+        for name, steps in WORLD_FIELDS:
+            setattr(self, name, 0)
+        self.camera_zoom = 1.0
+        self.all_sprites = self.debris = self.shockwaves = self.floating_texts = self.particles = []
+        rng = random.Random(0)
+        self.stars = [(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT), rng.randint(1, 3)) for _ in range(150)]
+        self.space_dust = [(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT)) for _ in range(70)]
+        self.near_stars = [(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT)) for _ in range(50)]
+
+    def feed(self, data):
+        """ Applies every complete message in data (plus what was left over); returns how many.
+        Raises ValueError for a stream this version can't read, or a truncated or damaged one """
+        self.buffer += data
+        self.bytes_received += len(data)
+        if not self.started:
+            if len(self.buffer) < len(MAGIC) + 2:
+                return 0
+            if self.buffer[:len(MAGIC)] != MAGIC:
+                raise ValueError("not an Astro spectator stream")
+            version, = struct.unpack_from("<H", self.buffer, len(MAGIC))
+            if version != FORMAT_VERSION:
+                raise ValueError(f"stream format {version}, expected {FORMAT_VERSION}")
+            del self.buffer[:len(MAGIC) + 2]
+            self.started = True
+        count = 0
+        pos = 0
+        while len(self.buffer) - pos >= 4:
+            size, = struct.unpack_from("<I", self.buffer, pos)
+            if len(self.buffer) - pos - 4 < size:
+                break
+            try:
+                self.apply(zlib.decompress(self.buffer[pos + 4:pos + 4 + size]))
+            except (zlib.error, struct.error, IndexError, KeyError, TypeError) as error:
+                raise ValueError(f"damaged stream ({type(error).__name__}: {error})")
+            pos += 4 + size
+            count += 1
+        del self.buffer[:pos]
+        return count
+
+    def apply(self, body):
+        keyframe, self.frame, count = MESSAGE_HEADER.unpack_from(body)
+        start = MESSAGE_HEADER.size
+        ints = little_endian(array("i", body[start:start + 4 * count]))
+        strings = iter(body[start + 4 * count:].decode().split("\0"))
+        if not keyframe and self.header is None:
+            raise ValueError("delta frame before any keyframe")
+
+        header = ints[:HEADER_SIZE].tolist()
+        if not keyframe:
+            header = list(map(add, header, self.header))
+        elapsed = header[3] - self.header[3] if self.header is not None else 0 # Simulation steps since the last frame
+        self.header = header
+        self.apply_header(header)
+        pos = HEADER_SIZE
+        trail = []
+        for _ in range(ints[pos]):
+            v = [value / POSITION_STEPS for value in ints[pos + 1:pos + 7]]
+            trail.append([[(v[0], v[1]), (v[2], v[3]), (v[4], v[5])], ints[pos + 7]])
+            pos += 7
+        self.player.ghost_trail = trail
+        pos += 1
+
+        for i, kind in enumerate(KINDS):
+            objs, columns, steps = self.tables[i]
+            if keyframe:
+                objs = []
+            removed = ints[pos + 1:pos + 1 + ints[pos]]
+            pos += 1 + len(removed)
+            if removed:
+                gone = set(removed)
+                rows = [row for row in range(len(objs)) if row not in gone]
+                objs = [objs[row] for row in rows]
+                columns = [[column[row] for row in rows] for column in columns]
+                steps = [[column[row] for row in rows] for column in steps]
+            kept = len(objs)
+            new = ints[pos]
+            pos += 1
+            padding = [0] * new
+            columns = list(columns)
+            steps = list(steps)
+            for c in range(kind.columns):
+                if keyframe:
+                    columns[c] = ints[pos:pos + new].tolist()
+                    steps[c] = ints[pos + new:pos + 2 * new].tolist()
+                    pos += 2 * new
+                else:
+                    step = list(map(add, ints[pos:pos + kept], steps[c])) if kept else []
+                    columns[c] = list(map(add, columns[c][:kept], step)) + ints[pos + kept:pos + kept + new].tolist()
+                    steps[c] = step + padding
+                    pos += kept + new
+            new_objs, pos = kind.decode_statics(new, ints, pos, strings)
+            objs = objs + new_objs
+            kind.apply(objs, columns)
+            if kind.cls is Shockwave:
+                for obj in new_objs:
+                    obj.rect = Rect(0, 0, obj.max_radius * 2, obj.max_radius * 2)
+                    obj.rect.center = (obj.x, obj.y)
+            self.tables[i] = (objs, columns, steps)
+
+        self.all_sprites = list(chain.from_iterable(self.tables[i][0] for i in ALL_SPRITES_KINDS))
+        self.debris = self.tables[KIND_OF[Debris]][0] + self.tables[KIND_OF[PlayerDebris]][0]
+        self.shockwaves = self.tables[KIND_OF[Shockwave]][0]
+        self.floating_texts = self.tables[KIND_OF[FloatingText]][0]
+        self.particles = self.tables[KIND_OF[Particle]][0]
+        if self.game_state == "PLAYING" and not (self.warning_timer or self.game_start_timer or self.level_clear_timer):
+            self.scroll_background(min(max(elapsed, 0), MAX_SIM_STEPS_PER_FRAME))
+        self.frames += 1
+
+    def apply_header(self, header):
+        player = self.player
+        self.game_state = STATES[header[0]]
+        self.player_data["total_credits"] = header[1]
+        ship_type = SHIPS[header[2]]
+        if player.ship_type != ship_type:
+            self.player = player = Player(ship_type)
+        pos = 3
+        for name, steps in WORLD_FIELDS:
+            setattr(self, name, header[pos] / steps if steps != 1 else header[pos])
+            pos += 1
+        player.prev_x, player.prev_y, player.prev_angle = player.x, player.y, player.angle
+        for name, steps in PLAYER_FIELDS:
+            setattr(player, name, header[pos] / steps if steps != 1 else header[pos])
+            pos += 1
+        player.thrusting = bool(player.thrusting)
+        player.is_shielded = bool(player.is_shielded)
+        player.angle = unwrap(player.prev_angle, header[pos] * (360 / ANGLE_STEPS))
+        if abs(player.x - player.prev_x) > SCREEN_WIDTH / 2 or abs(player.y - player.prev_y) > SCREEN_HEIGHT / 2:
+            player.prev_x, player.prev_y = player.x, player.y # Wrapped or jumped: don't sweep across the screen
+
+    def scroll_background(self, steps):
+        """ The World's parallax scroll, steps times """
+        vel_x, vel_y = self.player.vel_x * steps, self.player.vel_y * steps
+        self.stars = [((x - vel_x * 0.03 * size) % SCREEN_WIDTH, (y - vel_y * 0.03 * size) % SCREEN_HEIGHT, size)
+                      for x, y, size in self.stars]
+        self.space_dust = [((x - vel_x * 0.1) % SCREEN_WIDTH, (y - vel_y * 0.1) % SCREEN_HEIGHT) for x, y in self.space_dust]
+        self.near_stars = [((x - vel_x * 0.2) % SCREEN_WIDTH, (y - vel_y * 0.2) % SCREEN_HEIGHT) for x, y in self.near_stars]
+
+
+# --- Spectator Window ---
+def connect(address, timeout=None):
+    """ A socket connected to a publisher at address, retrying until timeout (None: forever) """
+    family, sock_address = parse_address(address)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.connect(sock_address)
+            return sock
+        except OSError:
+            sock.close()
+            if deadline is not None and time.monotonic() >= deadline:
+                raise
+            time.sleep(0.5)
+
+
+def start_connect(address):
+    """ A non-blocking socket with its connection to address under way; see connected() """
+    family, sock_address = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    error = sock.connect_ex(sock_address)
+    if error not in (0, errno.EINPROGRESS, errno.EAGAIN, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", None)):
+        sock.close()
+        raise OSError(error, os.strerror(error))
+    return sock
+
+
+def connected(sock):
+    """ Whether a start_connect() socket has connected yet. Raises OSError if it failed """
+    _, writable, failed = select.select([], [sock], [sock], 0)
+    if not writable and not failed:
+        return False
+    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+    if error:
+        raise OSError(error, os.strerror(error))
+    return True
+
+
+def main():
+    import argparse
+    import pygame
+    from .render import Renderer
+
+    parser = argparse.ArgumentParser(description="Spectator window for a game started with --spectate")
+    parser.add_argument("address", nargs="?", default=SPECTATE_ADDRESS,
+                        help=f"host:port or Unix socket path (default {SPECTATE_ADDRESS})")
+    parser.add_argument("--stats", action="store_true", help="show frame and bandwidth counters")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(f"{WINDOW_TITLE} - Spectator")
+    clock = pygame.time.Clock()
+    view = SpectatorView()
+    renderer = Renderer(view)
+    sock = None
+    connecting = None # Socket still connecting, so an unreachable host never freezes the window
+    connect_deadline = 0.0
+    retry_at = 0.0
+    last_frame_time = time.perf_counter()
+    rate_start, rate_bytes, rate_frames, rate_text = time.perf_counter(), 0, 0, ""
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+
+        if sock is None and connecting is None and time.perf_counter() >= retry_at:
+            try:
+                connecting = start_connect(args.address)
+                connect_deadline = time.perf_counter() + SPECTATE_CONNECT_TIMEOUT
+            except OSError:
+                retry_at = time.perf_counter() + 1.0 # Game not up yet
+        if connecting is not None:
+            try:
+                if connected(connecting):
+                    sock, connecting = connecting, None
+                    view = SpectatorView()
+                    renderer.world = view
+                elif time.perf_counter() >= connect_deadline:
+                    raise TimeoutError
+            except OSError:
+                connecting.close()
+                connecting = None
+                retry_at = time.perf_counter() + 1.0
+        if sock is not None:
+            try:
+                while True:
+                    data = sock.recv(1 << 16)
+                    if not data:
+                        raise ConnectionResetError
+                    if view.feed(data):
+                        last_frame_time = time.perf_counter()
+            except BlockingIOError:
+                pass
+            except (OSError, ValueError) as error:
+                if isinstance(error, ValueError):
+                    print(f"Error: {error}")
+                sock.close()
+                sock = None
+
+        surface = renderer.game_surface
+        if view.game_state in PLAYFIELD_STATES:
+            interp = min(1.0, (time.perf_counter() - last_frame_time) / SIM_STEP)
+            renderer.render_playfield(interp)
+            offset = (0, 0)
+            if view.screen_shake_timer > 0:
+                offset = (renderer.rng.randint(-5, 5), renderer.rng.randint(-5, 5))
+            final_surf, final_rect = renderer.apply_camera_zoom(screen, offset)
+            screen.blit(final_surf, final_rect)
+            if view.game_state != "PLAYING":
+                label = "KILL CAM" if view.game_state == "KILL_CAM" else "GAME OVER"
+                text = renderer.render_text(renderer.medium_font, label, RED)
+                screen.blit(text, text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 60)))
+        else:
+            surface.fill(BACKGROUND_COLOR)
+            renderer.draw_background(surface)
+            screen.blit(surface, (0, 0))
+            label = "Waiting for the game..." if sock is None else "Waiting for a run..."
+            text = renderer.render_text(renderer.medium_font, label, WHITE)
+            screen.blit(text, text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+
+        if args.stats:
+            now = time.perf_counter()
+            if now - rate_start >= 1.0:
+                kbps = (view.bytes_received - rate_bytes) / (now - rate_start) / 1024
+                fps = (view.frames - rate_frames) / (now - rate_start)
+                rate_text = f"{fps:.0f} frames/s  {kbps:.1f} KB/s  {len(view.all_sprites) + len(view.particles)} entities"
+                rate_start, rate_bytes, rate_frames = now, view.bytes_received, view.frames
+            text = renderer.render_text(renderer.font_small, rate_text, GREY)
+            screen.blit(text, (10, SCREEN_HEIGHT - 20))
+        pygame.display.flip()
+        clock.tick(RENDER_FPS or 2 * FPS) # Interpolates between stream frames, like the game
+    for open_sock in (sock, connecting):
+        if open_sock is not None:
+            open_sock.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
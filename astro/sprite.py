@@ -0,0 +1,101 @@
+"""
+Sprite and Group without pygame: same membership semantics and iteration
+order as pygame.sprite, so the simulation core runs headless.
+"""
+
+
+# --- Sprite Class ---
+class Sprite:
+    """ Base class for anything kept in a Group. A sprite knows its groups so kill() is O(groups) """
+    def __init__(self, *groups):
+        self._groups = {}
+        if groups:
+            self.add(*groups)
+
+    def add(self, *groups):
+        for group in groups:
+            if not group.has(self):
+                group.add(self)
+
+    def remove(self, *groups):
+        for group in groups:
+            if group.has(self):
+                group.remove(self)
+
+    def kill(self):
+        for group in list(self._groups):
+            group._remove_internal(self)
+        self._groups.clear()
+
+    def alive(self):
+        return bool(self._groups)
+
+    def groups(self):
+        return list(self._groups)
+
+    def update(self, *args, **kwargs):
+        pass
+
+
+# --- Group Class ---
+class Group:
+    """ Insertion-ordered set of sprites. Iteration and update() work on a snapshot,
+    so sprites may be killed or added while a group is being walked """
+    def __init__(self, *sprites):
+        self._sprites = {}
+        if sprites:
+            self.add(*sprites)
+
+    def sprites(self):
+        return list(self._sprites)
+
+    def add(self, *sprites):
+        for sprite in sprites:
+            if isinstance(sprite, Sprite):
+                if sprite not in self._sprites:
+                    self._sprites[sprite] = None
+                    sprite._groups[self] = None
+            else:
+                self.add(*sprite) # Any iterable of sprites
+
+    def remove(self, *sprites):
+        for sprite in sprites:
+            if isinstance(sprite, Sprite):
+                if sprite in self._sprites:
+                    self._remove_internal(sprite)
+                    del sprite._groups[self]
+            else:
+                self.remove(*sprite)
+
+    def _remove_internal(self, sprite):
+        del self._sprites[sprite]
+
+    def has(self, *sprites):
+        return bool(sprites) and all(sprite in self._sprites for sprite in sprites)
+
+    def update(self, *args, **kwargs):
+        for sprite in self.sprites():
+            sprite.update(*args, **kwargs)
+
+    def empty(self):
+        for sprite in self._sprites:
+            del sprite._groups[self]
+        self._sprites.clear()
+
+    def copy(self):
+        return self.__class__(self.sprites())
+
+    def __contains__(self, sprite):
+        return sprite in self._sprites
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def __bool__(self):
+        return bool(self._sprites)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}({len(self)} sprites)>"
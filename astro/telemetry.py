@@ -0,0 +1,149 @@
+"""
+Gameplay telemetry: typed events from the simulation, buffered in a ring and
+written in batches by a background thread to rotating gzip-compressed JSONL
+files. Standard library only, so headless tools can record runs too.
+
+    python -m astro --telemetry            (writes to TELEMETRY_DIR)
+
+Each line is one event: {"ev": kind, "run": n, "frame": step, <fields>}, with the
+fields of that kind listed in EVENTS. frame counts simulation steps from the start
+of the run (FPS per second).
+"""
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+
+from .config import *
+
+# Event kind -> its fields, in the order emit() takes them
+EVENTS = {
+    "run_start": ("ship", "level"),
+    "run_end": ("ship", "score", "level", "duration_s", "flow_states", "cause"),
+    "wave": ("level", "kind", "asteroids", "mines"), # kind: normal, minefield or boss
+    "boss_spawn": ("level", "count"),
+    "kill": ("target", "x", "y", "laser"),           # target: asteroid_large/medium/small, ufo, ufo_elite, hunter_mine
+    "near_miss": ("x", "y", "points"),
+    "pickup": ("powerup", "x", "y"),
+    "score": ("points", "final", "flow_level", "flow_state"),
+    "flow_start": ("score",),
+    "flow_end": ("frames", "reason"),                # reason: expired or hit
+    "hit": ("cause", "x", "y", "lives", "fatal"),
+    "dash": ("x", "y", "angle"),
+    "hyperspace": ("from_x", "from_y", "x", "y"),
+}
+
+
+# --- Telemetry Class ---
+class Telemetry:
+    """ The event bus. emit() runs on the game thread and only stores a tuple in a fixed-size
+    ring; the writer thread turns batches of them into JSON. When the writer falls behind and
+    the ring is full, new events are dropped (and counted) rather than blocking the game.
+    One producer and one consumer, each advancing only its own index, so no lock is needed """
+    def __init__(self, directory=TELEMETRY_DIR, ring_size=TELEMETRY_RING_SIZE):
+        self.directory = directory
+        self.ring = [None] * ring_size
+        self.head = 0 # Events emitted (game thread)
+        self.tail = 0 # Events taken by the writer (writer thread)
+        self.run = 0
+        self.frame = 0 # Set by the World every step
+        self.dropped = 0 # Ring full (game thread)
+        self.lost = 0 # Taken from the ring but not written (writer thread)
+        self.written = 0
+        self.files = 0
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.file = None
+        self.file_bytes = 0
+        self.failed = False
+        self.closed = False
+        self.wake = threading.Event()
+        self.stopping = False
+        os.makedirs(directory, exist_ok=True)
+        self.thread = threading.Thread(target=self.run_writer, name="astro-telemetry", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def begin_run(self, ship, level):
+        self.run += 1
+        self.frame = 0
+        self.emit("run_start", ship, level)
+
+    def emit(self, kind, *values):
+        """ Queues one event; values are EVENTS[kind] in order """
+        pending = self.head - self.tail
+        if pending >= len(self.ring):
+            self.dropped += 1
+            return
+        self.ring[self.head % len(self.ring)] = (kind, self.run, self.frame, values)
+        self.head += 1
+        if pending + 1 == TELEMETRY_BATCH_SIZE:
+            self.wake.set()
+
+    # --- Writer thread ---
+    def run_writer(self):
+        while True:
+            self.wake.wait(TELEMETRY_FLUSH_INTERVAL)
+            self.wake.clear()
+            stopping = self.stopping # Read before draining, so nothing emitted before close() is missed
+            self.write_batch()
+            if stopping:
+                break
+        if self.file is not None:
+            self.file.close()
+
+    def write_batch(self):
+        head = self.head
+        if head == self.tail:
+            return
+        lines = []
+        for i in range(self.tail, head):
+            slot = i % len(self.ring)
+            kind, run, frame, values = self.ring[slot]
+            self.ring[slot] = None
+            event = {"ev": kind, "run": run, "frame": frame}
+            event.update(zip(EVENTS[kind], (round(value, 2) if type(value) is float else value for value in values)))
+            lines.append(json.dumps(event, separators=(",", ":")))
+        self.tail = head # Frees the slots for the game thread
+        if self.failed:
+            self.lost += len(lines)
+            return
+        data = ("\n".join(lines) + "\n").encode()
+        try:
+            if self.file is None or self.file_bytes >= TELEMETRY_FILE_MAX_BYTES:
+                self.rotate()
+            self.file.write(data)
+            self.file.flush() # Sync-flushes the compressor: a crash loses at most this batch
+            self.file_bytes += len(data)
+            self.written += len(lines)
+        except OSError:
+            print("Error: Could not write telemetry, further events are dropped.")
+            self.failed = True
+            self.lost += len(lines)
+
+    def rotate(self):
+        """ Starts the next file and deletes the oldest beyond TELEMETRY_MAX_FILES """
+        if self.file is not None:
+            self.file.close()
+        self.files += 1
+        path = os.path.join(self.directory, f"events-{self.session}-{self.files:04d}.jsonl.gz")
+        self.file = gzip.open(path, "wb", compresslevel=TELEMETRY_COMPRESS_LEVEL)
+        self.file_bytes = 0
+        names = sorted(name for name in os.listdir(self.directory)
+                       if name.startswith("events-") and name.endswith(".jsonl.gz"))
+        for name in names[:-TELEMETRY_MAX_FILES]:
+            os.remove(os.path.join(self.directory, name))
+
+    def close(self):
+        """ Writes what is buffered and stops the writer. Safe to call more than once """
+        if self.closed:
+            return
+        self.closed = True
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+
+    def get_stats(self):
+        return {"emitted": self.head + self.dropped, "written": self.written,
+                "dropped": self.dropped, "lost": self.lost, "files": self.files}
@@ -0,0 +1,71 @@
+"""
+Background warm-up: builds the renderer's fonts, text renders and effect frames on a
+worker thread while the player is in the menus, so the first explosion, floating score,
+HYPERFLOW and countdown of a run find them ready instead of hitching.
+
+Progress goes to the "astro.warmup" logger at DEBUG level (see --debug-log).
+"""
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+# --- Warmup Class ---
+class Warmup:
+    """ Runs (label, job) pairs in order on one daemon thread. wait() is the completion
+    barrier the app calls before a run starts. The jobs only fill caches that would
+    otherwise be filled on first use, so a failed or cancelled job costs a hitch, not a crash """
+    def __init__(self, jobs, trace=None):
+        self.jobs = list(jobs)
+        self.trace = trace # StartupTrace to add the whole warm-up to as one phase
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = False
+        self.thread = None
+        self.finished = threading.Event()
+
+    @property
+    def progress(self):
+        return self.completed / len(self.jobs) if self.jobs else 1.0
+
+    def start(self):
+        if self.thread is None and not self.finished.is_set():
+            self.thread = threading.Thread(target=self.run, name="astro-warmup", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        start = time.perf_counter()
+        log.debug("warm-up: %d jobs", len(self.jobs))
+        for label, job in self.jobs:
+            if self.cancelled:
+                log.debug("warm-up: cancelled after %d/%d jobs", self.completed, len(self.jobs))
+                break
+            job_start = time.perf_counter()
+            try:
+                job()
+            except Exception:
+                self.failed += 1
+                log.exception("warm-up: %s failed", label)
+            self.completed += 1
+            log.debug("warm-up: %d/%d %s (%.2f ms)", self.completed, len(self.jobs), label,
+                      (time.perf_counter() - job_start) * 1000)
+            time.sleep(0) # Let the menu's thread in between jobs
+        end = time.perf_counter()
+        if self.trace is not None:
+            self.trace.add("warmup", start, end)
+        log.debug("warm-up: finished in %.1f ms, %d failed", (end - start) * 1000, self.failed)
+        self.finished.set()
+
+    def wait(self):
+        """ Returns once every job has run. A warm-up that was never started runs here """
+        if self.thread is None and not self.finished.is_set():
+            self.run()
+        self.finished.wait()
+
+    def cancel(self):
+        """ Stops after the current job and waits for the thread, so pygame.quit never races it """
+        self.cancelled = True
+        if self.thread is not None:
+            self.thread.join()
@@ -0,0 +1,552 @@
+"""
+The simulation: world state, spawning, collisions and scoring for one run.
+Needs only the standard library; the app shell (astro.app) subclasses World
+to add the window, input, menus and save files.
+"""
+import math
+import random
+
+from .config import *
+from .geometry import (get_distance, deg_to_rad, swept_rect, swept_circle_collision,
+                       swept_rect_collision, collide_radius)
+from .sprite import Group
+from .entities import (Controls, Player, Asteroid, UFO, UFOElite, HunterMine, PowerUp,
+                       Particle, Debris, PlayerDebris, Shockwave, FloatingText)
+from .telemetry import EVENTS
+from . import replay
+
+
+# --- Command Buffer Class ---
+class CommandBuffer:
+    """ Spawn and kill requests made while the world is being updated or collided.
+    They are applied in bulk at the sync points in World.update, so no sprite group
+    or particle list changes while something is iterating over it. """
+    def __init__(self):
+        self.spawns = {} # tuple of groups -> sprites to add to all of them
+        self.kills = []
+        self.particles = []
+
+    def spawn(self, sprite, *groups):
+        if groups not in self.spawns:
+            self.spawns[groups] = []
+        self.spawns[groups].append(sprite)
+
+    def kill(self, sprite):
+        self.kills.append(sprite)
+
+    def spawn_particle(self, particle):
+        self.particles.append(particle)
+
+    def flush(self, game):
+        for sprite in self.kills:
+            sprite.kill()
+        for groups, sprites in self.spawns.items():
+            for group in groups:
+                group.add(*sprites) # One insert call per group instead of one per sprite
+        game.particles.extend(self.particles)
+        self.clear()
+
+    def clear(self):
+        self.spawns.clear()
+        self.kills.clear()
+        self.particles.clear()
+
+
+# Telemetry names of the asteroid sizes
+ASTEROID_SIZE_NAMES = {ASTEROID_LARGE_SIZE: "asteroid_large", ASTEROID_MEDIUM_SIZE: "asteroid_medium",
+                       ASTEROID_SMALL_SIZE: "asteroid_small"}
+
+# Sprite groups of a run, in the order they are created
+GROUP_NAMES = ("all_sprites", "asteroids", "bullets", "ufos", "enemy_bullets", "powerups",
+               "hunter_mines", "floating_texts", "debris", "shockwaves")
+
+
+# --- World Class ---
+class World:
+    """ Everything one fixed simulation step touches. Steering input is read from
+    self.controls; shoot/dash/hyperspace are the player_* methods """
+    def __init__(self):
+        self.game_state = "START_MENU" # START_MENU, SHIP_SELECT, PLAYING, GAME_OVER (the app shell adds KILL_CAM)
+        self.screen_shake_timer = 0
+        self.level_clear_timer = 0
+        self.ufo_spawn_timer = random.randint(UFO_SPAWN_TIME_MIN, UFO_SPAWN_TIME_MAX)
+        self.chroma_glitch_timer = 0
+        self.game_start_timer = 0
+        self.warning_timer = 0 # For boss warning
+        self.camera_zoom = 1.0 # For dash zoom
+        self.controls = Controls()
+        self.commands = CommandBuffer() # Deferred spawns/kills, applied at sync points
+        self.telemetry = None # Event bus (astro.telemetry); None = not recording
+        self.input_log = None # astro.replay.InputRecorder while a run is being recorded
+
+        # Loaded from disk by the app shell; defaults for headless runs
+        self.high_score = 0
+        self.player_data = {"total_credits": 0, "unlocked_ships": ["Cruiser"]}
+        self.sounds = None
+        self.player = Player()
+
+        self.groups_created = False # The sprite groups below only exist once a run starts
+        self.particles = []
+        self.level = 1
+        self.run_frames = 0 # Simulation steps since start_new_game
+        self.death_cause = None # What ended the run: asteroid, enemy_bullet, ufo or hunter_mine
+
+        # Background stars
+        self.stars = []
+        for i in range(150):
+            x = random.randint(0, SCREEN_WIDTH)
+            y = random.randint(0, SCREEN_HEIGHT)
+            size = random.randint(1, 3)
+            self.stars.append((x, y, size))
+
+        self.space_dust = []
+        for i in range(70):
+            x = random.randint(0, SCREEN_WIDTH)
+            y = random.randint(0, SCREEN_HEIGHT)
+            self.space_dust.append((x, y))
+
+        # Near-field stars
+        self.near_stars = []
+        for i in range(50):
+            x = random.randint(0, SCREEN_WIDTH)
+            y = random.randint(0, SCREEN_HEIGHT)
+            self.near_stars.append((x, y))
+
+    def create_groups(self):
+        """ Gameplay sprite groups, made on entering PLAYING; later runs empty and reuse them """
+        if self.groups_created:
+            for name in GROUP_NAMES:
+                getattr(self, name).empty()
+            return
+        for name in GROUP_NAMES:
+            setattr(self, name, Group())
+        self.groups_created = True
+
+    def start_new_game(self, ship_type="Cruiser"):
+        self.level = 1
+        self.player = Player(ship_type)
+
+        self.create_groups()
+        self.particles = []
+        self.run_frames = 0
+        self.death_cause = None
+        self.level_clear_timer = 0 # A run can end in the step that cleared the level
+        self.warning_timer = 0
+        self.input_log = None # A recorder is attached after this (see astro.replay.new_seed)
+        self.commands.clear()
+        if self.telemetry is not None:
+            self.player.telemetry = self.telemetry
+            self.telemetry.begin_run(ship_type, self.level)
+
+        self.spawn_asteroids(ASTEROID_START_COUNT + self.level, self.level)
+        self.game_state = "PLAYING"
+        self.game_start_timer = 180
+        self.ufo_spawn_timer = random.randint(UFO_SPAWN_TIME_MIN, UFO_SPAWN_TIME_MAX)
+
+    def on_game_over(self):
+        """ Called once when the last life is lost. The app shell saves credits and scores here """
+        pass
+
+    def spawn_asteroids(self, count, level):
+        is_minefield = False
+        is_boss_level = False
+        mines_before = len(self.hunter_mines)
+
+        # Boss Level
+        if self.level > 0 and self.level % 5 == 0:
+            is_boss_level = True
+            count = 0 # No asteroids
+            self.warning_timer = 120 # Trigger warning
+            # Bosses are spawned by the warning_timer logic
+
+        # Minefield level
+        elif self.level > 1 and self.level % 4 == 0:
+            is_minefield = True
+            count = count // 2
+            num_mines = min(2 + (self.level // 4), 6)
+            cluster_x = random.randint(100, SCREEN_WIDTH - 100)
+            cluster_y = random.randint(100, SCREEN_HEIGHT - 100)
+            for _ in range(num_mines):
+                while True:
+                    m_x = cluster_x + random.uniform(-60, 60)
+                    m_y = cluster_y + random.uniform(-60, 60)
+                    if get_distance((m_x, m_y), (self.player.x, self.player.y)) > 100:
+                        new_mine = HunterMine(m_x, m_y, self)
+                        self.all_sprites.add(new_mine)
+                        self.hunter_mines.add(new_mine)
+                        break
+
+        # Spawn Asteroids
+        for _ in range(count):
+            while True:
+                new_ast = Asteroid(game_level=level)
+                if get_distance((new_ast.x, new_ast.y), (self.player.x, self.player.y)) > 150:
+                    self.asteroids.add(new_ast)
+                    self.all_sprites.add(new_ast)
+                    break
+
+        # Spawn mines (normal)
+        if not is_minefield and not is_boss_level and random.random() < HUNTER_MINE_SPAWN_CHANCE * level:
+             while True:
+                x = random.randint(50, SCREEN_WIDTH - 50)
+                y = random.randint(50, SCREEN_HEIGHT - 50)
+                if get_distance((x, y), (self.player.x, self.player.y)) > 100:
+                    new_mine = HunterMine(x, y, self)
+                    self.all_sprites.add(new_mine)
+                    self.hunter_mines.add(new_mine)
+                    break
+
+        if self.telemetry is not None:
+            kind = "boss" if is_boss_level else "minefield" if is_minefield else "normal"
+            self.telemetry.emit("wave", level, kind, count, len(self.hunter_mines) - mines_before)
+
+    def create_explosion(self, x, y, count, color_list, trigger_glitch=False, create_shockwave=False, create_debris=False):
+        for _ in range(count):
+            vel_x = random.uniform(-2, 2)
+            vel_y = random.uniform(-2, 2)
+            lifespan = random.randint(20, 40)
+            color = random.choice(color_list)
+            self.commands.spawn_particle(Particle(x, y, vel_x, vel_y, lifespan, color))
+        if create_debris:
+            for _ in range(count // 2):
+                debris = Debris(x, y, random.choice(color_list))
+                self.commands.spawn(debris, self.debris)
+        if trigger_glitch:
+            self.chroma_glitch_timer = 5
+        if create_shockwave:
+            self.commands.spawn(Shockwave(x, y), self.shockwaves)
+
+    def create_player_debris(self):
+        points = self.player.get_ship_points()
+        p1, p2, p3 = points
+
+        debris1 = PlayerDebris(self.player.x, self.player.y, self.player.vel_x, self.player.vel_y, p1, p2)
+        debris2 = PlayerDebris(self.player.x, self.player.y, self.player.vel_x, self.player.vel_y, p2, p3)
+        debris3 = PlayerDebris(self.player.x, self.player.y, self.player.vel_x, self.player.vel_y, p3, p1)
+
+        for debris in (debris1, debris2, debris3):
+            self.commands.spawn(debris, self.all_sprites, self.debris)
+
+    def create_thruster_particles(self):
+        if self.player.thrusting:
+            rad = deg_to_rad(self.player.angle + 180)
+            pos_x = self.player.x + math.cos(rad) * (self.player.size * 0.8)
+            pos_y = self.player.y + math.sin(rad) * (self.player.size * 0.8)
+            vel_x = self.player.vel_x + (math.cos(rad) * 2) + random.uniform(-0.5, 0.5)
+            vel_y = self.player.vel_y + (math.sin(rad) * 2) + random.uniform(-0.5, 0.5)
+            lifespan = random.randint(15, 25)
+            color = random.choice([ORANGE, YELLOW])
+            self.particles.append(Particle(pos_x, pos_y, vel_x, vel_y, lifespan, color))
+
+    # --- Player Actions (shared by the keyboard and scripted/agent input) ---
+    def player_shoot(self):
+        """ Fires the player's weapon if the bullet cap and cooldown allow it """
+        if self.input_log is not None:
+            self.input_log.action(replay.SHOOT)
+        if len(self.bullets) < MAX_BULLETS or self.player.flow_state_timer > 0:
+            new_bullets = self.player.shoot()
+            if new_bullets:
+                for bullet in new_bullets:
+                    bullet.add(self.all_sprites, self.bullets)
+                if self.player.flow_state_timer > 0:
+                    self.screen_shake_timer = 2
+
+    def player_dash(self):
+        if self.input_log is not None:
+            self.input_log.action(replay.DASH)
+        self.player.dash()
+
+    def player_hyperspace(self):
+        if self.input_log is not None:
+            self.input_log.action(replay.HYPERSPACE)
+        if self.player.hyperspace():
+            self.screen_shake_timer = 5
+
+    def update(self):
+        if self.input_log is not None:
+            self.input_log.step(self)
+        self.run_frames += 1
+        if self.telemetry is not None:
+            self.telemetry.frame = self.run_frames
+        # The player only moves in the main branch below; hold it still for interpolation otherwise
+        self.player.prev_x, self.player.prev_y = self.player.x, self.player.y
+        self.player.prev_angle = self.player.angle
+
+        # --- Boss Warning ---
+        if self.warning_timer > 0:
+            self.warning_timer -= 1
+            if self.warning_timer == 0:
+                # Spawn the boss(es)
+                num_bosses = 1 + (self.level // 10)
+                for _ in range(num_bosses):
+                    new_ufo = UFOElite(self)
+                    self.all_sprites.add(new_ufo)
+                    self.ufos.add(new_ufo)
+                if self.telemetry is not None:
+                    self.telemetry.emit("boss_spawn", self.level, num_bosses)
+            # Update visual elements but not gameplay
+            for p in self.particles: p.update()
+            self.particles = [p for p in self.particles if p.lifespan > 0]
+            self.floating_texts.update()
+            self.all_sprites.update()
+            self.shockwaves.update()
+            self.debris.update()
+            self.commands.flush(self)
+            return
+
+        if self.game_start_timer > 0:
+            self.game_start_timer -= 1
+            for p in self.particles: p.update()
+            self.particles = [p for p in self.particles if p.lifespan > 0]
+            self.floating_texts.update()
+            self.all_sprites.update()
+            self.shockwaves.update()
+            self.debris.update()
+            self.commands.flush(self)
+            return
+
+        if self.level_clear_timer > 0:
+            self.level_clear_timer -= 1
+            if self.level_clear_timer == 0:
+                self.level += 1
+                self.spawn_asteroids(ASTEROID_START_COUNT + self.level, self.level)
+                self.player.invulnerable_timer = PLAYER_INVULN_TIME // 2
+            for p in self.particles: p.update()
+            self.particles = [p for p in self.particles if p.lifespan > 0]
+            self.floating_texts.update()
+            self.all_sprites.update()
+            self.shockwaves.update()
+            self.debris.update()
+            self.commands.flush(self)
+            return
+
+        self.player.update(self.controls)
+        self.create_thruster_particles()
+        for p in self.particles: p.update()
+
+        self.all_sprites.update()
+        self.floating_texts.update()
+        self.commands.flush(self) # Sync point: shots and despawns from the update pass
+
+        # Update background
+        new_stars = []
+        for x, y, size in self.stars:
+            new_x = (x - self.player.vel_x * 0.03 * size) % SCREEN_WIDTH
+            new_y = (y - self.player.vel_y * 0.03 * size) % SCREEN_HEIGHT
+            new_stars.append((new_x, new_y, size))
+        self.stars = new_stars
+
+        new_dust = []
+        for x, y in self.space_dust:
+            new_x = (x - self.player.vel_x * 0.1) % SCREEN_WIDTH
+            new_y = (y - self.player.vel_y * 0.1) % SCREEN_HEIGHT
+            new_dust.append((new_x, new_y))
+        self.space_dust = new_dust
+
+        # Update near-field stars
+        new_near_stars = []
+        for x, y in self.near_stars:
+            new_x = (x - self.player.vel_x * 0.2) % SCREEN_WIDTH
+            new_y = (y - self.player.vel_y * 0.2) % SCREEN_HEIGHT
+            new_near_stars.append((new_x, new_y))
+        self.near_stars = new_near_stars
+
+        self.ufo_spawn_timer -= 1
+        max_ufos = 1 + (self.level // 5)
+
+        if self.level % 5 != 0 and self.ufo_spawn_timer <= 0 and len(self.ufos) < max_ufos:
+            if self.level > 3 and random.random() < 0.4:
+                new_ufo = UFOElite(self)
+            else:
+                new_ufo = UFO(self)
+            self.all_sprites.add(new_ufo)
+            self.ufos.add(new_ufo)
+            self.ufo_spawn_timer = random.randint(UFO_SPAWN_TIME_MIN, UFO_SPAWN_TIME_MAX)
+
+        if self.screen_shake_timer > 0: self.screen_shake_timer -= 1
+        if self.chroma_glitch_timer > 0: self.chroma_glitch_timer -= 1
+
+        # Camera zoom
+        target_zoom = 0.95 if self.player.dash_timer > 0 else 1.0
+        self.camera_zoom += (target_zoom - self.camera_zoom) * 0.1 # Smooth zoom
+
+        self.particles = [p for p in self.particles if p.lifespan > 0]
+
+        self.check_collisions()
+        self.commands.flush(self) # Sync point: everything spawned by collisions
+
+        if (self.game_state == "PLAYING" and not self.asteroids and not self.ufos and not self.hunter_mines
+                and self.level_clear_timer == 0 and self.warning_timer == 0):
+            self.level_clear_timer = 120
+
+    def swept_collide(self, targets, movers, collided, kill_targets=False, kill_movers=False, margin=1):
+        """ Broad-phase for swept collisions. Every mover's swept rect is matched against every
+        target's swept rect in one collidelistall call, and only those candidates get the
+        (more expensive) swept narrow-phase test. Returns {target: [movers]} like groupcollide. """
+        hits = {}
+        movers = list(movers)
+        if not movers:
+            return hits
+        mover_rects = [swept_rect(mover, margin) for mover in movers]
+        for target in list(targets):
+            for i in swept_rect(target, margin).collidelistall(mover_rects):
+                if collided(movers[i], target):
+                    hits.setdefault(target, []).append(movers[i])
+        for target, movers_hit in hits.items():
+            if kill_targets: target.kill()
+            if kill_movers:
+                for mover in movers_hit: mover.kill()
+        return hits
+
+    def run_summary(self):
+        """ The finished (or current) run as one record: what RunHistory stores """
+        return {
+            "ship": self.player.ship_type,
+            "score": self.player.score,
+            "level": self.level,
+            "duration_s": self.run_frames / FPS,
+            "flow_states": self.player.flow_states,
+            "cause": self.death_cause,
+        }
+
+    def player_hit(self, cause):
+        """ Something reached the player: effects, then a life (or the run) is lost unless protected """
+        if self.game_state != "PLAYING":
+            return # A fatal hit earlier in this check_collisions already ended the run
+        self.screen_shake_timer = 20
+        self.create_explosion(self.player.x, self.player.y, 30, [RED, ORANGE, WHITE], trigger_glitch=True, create_shockwave=True)
+        hit_occured, is_fatal = self.player.hit(cause)
+        if hit_occured:
+            self.create_player_debris()
+            if is_fatal:
+                self.death_cause = cause
+                if self.telemetry is not None:
+                    summary = self.run_summary()
+                    self.telemetry.emit("run_end", *(summary[field] for field in EVENTS["run_end"]))
+                self.game_state = "GAME_OVER"
+                self.on_game_over()
+
+    def check_collisions(self):
+        # --- Player Bullets vs Asteroids ---
+        asteroid_hits = self.swept_collide(self.asteroids, self.bullets,
+                                           lambda bullet, asteroid: swept_circle_collision(bullet, asteroid, asteroid.radius + 2),
+                                           kill_movers=True)
+        for asteroid, bullets_hit in asteroid_hits.items():
+            is_laser = bullets_hit[0].is_laser
+            asteroid.hit_flash_timer = 5
+
+            if is_laser:
+                asteroid.health = 0
+            else:
+                asteroid.health -= 1
+
+            if asteroid.health <= 0:
+                asteroid.kill()
+                if self.telemetry is not None:
+                    self.telemetry.emit("kill", ASTEROID_SIZE_NAMES.get(asteroid.size, "asteroid"), asteroid.x, asteroid.y, is_laser)
+                self.screen_shake_timer = 8
+                score = 0
+                if asteroid.size == ASTEROID_LARGE_SIZE:
+                    score = SCORE_LARGE_ASTEROID
+                    self.create_explosion(asteroid.x, asteroid.y, 20, [WHITE, GREY], create_shockwave=True, create_debris=True)
+                elif asteroid.size == ASTEROID_MEDIUM_SIZE:
+                    score = SCORE_MEDIUM_ASTEROID
+                    self.create_explosion(asteroid.x, asteroid.y, 10, [WHITE, GREY], create_debris=True)
+                    if random.random() < POWERUP_DROP_CHANCE_MEDIUM:
+                        powerup = PowerUp(asteroid.x, asteroid.y, "triple_shot")
+                        self.commands.spawn(powerup, self.powerups, self.all_sprites)
+                else:
+                    score = SCORE_SMALL_ASTEROID
+                    self.create_explosion(asteroid.x, asteroid.y, 5, [GREY])
+                    if random.random() < POWERUP_DROP_CHANCE_SMALL:
+                        powerup = PowerUp(asteroid.x, asteroid.y, "shield")
+                        self.commands.spawn(powerup, self.powerups, self.all_sprites)
+
+                final_score = self.player.add_score(score, self.sounds)
+                self.commands.spawn(FloatingText(asteroid.x, asteroid.y, f"+{final_score}", WHITE), self.floating_texts)
+                new_asteroids = asteroid.split()
+                for new_ast in new_asteroids:
+                    self.commands.spawn(new_ast, self.all_sprites, self.asteroids)
+            else:
+                # Asteroid was hit but not destroyed
+                self.screen_shake_timer = 3
+                self.create_explosion(bullets_hit[0].x, bullets_hit[0].y, 3, [GREY], create_debris=True)
+
+        # --- Player vs Asteroids ---
+        if self.player.invulnerable_timer == 0 and self.player.near_miss_cooldown == 0:
+            for asteroid in self.asteroids:
+                dist = get_distance((self.player.x, self.player.y), (asteroid.x, asteroid.y))
+                # Swept so a dash can't tunnel through small rocks
+                if swept_circle_collision(self.player, asteroid, asteroid.radius + self.player.size * 0.5):
+                    self.player_hit("asteroid")
+                    break
+                elif dist < (asteroid.radius + ASTEROID_NEAR_MISS_RADIUS):
+                    self.player.score += SCORE_NEAR_MISS
+                    self.player.near_miss_cooldown = PLAYER_NEAR_MISS_COOLDOWN
+                    if self.telemetry is not None:
+                        self.telemetry.emit("near_miss", self.player.x, self.player.y, SCORE_NEAR_MISS)
+                    self.commands.spawn(FloatingText(self.player.x, self.player.y - 15, f"+{SCORE_NEAR_MISS}", CYAN), self.floating_texts)
+
+        # --- Player vs Powerups ---
+        player_powerup_hits = list(self.swept_collide(self.powerups, [self.player],
+                                                      lambda player, powerup: swept_circle_collision(player, powerup, collide_radius(player, 0.8) + collide_radius(powerup, 0.8)),
+                                                      kill_targets=True, margin=4))
+        for powerup in player_powerup_hits:
+            self.player.add_powerup(powerup.type)
+            if self.telemetry is not None:
+                self.telemetry.emit("pickup", powerup.type, powerup.x, powerup.y)
+            color = GREEN_SHIELD if powerup.type == "shield" else BLUE_POWERUP
+            self.create_explosion(powerup.x, powerup.y, 15, [color, WHITE])
+            self.commands.spawn(Shockwave(powerup.x, powerup.y, max_radius=40, lifespan=20, width=2), self.shockwaves)
+
+        # --- Player Bullets vs UFO ---
+        ufo_hits = self.swept_collide(self.ufos, self.bullets, swept_rect_collision, kill_movers=True)
+        for ufo, bullets_hit in ufo_hits.items():
+            if bullets_hit[0].is_laser: ufo.health = 0
+            else: ufo.health -= 1
+            ufo.hit_flash_timer = 5
+            if ufo.health <= 0:
+                ufo.kill()
+                score = SCORE_UFO
+                if isinstance(ufo, UFOElite):
+                    score = SCORE_ELITE_UFO
+                if self.telemetry is not None:
+                    self.telemetry.emit("kill", "ufo_elite" if isinstance(ufo, UFOElite) else "ufo", ufo.x, ufo.y, bullets_hit[0].is_laser)
+                final_score = self.player.add_score(score, self.sounds)
+                self.commands.spawn(FloatingText(ufo.x, ufo.y, f"+{final_score}", PURPLE), self.floating_texts)
+                self.create_explosion(ufo.x, ufo.y, 25, [PURPLE, WHITE], trigger_glitch=True, create_shockwave=True, create_debris=True)
+                self.screen_shake_timer = 15
+
+        # --- Player Bullets vs Hunter Mines ---
+        mine_hits = self.swept_collide(self.hunter_mines, self.bullets, swept_rect_collision, kill_targets=True, kill_movers=True)
+        for mine, bullets_hit in mine_hits.items():
+            if self.telemetry is not None:
+                self.telemetry.emit("kill", "hunter_mine", mine.x, mine.y, bullets_hit[0].is_laser)
+            final_score = self.player.add_score(SCORE_HUNTER_MINE, self.sounds)
+            self.commands.spawn(FloatingText(mine.x, mine.y, f"+{final_score}", PURPLE), self.floating_texts)
+            self.create_explosion(mine.x, mine.y, 15, [PURPLE, RED], create_debris=True)
+            self.screen_shake_timer = 10
+
+        # --- Enemy Bullets vs Player ---
+        if self.player.invulnerable_timer == 0:
+            enemy_bullet_hits = list(self.swept_collide(self.enemy_bullets, [self.player],
+                                                        lambda player, bullet: swept_circle_collision(player, bullet, collide_radius(player, 0.7) + collide_radius(bullet, 0.7)),
+                                                        kill_targets=True))
+            if enemy_bullet_hits:
+                self.player_hit("enemy_bullet")
+
+        # --- Player vs UFO ---
+        if self.player.invulnerable_timer == 0:
+            player_ufo_hits = list(self.swept_collide(self.ufos, [self.player],
+                                                      lambda player, ufo: swept_rect_collision(player, ufo, 0.8),
+                                                      kill_targets=True))
+            if player_ufo_hits:
+                self.player_hit("ufo")
+
+        # --- Player vs Hunter Mines ---
+        if self.player.invulnerable_timer == 0:
+            player_mine_hits = list(self.swept_collide(self.hunter_mines, [self.player],
+                                                       lambda player, mine: swept_circle_collision(player, mine, collide_radius(player, 0.8) + collide_radius(mine, 0.8)),
+                                                       kill_targets=True, margin=4))
+            if player_mine_hits:
+                self.player_hit("hunter_mine")
@@ -0,0 +1,206 @@
+"""
+Gymnasium-style training environment around the astro simulation core.
+
+    env = AstroEnv()                      # feature-vector observations
+    obs, info = env.reset(seed=1)
+    obs, reward, terminated, truncated, info = env.step((1, -1, 1, 0, 0))
+
+Actions are (thrust, turn, shoot, dash, hyperspace): thrust/shoot/dash/
+hyperspace are 0 or 1, turn is -1 (left), 0 or 1 (right). Shoot, dash and
+hyperspace fire like a key press each step they are set; the game's own
+cooldowns still apply.
+
+obs_type="features" never renders or imports pygame: a step is just
+astro.world.World. Its observation is a float32 vector (player state followed by the nearest
+asteroids, mines, UFOs and enemy bullets, see FEATURE_SIZE).
+
+obs_type="pixels" draws the playfield once per step with an astro.render
+Renderer. Its game surface is backed by a NumPy array owned by the env, so the observation is a strided
+view into the rendered frame (every downsample-th pixel, RGB) with no copy.
+A surfarray view would lock the surface and stop the next frame's blits.
+The array is laid out BGRA to match the display format: any other channel
+order drops SDL onto its slow per-pixel blitters (~15x slower here).
+
+Both observations are reused buffers: they are overwritten by the next
+step/reset, so copy them if you need to keep one.
+
+The reward is the score gained this step (add_score and near misses) minus
+HIT_PENALTY for every hit the player registers. An episode terminates on
+GAME_OVER and is truncated after max_steps.
+
+The env never opens a window, plays audio or touches the save files. Pixel
+envs point SDL at the dummy video driver unless one was already chosen.
+"""
+import math
+import os
+import random
+
+import numpy as np
+
+from astro.config import (SCREEN_WIDTH, SCREEN_HEIGHT, ASTEROID_LARGE_SIZE, PLAYER_DASH_COOLDOWN,
+                          PLAYER_HYPERSPACE_COOLDOWN, FLOW_STATE_TRIGGER)
+from astro.world import World
+
+# --- Env Config ---
+HIT_PENALTY = 500
+MAX_EPISODE_STEPS = 60 * 60 * 5 # 5 minutes of game time
+ACTION_SIZE = 5 # thrust, turn, shoot, dash, hyperspace
+
+# Nearest-N entities per group in the feature vector
+NEAREST_ASTEROIDS = 8
+NEAREST_MINES = 2
+NEAREST_UFOS = 2
+NEAREST_ENEMY_BULLETS = 6
+
+PLAYER_FEATURES = 13
+ENTITY_FEATURES = 6 # present, dx, dy, vel_x, vel_y, size
+FEATURE_SIZE = PLAYER_FEATURES + ENTITY_FEATURES * (
+    NEAREST_ASTEROIDS + NEAREST_MINES + NEAREST_UFOS + NEAREST_ENEMY_BULLETS)
+
+# Rough scales that keep features around [-1, 1]
+POSITION_SCALE = float(max(SCREEN_WIDTH, SCREEN_HEIGHT))
+VELOCITY_SCALE = 10.0
+SIZE_SCALE = float(ASTEROID_LARGE_SIZE)
+
+OBS_TYPES = ("features", "pixels")
+
+
+class AstroEnv:
+    """ One World per env; reset/step follow the gymnasium API without depending on it """
+
+    def __init__(self, obs_type="features", downsample=4, ship_type="Cruiser",
+                 frame_skip=1, max_steps=MAX_EPISODE_STEPS, skip_countdown=True):
+        if obs_type not in OBS_TYPES:
+            raise ValueError(f"obs_type must be one of {OBS_TYPES}, got {obs_type!r}")
+        if downsample < 1 or frame_skip < 1:
+            raise ValueError("downsample and frame_skip must be >= 1")
+
+        self.obs_type = obs_type
+        self.downsample = downsample
+        self.ship_type = ship_type
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.skip_countdown = skip_countdown
+
+        self.game = World()
+        self.renderer = None
+        self.steps = 0
+
+        if obs_type == "pixels":
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            import pygame
+            from astro.render import Renderer
+
+            # The renderer draws straight into this array; the observation is a view of it
+            self.frame = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH, 4), dtype=np.uint8)
+            surface = pygame.image.frombuffer(self.frame, (SCREEN_WIDTH, SCREEN_HEIGHT), "BGRA")
+            self.renderer = Renderer(self.game, surface)
+            self.observation = self.frame[::downsample, ::downsample, 2::-1]
+        else:
+            self.observation = np.zeros(FEATURE_SIZE, dtype=np.float32)
+
+    @property
+    def observation_shape(self):
+        return self.observation.shape
+
+    def reset(self, seed=None, options=None):
+        """ Starts a new run. Returns (observation, info) """
+        if seed is not None:
+            random.seed(seed)
+        ship_type = (options or {}).get("ship_type", self.ship_type)
+        self.game.start_new_game(ship_type)
+        if self.skip_countdown:
+            self.game.game_start_timer = 0
+        self.game.controls.set(False, False, False)
+        self.steps = 0
+        return self.observe(), self.get_info()
+
+    def step(self, action):
+        """ Applies action for frame_skip simulation steps.
+        Returns (observation, reward, terminated, truncated, info) """
+        game = self.game
+        thrust, turn, shoot, dash, hyperspace = action
+
+        game.controls.set(turn < 0, turn > 0, bool(thrust))
+
+        score_before = game.player.score
+        hits_before = game.player.hits_taken
+
+        for i in range(self.frame_skip):
+            if game.game_state != "PLAYING":
+                break
+            # Same gate as handle_events: no actions during the level clear banner
+            if i == 0 and game.level_clear_timer == 0:
+                if shoot: game.player_shoot()
+                if dash: game.player_dash()
+                if hyperspace: game.player_hyperspace()
+            game.update()
+            self.steps += 1
+
+        reward = (game.player.score - score_before) - HIT_PENALTY * (game.player.hits_taken - hits_before)
+        terminated = game.game_state == "GAME_OVER"
+        truncated = not terminated and self.steps >= self.max_steps
+        return self.observe(), float(reward), terminated, truncated, self.get_info()
+
+    def observe(self):
+        if self.obs_type == "pixels":
+            if self.game.game_state == "PLAYING":
+                self.renderer.render_playfield()
+        else:
+            self.fill_features()
+        return self.observation
+
+    def fill_features(self):
+        """ Writes the feature vector into the preallocated observation in place """
+        obs = self.observation
+        player = self.game.player
+        obs[0] = player.x / SCREEN_WIDTH
+        obs[1] = player.y / SCREEN_HEIGHT
+        obs[2] = player.vel_x / VELOCITY_SCALE
+        obs[3] = player.vel_y / VELOCITY_SCALE
+        rad = math.radians(player.angle)
+        obs[4] = math.cos(rad)
+        obs[5] = math.sin(rad)
+        obs[6] = player.shoot_cooldown / player.stats["shoot_cooldown"]
+        obs[7] = player.dash_cooldown / PLAYER_DASH_COOLDOWN
+        obs[8] = player.hyperspace_cooldown / PLAYER_HYPERSPACE_COOLDOWN
+        obs[9] = 1.0 if player.invulnerable_timer > 0 else 0.0
+        obs[10] = player.lives / 5.0
+        obs[11] = player.flow_level / FLOW_STATE_TRIGGER
+        obs[12] = 1.0 if player.flow_state_timer > 0 else 0.0
+
+        offset = PLAYER_FEATURES
+        for group, count in ((self.game.asteroids, NEAREST_ASTEROIDS),
+                             (self.game.hunter_mines, NEAREST_MINES),
+                             (self.game.ufos, NEAREST_UFOS),
+                             (self.game.enemy_bullets, NEAREST_ENEMY_BULLETS)):
+            offset = self.fill_nearest(obs, offset, group, count, player.x, player.y)
+
+    def fill_nearest(self, obs, offset, group, count, px, py):
+        """ Relative state of the count nearest sprites in group; missing slots are zeroed """
+        nearest = sorted(group, key=lambda s: (s.x - px) ** 2 + (s.y - py) ** 2)[:count]
+        end = offset + count * ENTITY_FEATURES
+        obs[offset:end] = 0.0
+        for sprite in nearest:
+            obs[offset] = 1.0
+            obs[offset + 1] = (sprite.x - px) / POSITION_SCALE
+            obs[offset + 2] = (sprite.y - py) / POSITION_SCALE
+            obs[offset + 3] = getattr(sprite, "vel_x", 0.0) / VELOCITY_SCALE
+            obs[offset + 4] = getattr(sprite, "vel_y", 0.0) / VELOCITY_SCALE
+            obs[offset + 5] = getattr(sprite, "size", 0) / SIZE_SCALE
+            offset += ENTITY_FEATURES
+        return end
+
+    def get_info(self):
+        game = self.game
+        return {
+            "score": game.player.score,
+            "level": game.level,
+            "lives": game.player.lives,
+            "steps": self.steps,
+        }
+
+    def close(self):
+        if self.renderer is not None:
+            import pygame
+            pygame.quit()
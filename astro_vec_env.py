@@ -0,0 +1,300 @@
+"""
+Runs K AstroEnv instances in worker processes so experience collection
+uses every core.
+
+    vec = AstroVecEnv(8)                         # features, lockstep
+    obs, infos = vec.reset(seed=0)
+    obs, rewards, terminated, truncated, infos = vec.step(actions)
+    vec.close()
+
+Actions, observations, rewards and done flags live in
+multiprocessing.shared_memory blocks. Workers read their action row and
+write their observation row in place; the pipes only carry a short command
+and an acknowledgement, so frames are never pickled.
+
+step() is lockstep: every env advances once and the call returns when all
+have finished. For asynchronous stepping use step_async(actions, env_ids)
+and step_wait(), which returns whichever envs have finished so far; read
+their rows from observations/rewards/terminated/truncated.
+
+Envs reset themselves when an episode ends: the row then holds the first
+observation of the next episode, and that env's info carries the finished
+episode under "episode".
+
+The arrays returned are the shared buffers themselves and are overwritten
+by the next step; copy what you need to keep.
+
+    python astro_vec_env.py --num-envs 8 --steps 20000 --mode async
+
+runs random actions and reports environment steps per second.
+"""
+import argparse
+import multiprocessing
+import random
+import time
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+
+import numpy as np
+
+import astro_env
+from astro.config import SCREEN_WIDTH, SCREEN_HEIGHT
+
+# --- Worker Commands ---
+CMD_RESET = "reset"
+CMD_STEP = "step"
+CMD_CLOSE = "close"
+
+
+class SharedArray:
+    """ NumPy array over a named shared memory block """
+    def __init__(self, shape, dtype, name=None):
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+        self.spec = (tuple(shape), dtype.str, self.shm.name)
+
+    @classmethod
+    def attach(cls, spec):
+        shape, dtype, name = spec
+        return cls(shape, dtype, name)
+
+    def close(self):
+        """ Detaches; only the creating process unlinks the block """
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def observation_spec(obs_type, downsample):
+    """ Shape and dtype of one env's observation, without starting a World """
+    if obs_type == "pixels":
+        height = len(range(0, SCREEN_HEIGHT, downsample))
+        width = len(range(0, SCREEN_WIDTH, downsample))
+        return (height, width, 3), np.uint8
+    return (astro_env.FEATURE_SIZE,), np.float32
+
+
+def worker(index, conn, specs, env_kwargs):
+    """ Worker process loop: one AstroEnv stepping against its rows of the shared arrays """
+    buffers = {key: SharedArray.attach(spec) for key, spec in specs.items()}
+    obs = buffers["observations"].array[index]
+    actions = buffers["actions"].array
+    rewards = buffers["rewards"].array
+    terminated = buffers["terminated"].array
+    truncated = buffers["truncated"].array
+    env = astro_env.AstroEnv(**env_kwargs)
+    episode_return = 0.0
+
+    try:
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == CMD_STEP:
+                observation, reward, term, trunc, info = env.step(actions[index])
+                episode_return += reward
+                if term or trunc:
+                    info["episode"] = {"return": episode_return, "score": info["score"],
+                                       "level": info["level"], "length": info["steps"]}
+                    episode_return = 0.0
+                    observation, reset_info = env.reset()
+                    info.update(reset_info)
+                obs[...] = observation
+                rewards[index] = reward
+                terminated[index] = term
+                truncated[index] = trunc
+                conn.send(info)
+            elif cmd == CMD_RESET:
+                observation, info = env.reset(seed=arg)
+                episode_return = 0.0
+                obs[...] = observation
+                rewards[index] = 0.0
+                terminated[index] = False
+                truncated[index] = False
+                conn.send(info)
+            elif cmd == CMD_CLOSE:
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        obs = actions = rewards = terminated = truncated = None
+        for buffer in buffers.values():
+            buffer.close()
+        conn.close()
+
+
+class AstroVecEnv:
+    """ K AstroEnvs in worker processes, sharing observation/reward/action buffers """
+
+    def __init__(self, num_envs, obs_type="features", downsample=4, start_method="spawn", **env_kwargs):
+        if num_envs < 1:
+            raise ValueError("num_envs must be >= 1")
+        self.num_envs = num_envs
+        obs_shape, obs_dtype = observation_spec(obs_type, downsample)
+
+        self.buffers = {
+            "observations": SharedArray((num_envs,) + obs_shape, obs_dtype),
+            "actions": SharedArray((num_envs, astro_env.ACTION_SIZE), np.int8),
+            "rewards": SharedArray((num_envs,), np.float32),
+            "terminated": SharedArray((num_envs,), np.bool_),
+            "truncated": SharedArray((num_envs,), np.bool_),
+        }
+        self.observations = self.buffers["observations"].array
+        self.actions = self.buffers["actions"].array
+        self.rewards = self.buffers["rewards"].array
+        self.terminated = self.buffers["terminated"].array
+        self.truncated = self.buffers["truncated"].array
+        self.infos = [{} for _ in range(num_envs)]
+
+        # spawn by default: workers must not inherit the parent's SDL state
+        ctx = multiprocessing.get_context(start_method)
+        specs = {key: buffer.spec for key, buffer in self.buffers.items()}
+        env_kwargs = dict(env_kwargs, obs_type=obs_type, downsample=downsample)
+        self.conns = []
+        self.processes = []
+        for index in range(num_envs):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(target=worker, args=(index, child_conn, specs, env_kwargs), daemon=True)
+            process.start()
+            child_conn.close()
+            self.conns.append(parent_conn)
+            self.processes.append(process)
+
+        self.pending = set()
+        self.closed = False
+        self.total_steps = 0
+        self.start_time = None
+
+    def reset(self, seed=None):
+        """ Resets every env (env i gets seed + i). Returns (observations, infos) """
+        self.step_wait()
+        for index, conn in enumerate(self.conns):
+            conn.send((CMD_RESET, None if seed is None else seed + index))
+        for index, conn in enumerate(self.conns):
+            self.infos[index] = conn.recv()
+        self.start_time = time.perf_counter()
+        self.total_steps = 0
+        return self.observations, self.infos
+
+    def step(self, actions):
+        """ Lockstep: advances every env once.
+        Returns (observations, rewards, terminated, truncated, infos) """
+        self.step_async(actions)
+        self.step_wait()
+        return self.observations, self.rewards, self.terminated, self.truncated, self.infos
+
+    def step_async(self, actions, env_ids=None):
+        """ Starts a step on env_ids (default: all) without waiting for it """
+        if env_ids is None:
+            env_ids = range(self.num_envs)
+        actions = np.asarray(actions)
+        for row, index in enumerate(env_ids):
+            if index in self.pending:
+                raise RuntimeError(f"env {index} is still stepping; call step_wait first")
+            self.actions[index] = actions[row] if actions.ndim > 1 else actions
+            self.conns[index].send((CMD_STEP, None))
+            self.pending.add(index)
+
+    def step_wait(self, min_ready=None, timeout=None):
+        """ Waits until at least min_ready pending envs (default: all of them) have
+        finished stepping. Returns the ids that finished """
+        if min_ready is None:
+            min_ready = len(self.pending)
+        ready = []
+        while self.pending and len(ready) < min_ready:
+            conns = wait([self.conns[index] for index in self.pending], timeout)
+            if not conns:
+                break
+            for conn in conns:
+                index = self.conns.index(conn)
+                self.infos[index] = conn.recv()
+                self.pending.discard(index)
+                ready.append(index)
+        self.total_steps += len(ready)
+        return ready
+
+    def get_stats(self):
+        """ Environment steps taken since the last reset and steps/sec """
+        elapsed = time.perf_counter() - self.start_time if self.start_time else 0.0
+        return {
+            "num_envs": self.num_envs,
+            "steps": self.total_steps,
+            "elapsed_s": elapsed,
+            "steps_per_sec": self.total_steps / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for index in list(self.pending):
+            try:
+                self.conns[index].recv()
+            except EOFError:
+                pass
+        self.pending.clear()
+        for conn in self.conns:
+            try:
+                conn.send((CMD_CLOSE, None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self.conns:
+            conn.close()
+        self.observations = self.actions = self.rewards = self.terminated = self.truncated = None
+        for buffer in self.buffers.values():
+            buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def random_actions(count):
+    return [(random.randint(0, 1), random.randint(-1, 1), random.randint(0, 1),
+             random.random() < 0.02, random.random() < 0.005) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized AstroEnv throughput check (random actions)")
+    parser.add_argument("--num-envs", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--steps", type=int, default=20000, help="total environment steps across all envs")
+    parser.add_argument("--mode", choices=("lockstep", "async"), default="lockstep")
+    parser.add_argument("--obs", choices=astro_env.OBS_TYPES, default="features")
+    parser.add_argument("--downsample", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    episodes = []
+    with AstroVecEnv(args.num_envs, obs_type=args.obs, downsample=args.downsample) as vec:
+        vec.reset(seed=args.seed)
+        if args.mode == "lockstep":
+            while vec.total_steps < args.steps:
+                vec.step(random_actions(vec.num_envs))
+                episodes.extend(info["episode"] for info in vec.infos if "episode" in info)
+        else:
+            vec.step_async(random_actions(vec.num_envs))
+            while vec.total_steps < args.steps:
+                ready = vec.step_wait(min_ready=1)
+                episodes.extend(vec.infos[i]["episode"] for i in ready if "episode" in vec.infos[i])
+                vec.step_async(random_actions(len(ready)), ready)
+        vec.step_wait()
+        stats = vec.get_stats()
+
+    print(f"{stats['num_envs']} envs ({args.mode}, {args.obs}): {stats['steps']} steps "
+          f"in {stats['elapsed_s']:.2f}s = {stats['steps_per_sec']:.0f} steps/s")
+    if episodes:
+        mean_score = sum(e["score"] for e in episodes) / len(episodes)
+        print(f"{len(episodes)} episodes finished, mean score {mean_score:.0f}")
+
+
+if __name__ == "__main__":
+    main()
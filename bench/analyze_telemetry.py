@@ -0,0 +1,349 @@
+"""
+Offline analysis of --telemetry event files (astro/telemetry.py).
+
+Files are streamed line by line through generators, so input size is bounded by
+disk, not memory: each file is reduced to a small Summary (fixed-size NumPy
+histograms, counters and a few numbers per run), and the summaries of all files
+are merged. With --workers N the files are reduced across a process pool.
+
+Reports:
+  * death and near-miss heatmaps: 2D histograms over the playfield, written as
+    PNGs with --png-dir
+  * per-level survival: of the runs that reached a level, how many were still
+    alive 15/30/60 s into it (Kaplan-Meier, so runs that were quit or cleared
+    the level count as survivors up to that point), and the median time to death
+  * HYPERFLOW: activations, how long they lasted, how many a hit cut short and
+    the share of the score earned while one was active
+
+    python bench/analyze_telemetry.py telemetry/
+    python bench/analyze_telemetry.py telemetry/ archive/*.jsonl.gz --workers 8 --png-dir heatmaps --json report.json
+"""
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from collections import Counter
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from astro import config  # noqa: E402
+
+HISTOGRAM_CHUNK = 65536 # Positions buffered before they are binned
+SURVIVAL_CHECKPOINTS = (15, 30, 60) # Seconds into a level reported in the table
+
+
+# --- Streaming ---
+def event_files(paths):
+    """ Files to read: each argument is a file or a directory of event files, in name order """
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith((".jsonl.gz", ".jsonl")):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def read_lines(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    try:
+        with opener(path, "rt") as f:
+            yield from f
+    except (EOFError, zlib.error): # The file of a session that crashed ends mid-stream
+        print(f"Warning: {os.path.basename(path)} is truncated, using the events before the damage.")
+
+
+def parse_events(lines):
+    for line in lines:
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue # A partly written last line
+
+
+def session_of(path):
+    """ events-<session>-<n>.jsonl.gz -> events-<session>: run numbers restart per session """
+    name = os.path.basename(path).split(".")[0]
+    base, _, index = name.rpartition("-")
+    return base if base and index.isdigit() else name
+
+
+# --- Aggregation ---
+class PositionHistogram:
+    """ 2D histogram over the playfield, filled in chunks so memory stays constant """
+    def __init__(self, bin_size):
+        self.x_edges = np.arange(0, config.SCREEN_WIDTH + bin_size, bin_size)
+        self.y_edges = np.arange(0, config.SCREEN_HEIGHT + bin_size, bin_size)
+        self.counts = np.zeros((len(self.x_edges) - 1, len(self.y_edges) - 1), dtype=np.int64)
+        self.xs = []
+        self.ys = []
+
+    def add(self, x, y):
+        self.xs.append(x)
+        self.ys.append(y)
+        if len(self.xs) >= HISTOGRAM_CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self.xs:
+            counts, _, _ = np.histogram2d(self.xs, self.ys, bins=(self.x_edges, self.y_edges))
+            self.counts += counts.astype(np.int64)
+            self.xs.clear()
+            self.ys.clear()
+
+    def merge(self, other):
+        self.flush()
+        other.flush()
+        self.counts += other.counts
+
+
+class Summary:
+    """ Everything the report needs from a set of events. Summaries of different files merge
+    exactly, including runs that were split across files by rotation """
+    def __init__(self, bin_size):
+        self.events = Counter()
+        self.deaths = PositionHistogram(bin_size)
+        self.near_misses = PositionHistogram(bin_size)
+        self.hits_by_cause = Counter()
+        self.deaths_by_cause = Counter()
+        self.flow_frames = Counter() # HYPERFLOW duration in frames -> count
+        self.flow_end_reasons = Counter()
+        self.flow_score = 0
+        self.total_score = 0
+        self.runs = {} # (session, run) -> {"levels": {level: first frame}, "last_frame", "death"}
+
+    def run(self, key):
+        if key not in self.runs:
+            self.runs[key] = {"levels": {}, "last_frame": 0, "death": None}
+        return self.runs[key]
+
+    def feed(self, session, events):
+        for event in events:
+            kind = event.get("ev")
+            self.events[kind] += 1
+            run = self.run((session, event.get("run", 0)))
+            frame = event.get("frame", 0)
+            run["last_frame"] = max(run["last_frame"], frame)
+            if kind == "wave":
+                run["levels"].setdefault(event["level"], frame)
+            elif kind == "hit":
+                self.hits_by_cause[event["cause"]] += 1
+                if event["fatal"]:
+                    self.deaths.add(event["x"], event["y"])
+                    self.deaths_by_cause[event["cause"]] += 1
+                    run["death"] = frame
+            elif kind == "near_miss":
+                self.near_misses.add(event["x"], event["y"])
+            elif kind == "score":
+                self.total_score += event["final"]
+                if event["flow_state"]:
+                    self.flow_score += event["final"]
+            elif kind == "flow_end":
+                self.flow_frames[event["frames"]] += 1
+                self.flow_end_reasons[event["reason"]] += 1
+        return self
+
+    def merge(self, other):
+        self.events += other.events
+        self.deaths.merge(other.deaths)
+        self.near_misses.merge(other.near_misses)
+        self.hits_by_cause += other.hits_by_cause
+        self.deaths_by_cause += other.deaths_by_cause
+        self.flow_frames += other.flow_frames
+        self.flow_end_reasons += other.flow_end_reasons
+        self.flow_score += other.flow_score
+        self.total_score += other.total_score
+        for key, part in other.runs.items():
+            run = self.run(key)
+            for level, frame in part["levels"].items():
+                run["levels"][level] = min(frame, run["levels"].get(level, frame))
+            run["last_frame"] = max(run["last_frame"], part["last_frame"])
+            if part["death"] is not None:
+                run["death"] = part["death"]
+        return self
+
+
+def analyze_file(task):
+    """ One file -> its Summary. Runs in a pool worker with --workers """
+    path, bin_size = task
+    summary = Summary(bin_size).feed(session_of(path), parse_events(read_lines(path)))
+    summary.deaths.flush()
+    summary.near_misses.flush()
+    return summary
+
+
+# --- Survival ---
+def level_spans(runs):
+    """ level -> [(frames spent in it, died there)] over every run that reached it """
+    spans = {}
+    for run in runs.values():
+        levels = sorted(run["levels"].items())
+        for i, (level, start) in enumerate(levels):
+            if i + 1 < len(levels):
+                end, died = levels[i + 1][1], False # Cleared it
+            elif run["death"] is not None:
+                end, died = run["death"], True
+            else:
+                end, died = run["last_frame"], False # Quit, or the log ends here
+            spans.setdefault(level, []).append((max(0, end - start), died))
+    return spans
+
+
+def kaplan_meier(spans):
+    """ [(frames, died)] -> [(seconds, fraction still alive)] at every death time """
+    spans = sorted(spans)
+    at_risk = len(spans)
+    alive = 1.0
+    curve = [(0.0, 1.0)]
+    i = 0
+    while i < len(spans):
+        frames = spans[i][0]
+        deaths = leaving = 0
+        while i < len(spans) and spans[i][0] == frames:
+            deaths += spans[i][1]
+            leaving += 1
+            i += 1
+        if deaths:
+            alive *= 1.0 - deaths / at_risk
+            curve.append((frames / config.FPS, alive))
+        at_risk -= leaving
+    return curve
+
+
+def survival_at(curve, seconds):
+    alive = 1.0
+    for t, value in curve:
+        if t > seconds:
+            break
+        alive = value
+    return alive
+
+
+def median_survival(curve):
+    for t, value in curve:
+        if value <= 0.5:
+            return t
+    return None # Over half survived every recorded span
+
+
+# --- Heatmap export ---
+def heatmap_rgb(counts):
+    """ Log-scaled counts -> RGB array in the game's palette, background to yellow """
+    stops = np.array([0.0, 0.35, 0.7, 1.0])
+    colors = np.array([config.BACKGROUND_COLOR, config.PURPLE, config.ORANGE, config.YELLOW], dtype=float)
+    scaled = np.log1p(counts.astype(float))
+    if scaled.max() > 0:
+        scaled /= scaled.max()
+    return np.stack([np.interp(scaled, stops, colors[:, c]) for c in range(3)], axis=-1).astype(np.uint8)
+
+
+def save_heatmap(counts, path):
+    """ Writes counts (indexed [x bin, y bin], like pygame.surfarray) as a playfield-sized PNG """
+    import pygame # Only needed for the PNGs
+    surface = pygame.surfarray.make_surface(heatmap_rgb(counts))
+    pygame.image.save(pygame.transform.scale(surface, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)), path)
+
+
+# --- Report ---
+def hotspots(histogram, bin_size, top=3):
+    counts = histogram.counts
+    cells = np.argsort(counts, axis=None)[::-1][:top]
+    return [(int(x) * bin_size, int(y) * bin_size, int(counts[x, y]))
+            for x, y in zip(*np.unravel_index(cells, counts.shape)) if counts[x, y] > 0]
+
+
+def print_report(summary, bin_size):
+    total_events = sum(summary.events.values())
+    ended = sum(run["death"] is not None for run in summary.runs.values())
+    print(f"{total_events} events, {len(summary.runs)} runs ({ended} ended in death)")
+
+    for label, histogram, causes in (("Deaths", summary.deaths, summary.deaths_by_cause),
+                                     ("Near misses", summary.near_misses, None)):
+        print(f"\n{label}: {int(histogram.counts.sum())}")
+        if causes:
+            print("  by cause: " + ", ".join(f"{cause} {count}" for cause, count in causes.most_common()))
+        for x, y, count in hotspots(histogram, bin_size):
+            print(f"  hotspot x {x}-{x + bin_size}, y {y}-{y + bin_size}: {count}")
+
+    print(f"\n{'level':>5}  {'runs':>6}  {'died':>6}  " + "  ".join(f"{f'alive {s}s':>9}" for s in SURVIVAL_CHECKPOINTS) + f"  {'median':>8}")
+    for level, spans in sorted(level_spans(summary.runs).items()):
+        curve = kaplan_meier(spans)
+        median = median_survival(curve)
+        print(f"{level:>5}  {len(spans):>6}  {sum(died for _, died in spans):>6}  "
+              + "  ".join(f"{survival_at(curve, s) * 100:>8.1f}%" for s in SURVIVAL_CHECKPOINTS)
+              + f"  {'-' if median is None else f'{median:.1f}s':>8}")
+
+    activations = sum(summary.flow_frames.values())
+    print(f"\nHYPERFLOW: {summary.events['flow_start']} activations")
+    if activations:
+        durations = np.repeat(np.array(list(summary.flow_frames.keys())), list(summary.flow_frames.values())) / config.FPS
+        cut_short = summary.flow_end_reasons["hit"]
+        print(f"  duration mean {durations.mean():.1f}s, median {np.median(durations):.1f}s, "
+              f"min {durations.min():.1f}s; {cut_short} of {activations} ({cut_short / activations * 100:.0f}%) cut short by a hit")
+    if summary.total_score:
+        print(f"  {summary.flow_score / summary.total_score * 100:.1f}% of the score was earned in HYPERFLOW")
+
+
+def report_json(summary):
+    spans = level_spans(summary.runs)
+    return {
+        "events": dict(summary.events),
+        "runs": len(summary.runs),
+        "deaths_by_cause": dict(summary.deaths_by_cause),
+        "hits_by_cause": dict(summary.hits_by_cause),
+        "survival": {str(level): {"runs": len(level_runs), "curve": kaplan_meier(level_runs)}
+                     for level, level_runs in sorted(spans.items())},
+        "flow": {"activations": summary.events["flow_start"],
+                 "durations_frames": {str(frames): count for frames, count in sorted(summary.flow_frames.items())},
+                 "end_reasons": dict(summary.flow_end_reasons),
+                 "score_share": summary.flow_score / summary.total_score if summary.total_score else 0.0},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze gameplay telemetry")
+    parser.add_argument("paths", nargs="+", help="event files or directories of them")
+    parser.add_argument("--workers", type=int, default=1, help="processes reading files in parallel")
+    parser.add_argument("--bin-size", type=int, default=10, help="heatmap cell size in pixels")
+    parser.add_argument("--png-dir", help="write deaths.png and near_misses.png here")
+    parser.add_argument("--json", metavar="PATH", help="write the full report (survival curves included) as JSON")
+    args = parser.parse_args()
+
+    files = list(event_files(args.paths))
+    if not files:
+        print("Error: no event files found.")
+        return 1
+    start = time.perf_counter()
+    summary = Summary(args.bin_size)
+    tasks = ((path, args.bin_size) for path in files)
+    if args.workers > 1:
+        with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+            for part in pool.imap_unordered(analyze_file, tasks):
+                summary.merge(part)
+    else:
+        for task in tasks:
+            summary.merge(analyze_file(task))
+    print(f"Read {len(files)} files in {time.perf_counter() - start:.2f}s\n")
+
+    print_report(summary, args.bin_size)
+    if args.png_dir:
+        os.makedirs(args.png_dir, exist_ok=True)
+        for name, histogram in (("deaths", summary.deaths), ("near_misses", summary.near_misses)):
+            save_heatmap(histogram.counts, os.path.join(args.png_dir, f"{name}.png"))
+        print(f"\nHeatmaps written to {args.png_dir}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report_json(summary), f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
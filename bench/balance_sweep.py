@@ -0,0 +1,255 @@
+"""
+Parallel balance sweep over ship stats and difficulty constants.
+
+Each configuration in the parameter grid plays --games seeded runs of the
+bare simulation core (astro.world.World: no pygame, no drawing) with an
+aiming bot across a process pool.
+Every finished run is appended to --out as one JSON line the moment it
+arrives. The summary keeps running totals per configuration, so sweep size
+is bounded by disk, not memory.
+
+Parameters are astro.config constant names. Ship stats use SHIP_STATS.<ship>.<stat>:
+
+    python bench/balance_sweep.py --param ASTEROID_SPEED_LEVEL_SCALE=0.08,0.12,0.16 \\
+        --param SHIP_STATS.Cruiser.thrust=0.18,0.2,0.22 --games 1000 --out sweep.jsonl
+    python bench/balance_sweep.py --grid grid.json --workers 8
+
+A --grid file maps the same names to lists of values. Configurations are
+the cartesian product of all values; game i of every configuration uses
+seed --seed + i, so configurations are compared on identical RNG streams.
+"""
+import argparse
+import copy
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from astro import config  # noqa: E402
+from astro.geometry import get_distance  # noqa: E402
+from astro.world import World  # noqa: E402
+
+SWEEPABLE = ("ASTEROID_SPEED_LEVEL_SCALE", "UFO_SPAWN_TIME_MIN", "UFO_SPAWN_TIME_MAX",
+             "HUNTER_MINE_SPAWN_CHANCE")
+METRICS = ("survival_s", "level", "score", "flow_uptime")
+DEFAULTS = {name: getattr(config, name) for name in SWEEPABLE}
+DEFAULT_SHIP_STATS = copy.deepcopy(config.SHIP_STATS)
+
+
+# --- Parameter Grid ---
+def parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def check_param(name):
+    if name.startswith("SHIP_STATS."):
+        parts = name.split(".")
+        if len(parts) != 3 or parts[1] not in DEFAULT_SHIP_STATS or parts[2] not in DEFAULT_SHIP_STATS[parts[1]]:
+            raise SystemExit(f"Error: unknown ship stat {name!r} (use SHIP_STATS.<ship>.<stat>)")
+    elif name not in SWEEPABLE:
+        raise SystemExit(f"Error: {name!r} is not sweepable. Choose from {', '.join(SWEEPABLE)} or SHIP_STATS.<ship>.<stat>")
+
+
+def build_grid(params, grid_file):
+    grid = {}
+    if grid_file:
+        with open(grid_file) as f:
+            grid.update(json.load(f))
+    for spec in params:
+        name, _, values = spec.partition("=")
+        grid[name] = [parse_value(v) for v in values.split(",") if v]
+    for name in grid:
+        check_param(name)
+    names = sorted(grid)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(grid[n] for n in names))]
+
+
+def apply_config(overrides):
+    """ Restores every sweepable constant, then applies this configuration's overrides.
+    SHIP_STATS is one dict shared by every module, so ship stats are written in place """
+    values = dict(DEFAULTS)
+    for ship, stats in DEFAULT_SHIP_STATS.items():
+        config.SHIP_STATS[ship].update(stats)
+    for name, value in overrides.items():
+        if name.startswith("SHIP_STATS."):
+            _, ship, stat = name.split(".")
+            config.SHIP_STATS[ship][stat] = value
+        else:
+            values[name] = value
+    # UFO timers draw from randint(MIN, MAX); keep the pair valid
+    values["UFO_SPAWN_TIME_MAX"] = max(values["UFO_SPAWN_TIME_MAX"], values["UFO_SPAWN_TIME_MIN"])
+    config.override(**values)
+
+
+# --- Bot ---
+def angle_to(player, target):
+    """ Signed degrees the player must turn to face target (-180..180) """
+    wanted = math.degrees(math.atan2(target.y - player.y, target.x - player.x))
+    return (wanted - player.angle + 180) % 360 - 180
+
+
+def nearest(sprites, player):
+    best, best_dist = None, float("inf")
+    for sprite in sprites:
+        dist = get_distance((player.x, player.y), (sprite.x, sprite.y))
+        if dist < best_dist:
+            best, best_dist = sprite, dist
+    return best, best_dist
+
+
+class AimBot:
+    """ Turns toward the nearest threat, fires when roughly aligned and closes in on far
+    targets. Dashes away from close calls and hyperspaces out of incoming fire when the
+    dash is spent """
+    def act(self, game, frame):
+        player = game.player
+        left = right = thrust = False
+        target, target_dist = nearest(itertools.chain(game.ufos, game.asteroids, game.hunter_mines), player)
+        if target is not None:
+            turn = angle_to(player, target)
+            left = turn < -player.stats["turn_speed"]
+            right = turn > player.stats["turn_speed"]
+            if abs(turn) < 15:
+                game.player_shoot()
+                thrust = target_dist > 250 # Close in on far targets
+        else:
+            thrust = (frame // 60) % 2 == 0 # Nothing to shoot: drift so the level clear isn't stalled
+        game.controls.set(left, right, thrust)
+
+        _, threat_dist = nearest(itertools.chain(game.asteroids, game.hunter_mines), player)
+        _, bullet_dist = nearest(game.enemy_bullets, player)
+        if threat_dist < player.size + 45 and player.dash_cooldown == 0:
+            game.player_dash()
+        elif bullet_dist < 40 and player.dash_cooldown > 0:
+            game.player_hyperspace()
+
+
+# --- Worker ---
+def play(task):
+    """ One seeded game under one configuration. Runs in a pool worker """
+    config_index, overrides, seed, ship, max_frames = task
+    apply_config(overrides)
+    random.seed(seed)
+    game = World()
+    game.start_new_game(ship)
+    game.game_start_timer = 0
+    bot = AimBot()
+    flow_frames, frame = 0, 0
+    while game.game_state == "PLAYING" and frame < max_frames:
+        if game.level_clear_timer == 0:
+            bot.act(game, frame)
+        game.update()
+        if game.player.flow_state_timer > 0:
+            flow_frames += 1
+        frame += 1
+    return {
+        "config": config_index,
+        "seed": seed,
+        "survival_s": frame / config.FPS,
+        "level": game.level,
+        "score": game.player.score,
+        "flow_uptime": flow_frames / frame if frame else 0.0,
+        "timed_out": game.game_state == "PLAYING",
+    }
+
+
+def tasks(configs, games, seed, ship, max_frames):
+    for i in range(games):
+        for config_index, overrides in enumerate(configs):
+            yield config_index, overrides, seed + i, ship, max_frames
+
+
+# --- Aggregation ---
+class RunningStats:
+    """ Welford mean/stddev plus min/max, constant memory """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+def print_table(configs, stats, timeouts):
+    print(f"\n{'#':>3}  {'games':>6}  {'survival s':>14}  {'level':>11}  {'score':>15}  {'flow %':>7}  {'timeout':>7}  config")
+    for index, overrides in enumerate(configs):
+        s = stats[index]
+        if s["score"].count == 0:
+            continue
+        label = ", ".join(f"{k}={v}" for k, v in overrides.items()) or "(defaults)"
+        print(f"{index:>3}  {s['score'].count:>6}  "
+              f"{s['survival_s'].mean:>7.1f} ±{s['survival_s'].stddev:>5.1f}  "
+              f"{s['level'].mean:>5.2f} ±{s['level'].stddev:>4.1f}  "
+              f"{s['score'].mean:>8.0f} ±{s['score'].stddev:>5.0f}  "
+              f"{s['flow_uptime'].mean * 100:>7.1f}  {timeouts[index]:>7}  {label}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel balance sweep")
+    parser.add_argument("--param", action="append", default=[], help="NAME=v1,v2,... (repeatable)")
+    parser.add_argument("--grid", help="JSON file mapping NAME -> list of values")
+    parser.add_argument("--games", type=int, default=100, help="seeded games per configuration")
+    parser.add_argument("--ship", choices=sorted(config.SHIP_STATS), default="Cruiser")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-minutes", type=float, default=10.0, help="cap per game (game time)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="sweep_results.jsonl", help="per-game results, one JSON line each")
+    args = parser.parse_args()
+
+    configs = build_grid(args.param, args.grid)
+    max_frames = int(args.max_minutes * 60 * config.FPS)
+    total = len(configs) * args.games
+    stats = [{metric: RunningStats() for metric in METRICS} for _ in configs]
+    timeouts = [0] * len(configs)
+    print(f"{len(configs)} configurations x {args.games} games = {total} runs on {args.workers} workers -> {args.out}")
+
+    start = time.perf_counter()
+    done = 0
+    # spawn: each worker starts from the default constants, not the parent's overrides
+    ctx = multiprocessing.get_context("spawn")
+    with open(args.out, "w") as out, ctx.Pool(args.workers) as pool:
+        json.dump({"configs": configs, "games": args.games, "ship": args.ship, "seed": args.seed}, out)
+        out.write("\n")
+        for result in pool.imap_unordered(play, tasks(configs, args.games, args.seed, args.ship, max_frames), chunksize=4):
+            out.write(json.dumps(result) + "\n")
+            index = result["config"]
+            for metric in METRICS:
+                stats[index][metric].add(result[metric])
+            timeouts[index] += result["timed_out"]
+            done += 1
+            if done % max(1, total // 20) == 0 or done == total:
+                out.flush()
+                elapsed = time.perf_counter() - start
+                print(f"  {done}/{total} runs, {done / elapsed:.1f} runs/s")
+        pool.close()
+        pool.join()
+
+    print_table(configs, stats, timeouts)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Rendering microbenchmarks: every draw and post-process path, timed in isolation.
+
+Fixed scenes are rendered offscreen into the renderer's game_surface. For
+each path the tool reports ms per call and the surface memory allocated per
+call (see harness.AllocationCounter).
+
+    python bench/bench_render.py
+    python bench/bench_render.py --iterations 200 --asteroids 100
+    python bench/bench_render.py --save-baseline / --threshold 0.10
+"""
+import argparse
+import os
+import random
+import sys
+
+import harness
+from harness import astroV8 as game_module
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_render.json")
+
+
+# --- Scenes ---
+# Each builder prepares the game and returns the zero-argument call to time.
+
+def scene_background(game, args):
+    return lambda: game.renderer.draw_background(game.renderer.game_surface)
+
+
+def scene_asteroids(game, args):
+    asteroids = [game_module.Asteroid(random.randint(0, game_module.SCREEN_WIDTH),
+                                      random.randint(0, game_module.SCREEN_HEIGHT),
+                                      random.choice([game_module.ASTEROID_LARGE_SIZE,
+                                                     game_module.ASTEROID_MEDIUM_SIZE,
+                                                     game_module.ASTEROID_SMALL_SIZE]))
+                 for _ in range(args.asteroids)]
+    for asteroid in asteroids:
+        asteroid.spawn_timer = 0
+    def draw():
+        for asteroid in asteroids:
+            game.renderer.draw_asteroid(game.renderer.game_surface, asteroid)
+    return draw
+
+
+def scene_laser(game, args):
+    laser = game_module.Bullet(game_module.SCREEN_WIDTH // 2, game_module.SCREEN_HEIGHT // 2, -60, is_laser=True)
+    return lambda: game.renderer.draw_bullet(game.renderer.game_surface, laser)
+
+
+def scene_player_debris(game, args):
+    game.player.reset()
+    points = game.player.get_ship_points()
+    debris = [game_module.PlayerDebris(game.player.x, game.player.y, 1, -1, points[i], points[(i + 1) % 3]) for i in range(3)]
+    def draw():
+        for piece in debris:
+            game.renderer.draw_player_debris(game.renderer.game_surface, piece)
+    return draw
+
+
+def scene_ghost_trail(game, args):
+    player = game.player
+    player.reset()
+    player.invulnerable_timer = 0 # Skip the warp-in animation, it's not this path
+    player.ghost_trail = [[player.get_ship_points(player.x - i * 6, player.y), lifespan]
+                          for i, lifespan in enumerate(range(game_module.PLAYER_GHOST_TRAIL_LIFESPAN, 0, -1))]
+    return lambda: game.renderer.draw_player(game.renderer.game_surface, player)
+
+
+def scene_hyperspace_warp(game, args):
+    game.player.reset()
+    game.player.hyperspace_warp_timer = game_module.PLAYER_HYPERSPACE_WARP_TIME // 2
+    return lambda: game.renderer.draw_hyperspace_warp(game.renderer.game_surface)
+
+
+def scene_flow_effects(game, args):
+    return lambda: game.renderer.apply_flow_effects(game.renderer.game_surface)
+
+
+def scene_glitch_effect(game, args):
+    return lambda: game.renderer.apply_glitch_effect(game.renderer.game_surface)
+
+
+def scene_camera_zoom(game, args):
+    game.camera_zoom = 0.95
+    return lambda: game.renderer.apply_camera_zoom(game.screen, (0, 0))
+
+
+def scene_ui(game, args):
+    game.player.reset()
+    game.player.score = 123450
+    game.player.flow_level = 7
+    game.player.flow_timer = game_module.FLOW_DURATION // 2
+    game.player.triple_shot_timer = game_module.POWERUP_TRIPLE_SHOT_TIME // 2
+    game.player.is_shielded = True
+    return lambda: game.renderer.draw_ui(game.renderer.game_surface)
+
+
+SCENES = {
+    "draw_background": scene_background,
+    "asteroid_draw": scene_asteroids,
+    "laser_bullet_draw": scene_laser,
+    "player_debris_draw": scene_player_debris,
+    "ghost_trail_player_draw": scene_ghost_trail,
+    "draw_hyperspace_warp": scene_hyperspace_warp,
+    "apply_flow_effects": scene_flow_effects,
+    "apply_glitch_effect": scene_glitch_effect,
+    "camera_zoom_smoothscale": scene_camera_zoom,
+    "draw_ui": scene_ui,
+}
+
+
+def run_scene(game, name, args):
+    harness.new_round(args.seed)
+    counter = harness.AllocationCounter()
+    counter.install(game.renderer)
+    try:
+        call = SCENES[name](game, args)
+        for _ in range(args.warmup):
+            game.renderer.game_surface.fill(game_module.BACKGROUND_COLOR)
+            call()
+        times = []
+        counter.reset()
+        for _ in range(args.iterations):
+            game.renderer.game_surface.fill(game_module.BACKGROUND_COLOR)
+            times.append(harness.timed(call))
+        stats = harness.summarize(times)
+        stats["bytes_per_call"] = counter.bytes / args.iterations
+        stats["surfaces_per_call"] = counter.surfaces / args.iterations
+        return {"draw_ms": stats}
+    finally:
+        counter.uninstall(game.renderer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless rendering microbenchmarks")
+    parser.add_argument("--scene", action="append", choices=sorted(SCENES), help="run only these paths")
+    parser.add_argument("--iterations", type=int, default=100, help="timed calls per path")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--asteroids", type=int, default=50, help="asteroids drawn per asteroid_draw call")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown vs baseline (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    game = harness.get_game()
+    results = {}
+    print(f"{'path':<26}{'mean':>11}{'p95':>11}{'KB/call':>11}{'surfaces':>10}")
+    for name in args.scene or SCENES:
+        results[name] = run_scene(game, name, args)
+        stats = results[name]["draw_ms"]
+        print(f"{name:<26}{stats['mean']:>8.3f} ms{stats['p95']:>8.3f} ms"
+              f"{stats['bytes_per_call'] / 1024:>11.1f}{stats['surfaces_per_call']:>10.1f}")
+
+    if args.save_baseline:
+        harness.save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = harness.load_baseline(args.baseline)
+    if baseline is None:
+        return 0
+    regressions = harness.compare(results, baseline, args.threshold)
+    for key, metric, base, current, ratio in regressions:
+        print(f"REGRESSION {key} {metric}: {base:.3f} ms -> {current:.3f} ms ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
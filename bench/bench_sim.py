@@ -0,0 +1,181 @@
+"""
+Scenario benchmarks for the simulation side: Game.update and check_collisions.
+
+Each scenario builds a scripted world directly, runs warmup frames, then times
+N frames of Game.update (check_collisions is timed separately as part of it).
+Results can be stored as a JSON baseline and later runs compared against it.
+
+    python bench/bench_sim.py                      # run all scenarios
+    python bench/bench_sim.py --save-baseline      # store bench/baseline_sim.json
+    python bench/bench_sim.py --threshold 0.10     # fail if >10% slower than baseline
+"""
+import argparse
+import os
+import random
+import sys
+
+import harness
+from harness import astroV8 as game_module
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_sim.json")
+
+
+# --- Scenarios ---
+# setup(seed) builds the world and returns the game; tick(game, frame) runs before each update.
+
+def setup_asteroid_field(seed):
+    game = harness.new_round(seed)
+    game.asteroids.empty()
+    game.all_sprites.empty()
+    game.hunter_mines.empty()
+    for _ in range(500):
+        asteroid = game_module.Asteroid(random.randint(0, game_module.SCREEN_WIDTH),
+                                        random.randint(0, game_module.SCREEN_HEIGHT),
+                                        game_module.ASTEROID_LARGE_SIZE, game.level)
+        asteroid.add(game.all_sprites, game.asteroids)
+    return game
+
+
+def tick_asteroid_field(game, frame):
+    # Sweep the ship around and keep the bullet budget full so bullets vs rocks is exercised
+    game.player.angle += 3
+    if len(game.bullets) < game_module.MAX_BULLETS:
+        for bullet in game.player.shoot():
+            bullet.add(game.all_sprites, game.bullets)
+
+
+def setup_boss_wave(seed):
+    game = harness.new_round(seed, level=20)
+    game.asteroids.empty()
+    game.all_sprites.empty()
+    game.hunter_mines.empty()
+    game.warning_timer = 0
+    for _ in range(6):
+        game.commands.spawn(game_module.UFOElite(game), game.all_sprites, game.ufos)
+    game.commands.flush(game)
+    return game
+
+
+def tick_boss_wave(game, frame):
+    # Bosses fly off screen; keep the wave at full strength
+    for _ in range(6 - len(game.ufos)):
+        game.commands.spawn(game_module.UFOElite(game), game.all_sprites, game.ufos)
+    game.commands.flush(game)
+
+
+def setup_minefield(seed):
+    game = harness.new_round(seed, level=8)
+    game.asteroids.empty()
+    game.all_sprites.empty()
+    game.hunter_mines.empty()
+    game.spawn_asteroids(game_module.ASTEROID_START_COUNT + game.level, game.level)
+    return game
+
+
+def setup_hyperflow(seed):
+    game = harness.new_round(seed)
+    game.spawn_asteroids(30, game.level)
+    game.player.flow_state_timer = game_module.FLOW_STATE_DURATION
+    return game
+
+
+def tick_hyperflow(game, frame):
+    # Laser spam: fire every frame for the whole HYPERFLOW duration
+    game.player.shoot_cooldown = 0
+    for bullet in game.player.shoot():
+        bullet.add(game.all_sprites, game.bullets)
+    if len(game.asteroids) < 10:
+        game.spawn_asteroids(20, game.level)
+
+
+def setup_explosion_chain(seed):
+    game = harness.new_round(seed)
+    return game
+
+
+def tick_explosion_chain(game, frame):
+    if frame % 60 == 0:
+        colors = [game_module.WHITE, game_module.GREY, game_module.RED]
+        for i in range(50):
+            game.create_explosion(40 + (i * 15) % 720, 60 + (i * 37) % 480, 30, colors,
+                                  trigger_glitch=True, create_shockwave=True, create_debris=True)
+
+
+SCENARIOS = {
+    "asteroid_field_500": (setup_asteroid_field, tick_asteroid_field),
+    "boss_wave_level_20": (setup_boss_wave, tick_boss_wave),
+    "minefield": (setup_minefield, None),
+    "hyperflow_laser_spam": (setup_hyperflow, tick_hyperflow),
+    "explosion_chain_50": (setup_explosion_chain, tick_explosion_chain),
+}
+
+
+def run_scenario(name, frames, warmup, seed):
+    setup, tick = SCENARIOS[name]
+    game = setup(seed)
+    if name == "hyperflow_laser_spam":
+        frames = min(frames, game_module.FLOW_STATE_DURATION - warmup)
+
+    collision_ms = []
+    check_collisions = game.check_collisions
+    def timed_check_collisions():
+        collision_ms.append(harness.timed(check_collisions))
+    game.check_collisions = timed_check_collisions
+
+    update_ms = []
+    try:
+        for frame in range(warmup + frames):
+            harness.keep_player_alive(game)
+            if tick:
+                tick(game, frame)
+            elapsed = harness.timed(game.update)
+            if frame >= warmup:
+                update_ms.append(elapsed)
+    finally:
+        del game.check_collisions
+
+    return {
+        "update_ms": harness.summarize(update_ms),
+        "check_collisions_ms": harness.summarize(collision_ms[-frames:]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless simulation benchmarks")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only these scenarios")
+    parser.add_argument("--frames", type=int, default=300, help="timed frames per scenario")
+    parser.add_argument("--warmup", type=int, default=60, help="untimed frames before measuring")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown vs baseline (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'scenario':<24}{'update mean':>13}{'update p95':>12}{'collide mean':>14}{'collide p95':>13}")
+    for name in args.scenario or SCENARIOS:
+        results[name] = run_scenario(name, args.frames, args.warmup, args.seed)
+        update = results[name]["update_ms"]
+        collide = results[name]["check_collisions_ms"]
+        print(f"{name:<24}{update['mean']:>10.3f} ms{update['p95']:>9.3f} ms"
+              f"{collide['mean']:>11.3f} ms{collide['p95']:>10.3f} ms")
+
+    if args.save_baseline:
+        harness.save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = harness.load_baseline(args.baseline)
+    if baseline is None:
+        print("No baseline found; run with --save-baseline to create one.")
+        return 0
+    regressions = harness.compare(results, baseline, args.threshold)
+    for key, metric, base, current, ratio in regressions:
+        print(f"REGRESSION {key} {metric}: {base:.3f} ms -> {current:.3f} ms ({ratio:.2f}x)")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} of baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
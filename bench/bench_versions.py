@@ -0,0 +1,180 @@
+"""
+Cross-version performance comparison over "old versions/" and astroV8.py.
+
+Each version's module is loaded headless (dummy SDL drivers, save files in a
+temp dir) and driven through the same scripted scenarios with the same seed.
+Inputs go through each version's own handle_events (posted KEYDOWN events)
+and Player.update (scripted pygame.key.get_pressed), so every version's code
+path runs unmodified. Prints a table of update/draw frame time and surface KB
+allocated per frame for each version, oldest first.
+
+    python bench/bench_versions.py
+    python bench/bench_versions.py --frames 600 --version astroV7_2 --version astroV8
+"""
+import argparse
+import glob
+import importlib.util
+import inspect
+import json
+import os
+import random
+import sys
+
+import harness
+
+import pygame
+
+OLD_VERSIONS_DIR = os.path.join(harness.REPO_ROOT, "old versions")
+
+
+def version_key(path):
+    """ astrov1 < astrov3 < astroV4 < astroV7 < astroV7_1 < astroV8 """
+    name = os.path.splitext(os.path.basename(path))[0].lower().replace("astrov", "")
+    return [int(part) for part in name.split("_")]
+
+
+def find_versions():
+    paths = glob.glob(os.path.join(OLD_VERSIONS_DIR, "astro*.py"))
+    paths.append(os.path.join(harness.REPO_ROOT, "astroV8.py"))
+    return sorted(paths, key=version_key)
+
+
+def load_version(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(f"bench_version_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    save_files = {attr: os.path.join(harness.SAVE_DIR, f"{name}_{os.path.basename(getattr(module, attr))}")
+                  for attr in ("HIGH_SCORE_FILE", "PLAYER_DATA_FILE", "HISTORY_DB_FILE") if hasattr(module, attr)}
+    for attr, path in save_files.items():
+        setattr(module, attr, path)
+    if hasattr(module, "config"): # Package layout: the constants live in astro.config
+        module.config.override(**save_files)
+    return name, module
+
+
+def start_round(game, seed):
+    random.seed(seed)
+    if "ship_type" in inspect.signature(game.start_new_game).parameters:
+        game.start_new_game("Cruiser")
+    else:
+        game.start_new_game()
+    if hasattr(game, "game_start_timer"):
+        game.game_start_timer = 0
+
+
+def add_asteroids(module, game, count):
+    for _ in range(count):
+        asteroid = module.Asteroid(random.randint(0, module.SCREEN_WIDTH), random.randint(0, module.SCREEN_HEIGHT),
+                                   module.ASTEROID_LARGE_SIZE)
+        if isinstance(game.asteroids, list):
+            game.asteroids.append(asteroid)
+        else:
+            game.asteroids.add(asteroid)
+            if hasattr(game, "all_sprites"):
+                game.all_sprites.add(asteroid)
+
+
+# --- Scenarios ---
+# script(module, game, keys, frame) runs before each frame.
+
+def script_play(module, game, keys, frame):
+    """ Circle-strafe: always turning, thrusting in bursts, firing steadily """
+    keys.held = {pygame.K_LEFT}
+    if (frame // 30) % 2 == 0:
+        keys.held.add(pygame.K_UP)
+    if frame % 8 == 0:
+        harness.press(pygame.K_SPACE)
+
+
+def script_asteroid_field(module, game, keys, frame):
+    if frame == 0:
+        add_asteroids(module, game, 60)
+    script_play(module, game, keys, frame)
+
+
+SCENARIOS = {
+    "scripted_play": script_play,
+    "asteroid_field_60": script_asteroid_field,
+}
+
+
+def run(module, game, scenario, frames, warmup, seed):
+    keys = harness.ScriptedKeys()
+    original_get_pressed = pygame.key.get_pressed
+    pygame.key.get_pressed = lambda: keys
+    counter = harness.AllocationCounter()
+    owner = getattr(game, "renderer", game) # Fonts and game_surface moved to the renderer in the package layout
+    counter.install(owner)
+    update_ms, draw_ms, alloc_bytes = [], [], 0
+    try:
+        start_round(game, seed)
+        for frame in range(warmup + frames):
+            if game.player.lives < 3:
+                game.player.lives = 3 # Keep the round going
+            if game.game_state != "PLAYING":
+                start_round(game, seed + frame)
+            SCENARIOS[scenario](module, game, keys, frame)
+            if frame == warmup:
+                counter.reset()
+            game.handle_events()
+            elapsed_update = harness.timed(game.update)
+            elapsed_draw = harness.timed(game.draw)
+            if frame >= warmup:
+                update_ms.append(elapsed_update)
+                draw_ms.append(elapsed_draw)
+        alloc_bytes = counter.bytes
+    finally:
+        counter.uninstall(owner)
+        pygame.key.get_pressed = original_get_pressed
+    return {
+        "update_ms": harness.summarize(update_ms),
+        "draw_ms": harness.summarize(draw_ms),
+        "alloc_kb_per_frame": alloc_bytes / 1024 / max(1, frames),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare frame time and allocation across game versions")
+    parser.add_argument("--version", action="append", help="module names to include, e.g. astroV7_2")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for path in find_versions():
+        name = os.path.splitext(os.path.basename(path))[0]
+        if args.version and name not in args.version:
+            continue
+        name, module = load_version(path)
+        game = module.Game()
+        results[name] = {}
+        for scenario in args.scenario or SCENARIOS:
+            try:
+                results[name][scenario] = run(module, game, scenario, args.frames, args.warmup, args.seed)
+            except Exception as e: # Old versions have old bugs; report and keep going
+                results[name][scenario] = {"error": f"{type(e).__name__}: {e}"}
+
+    for scenario in args.scenario or SCENARIOS:
+        print(f"\n{scenario}")
+        print(f"{'version':<12}{'update mean':>13}{'update p95':>12}{'draw mean':>12}{'draw p95':>12}{'frame':>11}{'KB/frame':>11}")
+        for name, scenarios in results.items():
+            stats = scenarios[scenario]
+            if "error" in stats:
+                print(f"{name:<12}  failed: {stats['error']}")
+                continue
+            update, draw = stats["update_ms"], stats["draw_ms"]
+            print(f"{name:<12}{update['mean']:>10.3f} ms{update['p95']:>9.3f} ms{draw['mean']:>9.3f} ms{draw['p95']:>9.3f} ms"
+                  f"{update['mean'] + draw['mean']:>8.3f} ms{stats['alloc_kb_per_frame']:>11.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Shared setup for the headless benchmark tools in this directory.
+
+Importing this module points SDL at its dummy video/audio drivers, makes
+astroV8 and the astro package importable from the repo root and redirects
+the save files to a temp directory, so benchmarks never touch a real window
+or the player's high score.
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Let SIGTERM/SIGINT stop the process instead of becoming SDL_QUIT events (pool workers)
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import pygame  # noqa: E402
+
+import astroV8  # noqa: E402
+from astro import config  # noqa: E402
+
+SAVE_DIR = tempfile.mkdtemp(prefix="astro-bench-")
+config.override(HIGH_SCORE_FILE=os.path.join(SAVE_DIR, "highscore.txt"),
+                PLAYER_DATA_FILE=os.path.join(SAVE_DIR, "player_data.txt"),
+                HISTORY_DB_FILE=os.path.join(SAVE_DIR, "history.db"))
+
+_game = None
+
+
+def get_game():
+    """ One Game per process: pygame.init and set_mode only happen once """
+    global _game
+    if _game is None:
+        _game = astroV8.Game()
+    return _game
+
+
+def new_round(seed, ship_type="Cruiser", level=1):
+    """ Fresh PLAYING state with the countdown skipped and the RNG seeded """
+    random.seed(seed)
+    game = get_game()
+    game.start_new_game(ship_type)
+    game.game_start_timer = 0
+    if level != 1:
+        game.level = level
+    return game
+
+
+def keep_player_alive(game):
+    """ Scenarios measure a fixed world: the player still gets hit (so those paths are timed)
+    but never runs out of lives and ends the round """
+    game.player.lives = max(game.player.lives, 99)
+
+
+class ScriptedKeys:
+    """ Stands in for pygame.key.get_pressed(): only the keys in held read as pressed """
+    def __init__(self):
+        self.held = set()
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+def press(key):
+    """ Queues a KEYDOWN for the game's next handle_events """
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def summarize(samples_ms):
+    """ mean / p95 / max of a list of millisecond timings """
+    if not samples_ms:
+        return {"mean": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "mean": sum(samples_ms) / len(samples_ms),
+        "p95": percentile(samples_ms, 0.95),
+        "max": max(samples_ms),
+    }
+
+
+def timed(func):
+    """ Calls func() and returns its duration in ms """
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return None
+
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results, baseline, threshold, metrics=("mean", "p95")):
+    """ Returns a list of (scenario, metric, baseline, current, ratio) that got slower than threshold.
+    results/baseline map scenario -> measurement -> {mean, p95, ...}. """
+    regressions = []
+    for scenario, measurements in results.items():
+        for measurement, stats in measurements.items():
+            base_stats = baseline.get(scenario, {}).get(measurement)
+            if not base_stats:
+                continue
+            for metric in metrics:
+                base = base_stats.get(metric, 0.0)
+                current = stats.get(metric, 0.0)
+                if base > 0 and current > base * (1.0 + threshold):
+                    regressions.append((f"{scenario}.{measurement}", metric, base, current, current / base))
+    return regressions
+
+
+class AllocationCounter:
+    """ Counts surface memory created while installed on whatever owns game_surface and the
+    fonts (game.renderer, or the Game itself in old versions). pygame.Surface, SysFont and
+    the transform functions are looked up through the pygame module at call time, so
+    swapping them there catches the game's allocations. copy() on game_surface and renders
+    from the existing fonts are caught by swapping in counting stand-ins. """
+    FONT_ATTRS = ("font", "font_small", "medium_font", "large_font", "flow_font", "multiplier_font",
+                  "text_font", "powerup_font")
+
+    def __init__(self):
+        self.bytes = 0
+        self.surfaces = 0
+        self.originals = {}
+
+    def count(self, surface):
+        self.bytes += surface.get_pitch() * surface.get_height()
+        self.surfaces += 1
+        return surface
+
+    def reset(self):
+        self.bytes = 0
+        self.surfaces = 0
+
+    def install(self, game):
+        counter = self
+        original_surface = pygame.Surface
+
+        class CountingSurface(original_surface):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                counter.count(self)
+
+            def copy(self):
+                return counter.count(super().copy())
+
+        class CountingFont:
+            def __init__(self, font):
+                self.font = font
+
+            def render(self, *args, **kwargs):
+                return counter.count(self.font.render(*args, **kwargs))
+
+            def __getattr__(self, name):
+                return getattr(self.font, name)
+
+        def counting(func):
+            return lambda *args, **kwargs: counter.count(func(*args, **kwargs))
+
+        self.originals = {
+            "Surface": original_surface,
+            "SysFont": pygame.font.SysFont,
+            "smoothscale": pygame.transform.smoothscale,
+            "scale": pygame.transform.scale,
+            "game_surface": getattr(game, "game_surface", None),
+            "fonts": {name: getattr(game, name) for name in self.FONT_ATTRS if hasattr(game, name)},
+        }
+        pygame.Surface = CountingSurface
+        pygame.font.SysFont = lambda *args, **kwargs: CountingFont(self.originals["SysFont"](*args, **kwargs))
+        pygame.transform.smoothscale = counting(self.originals["smoothscale"])
+        pygame.transform.scale = counting(self.originals["scale"])
+        if self.originals["game_surface"] is not None:
+            game.game_surface = CountingSurface(self.originals["game_surface"].get_size())
+        for name, font in self.originals["fonts"].items():
+            setattr(game, name, CountingFont(font))
+        self.reset()
+
+    def uninstall(self, game):
+        pygame.Surface = self.originals["Surface"]
+        pygame.font.SysFont = self.originals["SysFont"]
+        pygame.transform.smoothscale = self.originals["smoothscale"]
+        pygame.transform.scale = self.originals["scale"]
+        if self.originals["game_surface"] is not None:
+            game.game_surface = self.originals["game_surface"]
+        for name, font in self.originals["fonts"].items():
+            setattr(game, name, font)
@@ -0,0 +1,83 @@
+"""
+Headless replay playback: re-simulates recorded runs (python -m astro --record)
+on the bare simulation core as fast as it goes, checks every recorded state
+hash and the final result, and reports throughput. Use it to reproduce a bug
+report exactly, or point it at a directory of replays as a performance
+regression corpus.
+
+    python bench/play_replays.py replays/
+    python bench/play_replays.py run-20260101-120000-Cruiser.astroreplay --frame-hashes hashes.txt
+"""
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from astro import config  # noqa: E402
+from astro import replay  # noqa: E402
+
+
+def replay_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(replay.REPLAY_EXTENSION):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back replays headless and check them for desyncs")
+    parser.add_argument("paths", nargs="+", help="replay files or directories of them")
+    parser.add_argument("--keep-going", action="store_true", help="play on past the first desync")
+    parser.add_argument("--frame-hashes", metavar="PATH", help="write the state hash after every step (one replay only)")
+    args = parser.parse_args()
+
+    files = list(replay_files(args.paths))
+    if args.frame_hashes and len(files) != 1:
+        print("Error: --frame-hashes takes exactly one replay.")
+        return 2
+    total_frames = failed = 0
+    start = time.perf_counter()
+    for path in files:
+        name = os.path.basename(path)
+        try:
+            recording = replay.Replay.load(path)
+        except (IOError, ValueError) as error:
+            print(f"ERROR    {name}: {error}")
+            failed += 1
+            continue
+        result = replay.play(recording, stop_on_desync=not args.keep_going, frame_hashes=bool(args.frame_hashes))
+        total_frames += result.frames
+        claim = recording.result or {}
+        summary = f"{result.frames} steps, score {result.score}, level {result.level}"
+        if result.matches(recording.result):
+            print(f"OK       {name}: {summary}")
+        else:
+            failed += 1
+            if result.desync_frame is not None:
+                print(f"DESYNC   {name}: state differs by step {result.desync_frame} "
+                      f"(last good check at step {result.desync_frame - recording.hash_interval})")
+            else:
+                print(f"MISMATCH {name}: {summary}; recorded {claim.get('frames')} steps, "
+                      f"score {claim.get('score')}, level {claim.get('level')}")
+        if args.frame_hashes:
+            with open(args.frame_hashes, "w") as f:
+                f.writelines(f"{frame + 1} {value:08x}\n" for frame, value in enumerate(result.hashes))
+
+    elapsed = time.perf_counter() - start
+    if total_frames:
+        print(f"\n{len(files)} replays, {total_frames} steps in {elapsed:.2f}s: {total_frames / elapsed:.0f} steps/s "
+              f"({total_frames / elapsed / config.FPS:.0f}x real time)")
+    if failed:
+        print(f"{failed} of {len(files)} replays failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Long-running headless soak test with leak and drift detection.
+
+An input bot plays through START_MENU -> SHIP_SELECT -> PLAYING -> GAME_OVER
+over and over for the whole duration. It goes through handle_events, step and
+draw like the real loop, but uncapped. Every sample interval the runner
+records RSS, gc object counts, per-group sprite counts, len(particles) and
+frame-time percentiles. The final report flags anything that only grows and
+any frame-time drift.
+
+    python bench/soak.py --duration 4h
+    python bench/soak.py --duration 10m --sample-every 30 --bot scripted --report soak.json
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+
+import harness
+
+import pygame
+
+GROUPS = ("all_sprites", "asteroids", "bullets", "ufos", "enemy_bullets", "powerups",
+          "hunter_mines", "floating_texts", "debris", "shockwaves")
+
+
+def parse_duration(text):
+    """ "90", "90s", "30m", "4h" -> seconds """
+    units = {"s": 1, "m": 60, "h": 3600}
+    if text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, ValueError, AttributeError):
+        import resource # Peak rather than current RSS, but still shows growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# --- Input Bots ---
+class Bot:
+    """ Navigates the menus; subclasses decide what to do while PLAYING """
+    def __init__(self, keys, rng):
+        self.keys = keys
+        self.rng = rng
+        self.menu_delay = 0
+
+    def act(self, game, frame):
+        if game.game_state == "PLAYING":
+            self.play(game, frame)
+            return
+        self.keys.held = set()
+        # Linger on each screen for a moment so menu/ship-select drawing is soaked too
+        self.menu_delay += 1
+        if self.menu_delay >= 30:
+            self.menu_delay = 0
+            harness.press(pygame.K_RETURN)
+
+
+class ScriptedBot(Bot):
+    def play(self, game, frame):
+        self.keys.held = {pygame.K_LEFT}
+        if (frame // 45) % 3 == 0:
+            self.keys.held.add(pygame.K_UP)
+        if frame % 10 == 0:
+            harness.press(pygame.K_SPACE)
+        if frame % 200 == 0:
+            harness.press(pygame.K_x)
+        if frame % 700 == 0:
+            harness.press(pygame.K_c)
+
+
+class RandomBot(Bot):
+    HOLDABLE = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP)
+    PRESSABLE = (pygame.K_SPACE, pygame.K_SPACE, pygame.K_SPACE, pygame.K_x, pygame.K_c)
+
+    def play(self, game, frame):
+        if frame % 15 == 0:
+            self.keys.held = {key for key in self.HOLDABLE if self.rng.random() < 0.4}
+        if self.rng.random() < 0.15:
+            harness.press(self.rng.choice(self.PRESSABLE))
+
+
+BOTS = {"scripted": ScriptedBot, "random": RandomBot}
+
+
+# --- Sampling ---
+def take_sample(game, elapsed, frame_ms, cycles):
+    sample = {
+        "elapsed_s": elapsed,
+        "rss_mb": rss_bytes() / (1024 * 1024),
+        "gc_objects": len(gc.get_objects()),
+        "particles": len(game.particles),
+        "cycles": cycles,
+    }
+    for generation, count in enumerate(gc.get_count()):
+        sample[f"gc_gen{generation}"] = count
+    for name in GROUPS:
+        sample[name] = len(getattr(game, name, ())) # Groups only exist once the first round starts
+    for pct in (50, 95, 99):
+        sample[f"frame_ms_p{pct}"] = harness.percentile(frame_ms, pct / 100)
+    return sample
+
+
+def trend(values):
+    """ Least-squares slope per sample and Pearson r """
+    n = len(values)
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    sxx = sum((i - mean_x) ** 2 for i in range(n))
+    syy = sum((v - mean_y) ** 2 for v in values)
+    sxy = sum((i - mean_x) * (v - mean_y) for i, v in enumerate(values))
+    slope = sxy / sxx if sxx else 0.0
+    r = sxy / (sxx * syy) ** 0.5 if sxx and syy else 0.0
+    return slope, r
+
+
+def analyze(samples, growth_threshold, min_growth, drift_threshold, skip):
+    """ Flags metrics that grow steadily and frame times that drift upward """
+    findings = []
+    samples = samples[skip:] # The first samples include warm-up allocation
+    if len(samples) < 4:
+        return ["Not enough samples for trend analysis (need at least 4 after warm-up)."]
+
+    watched = ["rss_mb", "gc_objects", "particles"] + list(GROUPS)
+    for metric in watched:
+        values = [s[metric] for s in samples]
+        slope, r = trend(values)
+        growth = values[-1] - values[0]
+        monotonic = all(b >= a for a, b in zip(values, values[1:])) and growth > 0
+        relative = growth / values[0] if values[0] else float(growth > 0)
+        if (monotonic or r >= 0.8) and relative > growth_threshold and growth >= min_growth:
+            kind = "monotonic growth" if monotonic else f"steady growth (r={r:.2f})"
+            findings.append(f"{metric}: {kind}, {values[0]:.1f} -> {values[-1]:.1f} ({relative:+.0%}, {slope:+.3f}/sample)")
+
+    quarter = max(1, len(samples) // 4)
+    for metric in ("frame_ms_p50", "frame_ms_p95", "frame_ms_p99"):
+        early = sum(s[metric] for s in samples[:quarter]) / quarter
+        late = sum(s[metric] for s in samples[-quarter:]) / quarter
+        if early > 0 and late > early * (1.0 + drift_threshold):
+            findings.append(f"{metric}: drifted from {early:.2f} ms to {late:.2f} ms ({late / early - 1:+.0%})")
+    return findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless soak test")
+    parser.add_argument("--duration", default="1h", help="run time, e.g. 90s, 30m, 4h")
+    parser.add_argument("--sample-every", type=float, default=60.0, help="seconds between samples")
+    parser.add_argument("--bot", choices=sorted(BOTS), default="random")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-draw", action="store_true", help="simulation only")
+    parser.add_argument("--growth-threshold", type=float, default=0.10, help="flag growth above this fraction")
+    parser.add_argument("--min-growth", type=float, default=5, help="ignore growth smaller than this (objects, sprites or MB)")
+    parser.add_argument("--drift-threshold", type=float, default=0.20, help="flag frame-time drift above this fraction")
+    parser.add_argument("--skip-samples", type=int, default=1, help="warm-up samples left out of the analysis")
+    parser.add_argument("--report", help="write samples and findings as JSON to this file")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    game = harness.get_game()
+    keys = harness.ScriptedKeys()
+    pygame.key.get_pressed = lambda: keys
+    bot = BOTS[args.bot](keys, random.Random(args.seed))
+
+    duration = parse_duration(args.duration)
+    samples, frame_ms = [], []
+    cycles, frame = 0, 0
+    last_state = game.game_state
+    start = time.perf_counter()
+    next_sample = start + args.sample_every
+    print(f"Soaking for {duration:.0f}s with the {args.bot} bot, sampling every {args.sample_every:.0f}s")
+
+    while time.perf_counter() - start < duration:
+        bot.act(game, frame)
+        frame_start = time.perf_counter()
+        game.handle_events()
+        game.step()
+        if not args.no_draw:
+            game.draw()
+        now = time.perf_counter()
+        frame_ms.append((now - frame_start) * 1000)
+        frame += 1
+
+        if game.game_state != last_state:
+            if game.game_state == "GAME_OVER":
+                cycles += 1
+            last_state = game.game_state
+        if not game.running: # The bot never presses ESCAPE, but a QUIT would end up here
+            break
+
+        if now >= next_sample:
+            sample = take_sample(game, now - start, frame_ms, cycles)
+            samples.append(sample)
+            frame_ms = []
+            next_sample += args.sample_every
+            print(f"[{sample['elapsed_s']:7.0f}s] rss {sample['rss_mb']:.1f} MB, gc {sample['gc_objects']}, "
+                  f"sprites {sample['all_sprites']}, particles {sample['particles']}, "
+                  f"p95 {sample['frame_ms_p95']:.2f} ms, rounds {cycles}")
+
+    findings = analyze(samples, args.growth_threshold, args.min_growth, args.drift_threshold, args.skip_samples)
+    print(f"\n--- Soak report: {frame} frames, {cycles} completed rounds, {len(samples)} samples ---")
+    for finding in findings:
+        print(f"FLAG {finding}")
+    if not findings:
+        print("No monotonic growth or frame-time drift detected.")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"frames": frame, "rounds": cycles, "samples": samples, "findings": findings}, f, indent=2)
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Tournament score verification: re-simulates submitted replays (python -m astro
+--record) across a process pool and checks each one's claimed result against
+what its inputs actually produce.
+
+A submission is accepted only if the replay
+  * parses and follows the tournament rules (a run started from the menu with
+    the default constants, no longer than --max-minutes, on an issued seed),
+  * re-simulates without a desync: every state hash recorded along the way
+    matches, and
+  * ends on the claimed step count, score, level and final state hash.
+The claim is the result stored in the replay, with score/level replaced by the
+separately submitted values when --claims is given.
+
+    python bench/verify_replays.py submissions/ --workers 16 --report verdicts.jsonl
+    python bench/verify_replays.py submissions/ --claims scoreboard.jsonl --seeds issued.txt
+
+--claims is JSON lines: {"replay": "<file name>", "score": 12345, "level": 7},
+optionally with the "seed" issued for that submission. --seeds lists the seeds
+issued for the tournament, one per line (players record with python -m astro
+--record --seed N). Without either, the replay picks its own seed, so a player
+could submit the easiest of many. Exits 1 if any submission is rejected.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+
+from play_replays import replay_files
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from astro import config  # noqa: E402
+from astro import replay  # noqa: E402
+
+# What World.start_new_game leaves for a run started from the ship select screen;
+# anything else would skip the countdown or start mid level-clear
+TOURNAMENT_START = {"game_start_timer": 180, "level_clear_timer": 0, "warning_timer": 0}
+CLAIMED = ("frames", "score", "level", "hash")
+
+
+def check_rules(recording, max_minutes, seeds):
+    """ Why the replay can't count as a tournament run, or None. seeds: the ones allowed, None for any """
+    for name, value in TOURNAMENT_START.items():
+        if recording.start.get(name) != value:
+            return f"run does not start like a menu start ({name}={recording.start.get(name)})"
+    if seeds is not None and recording.seed not in seeds:
+        return f"seed {recording.seed} was not issued for this submission"
+    if len(recording.inputs) > max_minutes * 60 * config.FPS:
+        return f"longer than the {max_minutes:g} minute limit"
+    if recording.result is None:
+        return "no claimed result"
+    return None
+
+
+# --- Worker ---
+def verify(task):
+    """ One submission -> its verdict. Runs in a pool worker """
+    path, claim_override, max_minutes, seeds = task
+    start = time.perf_counter()
+    verdict = {"replay": os.path.basename(path)}
+    try:
+        recording = replay.Replay.load(path)
+        return verify_recording(recording, verdict, claim_override, max_minutes, seeds, start)
+    except (IOError, ValueError) as error:
+        verdict.update(verdict="invalid", reason=str(error))
+    except Exception as error: # A crafted replay must not take the whole pool down with it
+        verdict.update(verdict="invalid", reason=f"could not verify ({type(error).__name__}: {error})")
+    return verdict
+
+
+def verify_recording(recording, verdict, claim_override, max_minutes, seeds, start):
+    """ Fills in verdict for a loaded replay """
+    claim = dict(recording.result or {})
+    claim.update(claim_override)
+    if "seed" in claim_override:
+        seeds = {claim_override["seed"]}
+    verdict.update(ship=recording.ship, seed=recording.seed, claim={key: claim.get(key) for key in CLAIMED})
+    problem = check_rules(recording, max_minutes, seeds)
+    if problem:
+        verdict.update(verdict="invalid", reason=problem)
+        return verdict
+
+    result = replay.play(recording)
+    actual = {"frames": result.frames, "score": result.score, "level": result.level, "hash": result.hash}
+    verdict.update(actual=actual, steps=result.frames, seconds=time.perf_counter() - start)
+    if result.desync_frame is not None:
+        # The recorded hash going into desync_frame differs, the one interval earlier matched
+        verdict.update(verdict="desync", first_divergent_frame=result.desync_frame,
+                       last_good_frame=result.desync_frame - recording.hash_interval,
+                       reason=f"state diverges between step {result.desync_frame - recording.hash_interval} "
+                              f"and step {result.desync_frame}")
+    else:
+        wrong = [key for key in CLAIMED if actual[key] != claim.get(key)]
+        if wrong:
+            verdict.update(verdict="mismatch", first_divergent_frame=result.frames,
+                           reason=", ".join(f"{key} claimed {claim.get(key)}, re-simulated {actual[key]}" for key in wrong))
+        else:
+            verdict.update(verdict="ok")
+    return verdict
+
+
+def load_claims(path):
+    claims = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                claims[entry["replay"]] = {key: entry[key] for key in ("score", "level", "seed") if key in entry}
+    return claims
+
+
+def load_seeds(path):
+    with open(path) as f:
+        return {int(line.strip(), 0) for line in f if line.strip()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify tournament replays by re-simulation")
+    parser.add_argument("paths", nargs="+", help="replay files or directories of them")
+    parser.add_argument("--claims", help="JSON lines of submitted scores, overriding the ones in the replays")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seeds", metavar="PATH", help="issued seeds, one per line; replays on any other seed are rejected")
+    parser.add_argument("--max-minutes", type=float, default=120.0, help="longest run accepted (game time)")
+    parser.add_argument("--report", metavar="PATH", help="write every verdict as a JSON line")
+    args = parser.parse_args()
+
+    files = list(replay_files(args.paths))
+    if not files:
+        print("Error: no replays found.")
+        return 2
+    claims = load_claims(args.claims) if args.claims else {}
+    seeds = frozenset(load_seeds(args.seeds)) if args.seeds else None
+    if seeds is None and not any("seed" in claim for claim in claims.values()):
+        print("Warning: No issued seeds (--seeds, or \"seed\" in --claims), any seed is accepted.")
+    tasks = [(path, claims.get(os.path.basename(path), {}), args.max_minutes, seeds) for path in files]
+    print(f"Verifying {len(files)} replays on {args.workers} workers")
+
+    start = time.perf_counter()
+    verdicts = Counter()
+    steps = 0
+    report = open(args.report, "w") if args.report else None
+    try:
+        # spawn: every worker simulates with the default constants
+        with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+            for done, verdict in enumerate(pool.imap_unordered(verify, tasks), 1):
+                verdicts[verdict["verdict"]] += 1
+                steps += verdict.get("steps", 0)
+                if verdict["verdict"] != "ok":
+                    print(f"  {verdict['verdict'].upper():8} {verdict['replay']}: {verdict['reason']}")
+                if report is not None:
+                    report.write(json.dumps(verdict) + "\n")
+                if done % max(1, len(files) // 10) == 0 or done == len(files):
+                    elapsed = time.perf_counter() - start
+                    print(f"  {done}/{len(files)} verified, {steps / elapsed:.0f} steps/s")
+    finally:
+        if report is not None:
+            report.close()
+
+    elapsed = time.perf_counter() - start
+    rejected = len(files) - verdicts["ok"]
+    print(f"\n{verdicts['ok']} accepted, {rejected} rejected "
+          f"({', '.join(f'{count} {kind}' for kind, count in sorted(verdicts.items()) if kind != 'ok') or 'none'})")
+    print(f"{steps} steps ({steps / config.FPS / 60:.1f} minutes of play) in {elapsed:.1f}s")
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+Tests for the pure-Python cores: replay files and playback, world snapshots and
+the snapshot ring, and atomic saves with their backup. Headless, no pygame.
+
+    python -m pytest -q
+"""
+import json
+import random
+import struct
+
+import pytest
+
+from astro import persist, snapshot
+from astro.replay import MAGIC, FORMAT_VERSION, InputRecorder, Replay, play, state_hash
+from astro.world import World
+
+SEED = 12345
+STEPS = 600
+
+
+def drive(world, steps):
+    """ Scripted inputs: turns, thrust bursts and steady fire, the same every time """
+    controls = world.controls
+    for step in range(steps):
+        controls.left = step % 90 < 20
+        controls.right = 45 <= step % 90 < 60
+        controls.thrust = step % 50 < 15
+        if step % 12 == 0:
+            world.player_shoot()
+        if step % 200 == 100:
+            world.player_dash()
+        world.update()
+
+
+def record(steps=STEPS, seed=SEED, ship="Cruiser"):
+    """ A replay recorded the way the game records one """
+    world = World()
+    random.seed(seed)
+    world.start_new_game(ship)
+    world.input_log = InputRecorder(seed, world)
+    drive(world, steps)
+    return world.input_log.finish(world)
+
+
+def started_world(steps=120):
+    world = World()
+    random.seed(SEED)
+    world.start_new_game("Cruiser")
+    drive(world, steps)
+    return world
+
+
+def with_header(replay, **changes):
+    """ replay.to_bytes() with header fields changed """
+    data = replay.to_bytes()
+    offset = len(MAGIC)
+    version, size = struct.unpack_from("<HI", data, offset)
+    offset += struct.calcsize("<HI")
+    header = json.loads(data[offset:offset + size])
+    header.update(changes)
+    encoded = json.dumps(header).encode()
+    return MAGIC + struct.pack("<HI", FORMAT_VERSION, len(encoded)) + encoded + data[offset + size:]
+
+
+# --- Replays ---
+def test_replay_round_trip():
+    replay = record()
+    loaded = Replay.from_bytes(replay.to_bytes())
+    assert loaded.seed == replay.seed
+    assert loaded.ship == replay.ship
+    assert loaded.start == replay.start
+    assert loaded.inputs == replay.inputs
+    assert loaded.hashes == replay.hashes
+    assert loaded.result == replay.result
+
+
+def test_playback_matches_recording():
+    replay = Replay.from_bytes(record().to_bytes())
+    result = play(replay)
+    assert result.desync_frame is None
+    assert result.matches(replay.result)
+
+
+def test_playback_detects_changed_input():
+    replay = record()
+    replay.inputs[STEPS // 3] ^= 8 # A shot that wasn't taken
+    result = play(replay, stop_on_desync=False)
+    assert not result.matches(replay.result)
+
+
+@pytest.mark.parametrize("changes", [
+    {"hash_interval": "x"},
+    {"hash_interval": 0},
+    {"seed": 1.5},
+    {"frames": None},
+    {"frames": -1},
+    {"fps": True},
+    {"ship": "Bathtub"},
+    {"ship": ["Cruiser"]},
+    {"start": {"camera_zoom": "far"}},
+    {"start": {"level": 3}},
+    {"start": []},
+    {"result": 7},
+])
+def test_malformed_header_is_rejected(changes):
+    with pytest.raises(ValueError):
+        Replay.from_bytes(with_header(record(60), **changes))
+
+
+@pytest.mark.parametrize("mangle", [
+    lambda data: data[:4],
+    lambda data: b"NOTARPLY" + data[8:],
+    lambda data: data[:len(MAGIC) + 6] + b"#" + data[len(MAGIC) + 7:],
+    lambda data: data[:-10],
+])
+def test_damaged_replay_is_rejected(mangle):
+    with pytest.raises(ValueError):
+        Replay.from_bytes(mangle(record(60).to_bytes()))
+
+
+# --- Snapshots ---
+def test_snapshot_restore_continues_identically():
+    world = started_world()
+    blob = snapshot.capture(world)
+    drive(world, 120)
+    expected = state_hash(world)
+    snapshot.restore(world, blob)
+    drive(world, 120)
+    assert state_hash(world) == expected
+
+
+def test_snapshot_round_trip_is_exact():
+    world = started_world()
+    blob = snapshot.capture(world)
+    other = started_world(30)
+    snapshot.restore(other, blob)
+    assert snapshot.capture(other) == blob
+
+
+def test_ring_rewind():
+    world = started_world()
+    ring = snapshot.SnapshotRing(interval=1, keyframe_interval=10)
+    hashes = {}
+    for _ in range(300):
+        ring.record(world)
+        hashes[world.run_frames] = state_hash(world)
+        drive(world, 1)
+    ring.record(world)
+    frames = world.run_frames
+    rewound = ring.rewind(world, 1.0)
+    assert rewound > 0
+    assert state_hash(world) == hashes[frames - rewound]
+    assert ring.newest == ring.oldest + ring.count - 1
+    # Recording carries on from the rewound state
+    drive(world, 1)
+    ring.record(world)
+    assert snapshot.capture(world) == ring.get(ring.newest)
+
+
+def test_ring_stays_within_capacity():
+    world = started_world()
+    ring = snapshot.SnapshotRing(capacity=64 * 1024, interval=1)
+    for _ in range(600):
+        ring.record(world)
+        drive(world, 1)
+    assert ring.stored_bytes <= 64 * 1024
+    assert ring.get(ring.oldest) is not None
+
+
+# --- Saves ---
+def test_atomic_write_keeps_backup(tmp_path):
+    path = str(tmp_path / "highscore.txt")
+    persist.atomic_write(path, "100", int)
+    persist.atomic_write(path, "200", int)
+    assert persist.load(path, int) == (200, False)
+    with open(persist.backup_path(path)) as f:
+        assert f.read() == "100"
+
+
+def test_load_falls_back_to_backup(tmp_path):
+    path = str(tmp_path / "highscore.txt")
+    persist.atomic_write(path, "100", int)
+    persist.atomic_write(path, "200", int)
+    with open(path, "w") as f:
+        f.write("\0garbage")
+    assert persist.load(path, int) == (100, True)
+
+
+def test_damaged_save_does_not_replace_backup(tmp_path):
+    path = str(tmp_path / "player_data.json")
+    persist.atomic_write(path, json.dumps({"runs": 1}), json.loads)
+    persist.atomic_write(path, json.dumps({"runs": 2}), json.loads)
+    with open(path, "w") as f:
+        f.write('{"runs": ')
+    persist.atomic_write(path, json.dumps({"runs": 3}), json.loads)
+    assert persist.load(path, json.loads) == ({"runs": 3}, False)
+    with open(persist.backup_path(path)) as f:
+        assert json.loads(f.read()) == {"runs": 1}
+
+
+def test_load_raises_when_no_copy_parses(tmp_path):
+    path = str(tmp_path / "highscore.txt")
+    with pytest.raises(IOError):
+        persist.load(path, int)
+    with open(path, "w") as f:
+        f.write("x")
+    with pytest.raises(ValueError):
+        persist.load(path, int)
+
+
+def test_worker_coalesces_saves(tmp_path):
+    path = str(tmp_path / "highscore.txt")
+    worker = persist.PersistenceWorker()
+    for score in range(50):
+        worker.save(path, str(score), int)
+    worker.close()
+    assert persist.load(path, int) == (49, False)
+    assert worker.writes + worker.coalesced == 50